@@ -27,8 +27,14 @@ from discord.ext.commands import when_mentioned_or
 from dotenv import load_dotenv
 from orjson import loads
 
+from src.structures.batch_writer import BatchWriter
 from src.structures.bot import CustomBot
 from src.structures.logger import ColoredLogger
+from src.structures.plotter import PlotRenderer
+from src.structures.process_pool import ProcessPool
+from src.structures.renderer import DocumentRenderer
+from src.structures.repository import CharacterRepository
+from src.structures.server_config import ServerConfigs
 
 setLoggerClass(ColoredLogger)
 
@@ -66,7 +72,16 @@ async def main() -> None:
                 case_insensitive=True,
                 aiogoogle=aiogoogle,
             ) as bot,
+            CharacterRepository(bot.mongo_db("Characters")) as ocs,
+            ServerConfigs(bot.mongo_db("Server")) as configs,
+            BatchWriter(bot) as log_writer,
+            ProcessPool() as pool,
         ):
+            bot.ocs = ocs
+            bot.configs = configs
+            bot.log_writer = log_writer
+            bot.renderer = DocumentRenderer(bot, pool)
+            bot.plotter = PlotRenderer(pool)
             await bot.login(getenv("DISCORD_TOKEN", ""))
             await bot.connect(reconnect=True)
     except Exception as e:
@@ -13,10 +13,14 @@
 # limitations under the License.
 
 
-from asyncio import sleep
+from contextlib import suppress
+from typing import Any
 
-from discord import Message
+from apscheduler import ConflictPolicy
+from apscheduler.triggers.date import DateTrigger
+from discord import DiscordException, Message
 from discord.ext.commands import Cog
+from discord.utils import get
 
 from src.cogs.bumps.bumps import BumpBot, PingBump
 from src.structures.bot import CustomBot
@@ -25,10 +29,81 @@ __all__ = ("Bump", "setup")
 
 
 class Bump(Cog):
+    """Bump reminders, stored in the "Bump Reminder" collection.
+
+    Each server and bump bot has a single document and a single schedule,
+    so a new bump replaces the previous reminder and pending reminders are
+    scheduled again on load.
+    """
+
     def __init__(self, bot: CustomBot):
         self.bot = bot
-        self.bump_pings: dict[tuple[int, int], Message] = {}
-        self.bump_notifs: dict[tuple[int, int], Message] = {}
+
+    async def cog_load(self) -> None:
+        async for item in self.bot.mongo_db("Bump Reminder").find({"ping": None}):
+            await self.schedule(item)
+
+    async def schedule(self, item: dict[str, Any]) -> None:
+        await self.bot.scheduler.add_schedule(
+            self.bump_reminder,
+            trigger=DateTrigger(item["due"]),
+            id=f"bump-{item['server']}-{item['bot']}",
+            args=(item["server"], item["bot"]),
+            conflict_policy=ConflictPolicy.replace,
+        )
+
+    async def delete_messages(self, item: dict[str, Any]) -> None:
+        channel = self.bot.get_partial_messageable(item["channel"])
+        for key in ("notif", "ping"):
+            if message_id := item.get(key):
+                with suppress(DiscordException):
+                    await channel.get_partial_message(message_id).delete()
+
+    async def bump_reminder(self, server: int, bot_id: int) -> None:
+        """Pings the Bump Ping role once a server can bump again
+
+        Parameters
+        ----------
+        server : int
+            Server ID
+        bot_id : int
+            Bump bot ID
+        """
+        # Reminders overdue on boot run before the guilds are cached
+        await self.bot.wait_until_ready()
+        db = self.bot.mongo_db("Bump Reminder")
+        if not (item := await db.find_one({"server": server, "bot": bot_id, "ping": None})):
+            return
+
+        if not ((guild := self.bot.get_guild(server)) and (data := BumpBot.get(id=bot_id))):
+            return
+
+        if not (channel := guild.get_channel_or_thread(item["channel"])):
+            try:
+                channel = await guild.fetch_channel(item["channel"])
+            except DiscordException:
+                return
+
+        w = await self.bot.webhook(channel)
+        role = get(guild.roles, name="Bump Ping")
+        msg = await data.remind(w, channel, guild.get_member(bot_id), role)
+        await db.update_one({"_id": item["_id"]}, {"$set": {"ping": msg.id}})
+
+    async def register(self, bump: PingBump) -> None:
+        message = bump.after
+        key = {"server": message.guild.id, "bot": message.author.id}
+        await message.delete(delay=0)
+
+        notif = await bump.send()
+        item = key | {
+            "channel": message.channel.id,
+            "notif": notif.id,
+            "ping": None,
+            "due": bump.due,
+        }
+        if old := await self.bot.mongo_db("Bump Reminder").find_one_and_replace(key, item, upsert=True):
+            await self.delete_messages(old)
+        await self.schedule(item)
 
     @Cog.listener()
     async def on_message(self, message: Message):
@@ -48,24 +123,12 @@ class Bump(Cog):
         ):
             return
 
-        key = message.guild.id, message.author.id
         self.bot.msg_cache_add(message)
         w = await self.bot.webhook(message.channel)
         bump = PingBump(after=message, data=item, webhook=w)
 
-        if not bump.valid:
-            return
-
-        if msg := self.bump_pings.pop(key, None):
-            await msg.delete(delay=0)
-
-        if msg := self.bump_notifs.pop(key, None):
-            await msg.delete(delay=0)
-
-        await message.delete(delay=0)
-        self.bump_notifs[key] = await bump.send(timeout=False)
-        await sleep(bump.timedelta.total_seconds())
-        self.bump_pings[key] = await bump.send(timeout=True)
+        if bump.valid:
+            await self.register(bump)
 
     @Cog.listener()
     async def on_message_edit(self, before: Message, after: Message):
@@ -83,24 +146,12 @@ class Bump(Cog):
         ):
             return
 
-        key = before.guild.id, after.author.id
         self.bot.msg_cache_add(after)
         w = await self.bot.webhook(after.channel)
         bump = PingBump(before=before, after=after, data=item, webhook=w)
 
-        if not bump.valid:
-            return
-
-        if msg := self.bump_pings.pop(key, None):
-            await msg.delete(delay=0)
-
-        if msg := self.bump_notifs.pop(key, None):
-            await msg.delete(delay=0)
-
-        await after.delete(delay=0)
-        self.bump_notifs[key] = await bump.send(timeout=False)
-        await sleep(bump.timedelta.total_seconds())
-        self.bump_pings[key] = await bump.send(timeout=True)
+        if bump.valid:
+            await self.register(bump)
 
 
 async def setup(bot: CustomBot) -> None:
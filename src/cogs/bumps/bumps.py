@@ -13,7 +13,8 @@
 # limitations under the License.
 
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 
 from dateparser import parse
 from discord import (
@@ -21,10 +22,14 @@ from discord import (
     ButtonStyle,
     Embed,
     Interaction,
+    Member,
     Message,
+    Role,
     Thread,
     Webhook,
+    WebhookMessage,
 )
+from discord.abc import Messageable
 from discord.ui import Button, View, button
 from discord.utils import MISSING, get, utcnow
 from regex import IGNORECASE, MULTILINE, Pattern, compile
@@ -82,6 +87,45 @@ class BumpBot:
         """
         return after.author.id == cls.id
 
+    @classmethod
+    def mention(cls, role: Optional[Role]) -> str:
+        return f"**{role and role.mention} (Slash Command is </bump:{cls.cmd_id}>)**"
+
+    @classmethod
+    async def remind(
+        cls,
+        webhook: Webhook,
+        channel: Messageable,
+        author: Optional[Member],
+        role: Optional[Role],
+    ) -> WebhookMessage:
+        """Sends the reminder to bump again
+
+        Parameters
+        ----------
+        webhook : Webhook
+            Webhook of the channel
+        channel : Messageable
+            Channel or thread where the bump happened
+        author : Optional[Member]
+            Bump bot's member, if available
+        role : Optional[Role]
+            Bump Ping role, if available
+
+        Returns
+        -------
+        WebhookMessage
+            Reminder message
+        """
+        return await webhook.send(
+            content=cls.mention(role),
+            wait=True,
+            thread=channel if isinstance(channel, Thread) else MISSING,
+            username=safe_username(author.display_name if author else cls.name),
+            avatar_url=cls.avatar or (author and author.display_avatar.url) or MISSING,
+            allowed_mentions=AllowedMentions(users=True, roles=True),
+        )
+
     @classmethod
     def adapt_embed(cls, ctx: Message) -> Embed:
         embed = ctx.embeds[0].copy()
@@ -193,7 +237,7 @@ class PingBump(View):
 
     @property
     def mention(self):
-        return f"**{self.role and self.role.mention} (Slash Command is </bump:{self.data.cmd_id}>)**"
+        return self.data.mention(self.role)
 
     @property
     def valid(self) -> bool:
@@ -201,10 +245,6 @@ class PingBump(View):
             self.data.on_message_edit(before, self.after)
         return self.data.on_message(self.after)
 
-    @property
-    def timedelta(self):
-        return self.date.replace(tzinfo=None) - utcnow().replace(tzinfo=None)
-
     @property
     def date(self) -> datetime:
         if (embeds := self.after.embeds) and (data := self.data.format_date.search(embeds[0].description)):
@@ -215,26 +255,28 @@ class PingBump(View):
 
         return self.after.created_at + timedelta(hours=self.data.hours)
 
-    async def send(self, timeout: bool = False):
+    @property
+    def due(self) -> datetime:
+        date = self.date
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        return date
+
+    async def send(self):
         if isinstance(self.after.channel, Thread):
             thread = self.after.channel
         else:
             thread = MISSING
 
-        if timeout:
-            embed, view = MISSING, MISSING
-        else:
-            embed, view = self.embed, self
-
         return await self.webhook.send(
             content=self.mention,
-            embed=embed,
-            view=view,
+            embed=self.embed,
+            view=self,
             wait=True,
             thread=thread,
             username=safe_username(self.after.author.display_name),
             avatar_url=self.data.avatar or self.after.author.display_avatar.url,
-            allowed_mentions=AllowedMentions(users=True, roles=timeout),
+            allowed_mentions=AllowedMentions(users=True, roles=False),
         )
 
     @button(emoji="a:SZD_desk_bell:769116713639215124", style=ButtonStyle.blurple)
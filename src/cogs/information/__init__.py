@@ -28,15 +28,14 @@ from discord.ui import Button, Modal, Select, TextInput, View, select
 from discord.utils import MISSING, format_dt, get, utcnow
 from motor.motor_asyncio import AsyncIOMotorCollection
 from mystbin import File
-from rapidfuzz import fuzz
 from yaml import dump
 
 from src.cogs.information.poll import PollView
 from src.structures.bot import CustomBot
 from src.structures.converters import ColorArg
+from src.structures.proxy import ProxyStatus
 from src.utils.etc import DEFAULT_TIMEZONE, LINK_EMOJI, WHITE_BAR
 from src.utils.functions import message_line, name_emoji_from_channel, safe_username
-from src.utils.matches import TUPPER_REPLY_PATTERN
 
 __all__ = ("Information", "setup")
 
@@ -1003,58 +1002,9 @@ class Information(commands.Cog):
             await message.delete(delay=0)
 
         elif "tupper_logging" not in data.get("features", []):
-            messages: list[discord.Message] = []
-
-            def checker(m: discord.Message):
-                if m.webhook_id and message.channel == m.channel:
-                    messages.append(m)
-                return False
-
-            done, pending = await asyncio.wait(
-                [
-                    asyncio.create_task(
-                        self.bot.wait_for("message", check=checker, timeout=2),
-                        name="Message",
-                    ),
-                    asyncio.create_task(
-                        self.bot.wait_for("message_edit", check=lambda x, _: x == message),
-                        name="Edit",
-                    ),
-                    asyncio.create_task(
-                        self.bot.wait_for("message_delete", check=lambda x: x == message),
-                        name="Delete",
-                    ),
-                ],
-                return_when=asyncio.FIRST_COMPLETED,
-            )
-
-            for future in pending:
-                future.cancel()
-
-            for future in done:
-                future.exception()
-
-            if any(future.get_name() == "Edit" for future in done):
-                return
-
-            attachments = message.attachments
-            for msg in sorted(messages, key=lambda x: x.id):
-                if data := TUPPER_REPLY_PATTERN.search(msg.content):
-                    text = str(data.group("content") or msg.content)
-                else:
-                    text = msg.content
-
-                if (
-                    text in message.content
-                    or fuzz.WRatio(text, message.content, score_cutoff=95)
-                    or (
-                        attachments
-                        and len(attachments) == len(msg.attachments)
-                        and all(x.filename == y.filename for x, y in zip(attachments, msg.attachments))
-                    )
-                ):
-                    self.bot.msg_cache_add(message)
-                    break
+            result = await self.bot.proxies.track(message)
+            if result.status != ProxyStatus.Edited and result.proxies:
+                self.bot.msg_cache_add(message)
 
     async def on_message_edit(self, before: discord.Message, after: discord.Message):
         """Bump handler for message editing bots
@@ -1185,8 +1135,7 @@ class Information(commands.Cog):
         payload: RawMessageDeleteEvent
             Deleted Message Event
         """
-        with suppress(KeyError):
-            self.bot.msg_cache.remove(payload.message_id)
+        self.bot.msg_cache.discard(payload.message_id)
 
     async def on_bulk_message_delete(self, messages: list[discord.Message]):
         """This coroutine triggers upon cached bulk message deletions. YAML Format to Myst.bin
@@ -1252,7 +1201,7 @@ class Information(commands.Cog):
         payload: RawBulkMessageDeleteEvent
             Messages that were deleted.
         """
-        self.bot.msg_cache -= payload.message_ids
+        self.bot.msg_cache.difference_update(payload.message_ids)
 
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
         if str(payload.emoji) != "\N{WHITE MEDIUM STAR}":
@@ -14,7 +14,6 @@
 
 
 from contextlib import suppress
-from dataclasses import asdict
 from typing import Optional
 
 from discord import (
@@ -41,6 +40,7 @@ from src.cogs.inviter.classifier import (
     InviterView,
     Partner,
 )
+from src.cogs.inviter.partners import PartnerIndex
 from src.structures.bot import CustomBot
 from src.utils.etc import WHITE_BAR
 from src.utils.matches import INVITE
@@ -54,6 +54,10 @@ class Inviter(commands.Cog):
         self.partnerships_messages: dict[int, Message] = {}
         self.partnerships_channels: dict[int, int] = {}
         self.partnerships_notifis: dict[int, int] = {}
+        self.partners = PartnerIndex(bot.mongo_db("Partnerships"))
+
+    async def cog_load(self):
+        await self.partners.load()
 
     async def load_partners(self, **partnerships: int | list[int]):
         channel_id = partnerships.get("channel")
@@ -124,8 +128,7 @@ class Inviter(commands.Cog):
             return await ctx.reply("No message reference", delete_after=2)
 
         if not invite and (invite_url := INVITE.search(reference.content) or INVITE.search(ctx.message.content)):
-            with suppress(DiscordException):
-                invite = await self.bot.fetch_invite(url=invite_url.group(1))
+            invite = await self.partners.fetch_invite(self.bot, invite_url.group(1))
 
         if invite is None:
             return await ctx.reply("Invalid URL", delete_after=2)
@@ -164,10 +167,10 @@ class Inviter(commands.Cog):
             icon_url=msg.embeds[0].thumbnail.url,
             image_url=msg.embeds[0].image.url,
             tags=sorted(x for x in (msg.embeds[0].footer.text or "").split(", ") if x),
+            server=ctx.guild.id,
         )
 
-        db = self.bot.mongo_db("Partnerships")
-        await db.replace_one({"id": guild.id, "server": ctx.guild.id}, asdict(partner), upsert=True)
+        await self.partners.add(partner)
         await ctx.message.delete(delay=3)
 
     @commands.Cog.listener()
@@ -199,6 +202,11 @@ class Inviter(commands.Cog):
         ):
             return
 
+        if not (match := INVITE.search(msg.content)):
+            if msg.channel.id == channel_id:
+                await msg.delete(delay=0)
+            return
+
         context = await self.bot.get_context(msg)
 
         if context.command:
@@ -211,30 +219,23 @@ class Inviter(commands.Cog):
                 await m.delete(delay=0)
             return
 
-        if not (match := INVITE.search(msg.content)):
-            if msg.channel.id == channel_id:
-                await msg.delete(delay=0)
-            return
-
-        try:
-            invite = await self.bot.fetch_invite(url=match.group(1))
-        except DiscordException:
-            return
-
         guild: Guild = msg.guild
         author: Member = msg.author
-        invite_guild = invite.guild
-
-        if invite_guild.id == guild.id:
-            return
-
         partner_channel = msg.guild.get_channel(channel_id)
         mod_ch = self.bot.get_partial_messageable(id=notif_id, guild_id=guild.id)
 
-        db = self.bot.mongo_db("Partnerships")
+        if not (item := self.partners.by_code(guild.id, match.group(1))):
+            if not (invite := await self.partners.fetch_invite(self.bot, match.group(1))):
+                return
+
+            invite_guild = invite.guild
+            if invite_guild.id == guild.id:
+                return
+
+            item = self.partners.get(guild.id, invite_guild.id)
 
-        if item := await db.find_one({"id": invite_guild.id, "server": guild.id}):
-            url = partner_channel.get_partial_message(item["msg_id"]).jump_url
+        if item:
+            url = partner_channel.get_partial_message(item.msg_id).jump_url
             view = View()
             view.add_item(Button(label="Jump URL", url=url))
             with suppress(DiscordException):
@@ -283,8 +284,7 @@ class Inviter(commands.Cog):
         else:
             view_class, target = InviteAdminComplex, mod_ch
 
-        data = InviterView.group_method({Partner(**x) async for x in db.find({}, {"_id": 0})})
-        view = view_class(invite=invite, member=msg.author, tags=data, target=target)
+        view = view_class(invite=invite, member=msg.author, tags=self.partners.tags(), target=target)
         await msg.delete(delay=0)
         async with view.send(description=generator.description) as choices:
             if choices:
@@ -311,28 +311,27 @@ class Inviter(commands.Cog):
                     icon_url=message.embeds[0].thumbnail.url,
                     image_url=message.embeds[0].image.url,
                     tags=sorted(choices),
+                    server=guild.id,
                 )
 
-                await db.replace_one({"id": invite_guild.id, "server": guild.id}, asdict(partner), upsert=True)
-                if msg := self.message:
-                    self.message = await msg.delete(delay=0)
-                await self.load_partners()
+                await self.partners.add(partner)
+                if old := self.partnerships_messages.pop(guild.id, None):
+                    await old.delete(delay=0)
+                await self.load_partners(channel=channel_id, notification=notif_id)
 
     @commands.Cog.listener()
     async def on_raw_message_delete(self, payload: RawMessageDeleteEvent):
         if self.partnerships_channels.get(payload.guild_id) != payload.channel_id:
             return
 
-        db = self.bot.mongo_db("Partnerships")
-        await db.delete_one({"msg_id": payload.message_id, "server": payload.guild_id})
+        await self.partners.remove_messages(payload.guild_id, [payload.message_id])
 
     @commands.Cog.listener()
     async def on_raw_bulk_message_delete(self, payload: RawBulkMessageDeleteEvent):
         if self.partnerships_channels.get(payload.guild_id) != payload.channel_id:
             return
 
-        db = self.bot.mongo_db("Partnerships")
-        await db.delete_many({"msg_id": {"$in": list(payload.message_ids)}, "server": payload.guild_id})
+        await self.partners.remove_messages(payload.guild_id, payload.message_ids)
 
 
 async def setup(bot: CustomBot):
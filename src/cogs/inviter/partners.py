@@ -0,0 +1,150 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Iterable, Optional
+
+from cachetools import TTLCache
+from discord import DiscordException, Invite
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from src.cogs.inviter.classifier import InviterView, Partner
+from src.structures.bot import CustomBot
+
+__all__ = ("PartnerIndex",)
+
+
+class PartnerIndex:
+    """In-memory copy of the Partnerships collection.
+
+    Partners are indexed by server and partnered guild, by server and
+    invite code, and by server and message. Changes go through the index,
+    which writes them to the database and updates itself without reloading.
+    Fetched invites are cached for ttl seconds, failures included.
+
+    Attributes
+    ----------
+    db : AsyncIOMotorCollection
+        Partnerships collection
+    """
+
+    def __init__(self, db: AsyncIOMotorCollection, ttl: float = 300, maxsize: int = 1024) -> None:
+        self.db = db
+        self.partners: dict[tuple[int, int], Partner] = {}
+        self.codes: dict[tuple[int, str], tuple[int, int]] = {}
+        self.messages: dict[tuple[int, int], tuple[int, int]] = {}
+        self.invites: TTLCache[str, Optional[Invite]] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._tags: Optional[dict[str, set[Partner]]] = None
+
+    def __len__(self) -> int:
+        return len(self.partners)
+
+    def __repr__(self) -> str:
+        return f"PartnerIndex(partners={len(self)}, invites={len(self.invites)})"
+
+    async def load(self) -> None:
+        """Loads every partner"""
+        self.clear()
+        async for item in self.db.find({}, {"_id": 0}):
+            self._add(Partner(**item))
+
+    def clear(self) -> None:
+        self.partners.clear()
+        self.codes.clear()
+        self.messages.clear()
+        self._tags = None
+
+    def _add(self, partner: Partner) -> None:
+        key = partner.server, partner.id
+        self._remove(key)
+        self.partners[key] = partner
+        self.codes[(partner.server, partner.url)] = key
+        self.messages[(partner.server, partner.msg_id)] = key
+        self._tags = None
+
+    def _remove(self, key: tuple[int, int]) -> Optional[Partner]:
+        if partner := self.partners.pop(key, None):
+            self.codes.pop((partner.server, partner.url), None)
+            self.messages.pop((partner.server, partner.msg_id), None)
+            self._tags = None
+        return partner
+
+    def get(self, server: int, guild_id: int) -> Optional[Partner]:
+        return self.partners.get((server, guild_id))
+
+    def by_code(self, server: int, code: str) -> Optional[Partner]:
+        if key := self.codes.get((server, code)):
+            return self.partners.get(key)
+
+    def tags(self) -> dict[str, set[Partner]]:
+        """Partners grouped by tag, as InviterView.group_method does"""
+        if self._tags is None:
+            self._tags = InviterView.group_method(set(self.partners.values()))
+        return self._tags
+
+    async def fetch_invite(self, bot: CustomBot, code: str) -> Optional[Invite]:
+        """Fetches an invite, caching the result
+
+        Parameters
+        ----------
+        bot : CustomBot
+            Bot instance
+        code : str
+            Invite code or URL
+
+        Returns
+        -------
+        Optional[Invite]
+            Invite, if valid
+        """
+        try:
+            return self.invites[code]
+        except KeyError:
+            pass
+
+        try:
+            invite = await bot.fetch_invite(url=code)
+        except DiscordException:
+            invite = None
+
+        self.invites[code] = invite
+        return invite
+
+    async def add(self, partner: Partner) -> None:
+        """Stores a partner
+
+        Parameters
+        ----------
+        partner : Partner
+            Partner to store
+        """
+        await self.db.replace_one({"id": partner.id, "server": partner.server}, asdict(partner), upsert=True)
+        self._add(partner)
+
+    async def remove_messages(self, server: int, message_ids: Iterable[int]) -> None:
+        """Removes the partners posted in the given messages
+
+        Parameters
+        ----------
+        server : int
+            Server ID
+        message_ids : Iterable[int]
+            Message IDs
+        """
+        removed = [x for x in message_ids if (key := self.messages.get((server, x))) and self._remove(key)]
+        if removed:
+            await self.db.delete_many({"msg_id": {"$in": removed}, "server": server})
@@ -16,12 +16,10 @@
 from __future__ import annotations
 
 from contextlib import suppress
-from dataclasses import dataclass
 from datetime import timedelta
 from re import MULTILINE, compile
 from typing import Optional
 
-from aiogoogle.excs import HTTPError
 from aiohttp import ClientResponseError
 from apscheduler.triggers.cron import CronTrigger
 from discord import (
@@ -29,11 +27,11 @@ from discord import (
     DiscordException,
     Embed,
     ForumChannel,
+    ForumTag,
     Interaction,
     InteractionResponse,
     Member,
     Message,
-    NotFound,
     Role,
     TextChannel,
     User,
@@ -46,10 +44,11 @@ from discord.ui import Button, View, button
 from discord.utils import format_dt, get, utcnow
 from jishaku.codeblocks import Codeblock, codeblock_converter
 
+from src.cogs.moderation.applications import Application, ApplicationSync
 from src.structures.bot import CustomBot
 from src.structures.converters import AfterDateCall
+from src.utils.domains import DomainSet
 from src.utils.etc import WHITE_BAR
-from src.utils.matches import REGEX_URL
 
 __all__ = ("Moderation", "setup")
 
@@ -58,15 +57,6 @@ API = "https://phish.sinking.yachts/v2"
 API_PARAM = {"X-Identity": "V-Bot"}
 
 
-@dataclass(slots=True, unsafe_hash=True)
-class Application:
-    google_id: str
-    server: int
-    forum_id: int
-    form: str = "Form Responses 1"
-    check_presence: bool = True
-
-
 class Meeting(View):
     def __init__(
         self,
@@ -215,6 +205,7 @@ class Moderation(commands.Cog):
         """
         self.bot = bot
         self.loaded: bool = False
+        self.applications = ApplicationSync(bot)
         self.itx_menu = app_commands.ContextMenu(
             name="Vote to Ban",
             callback=self.vote_user,
@@ -237,7 +228,7 @@ class Moderation(commands.Cog):
         try:
             async with self.bot.session.get(f"{API}/all", params=API_PARAM) as data:
                 entries = await data.json()
-                self.bot.scam_urls = set(entries)
+                self.bot.scam_urls = DomainSet(entries)
         except ClientResponseError:
             self.bot.logger.error("Scam API is down.")
 
@@ -254,11 +245,11 @@ class Moderation(commands.Cog):
                 items: list[dict[str, str]] = await data.json()
                 for item in items:
                     handler = item.get("type")
-                    domains: list[str] = set(item.get("domains", []))
+                    domains: list[str] = item.get("domains", [])
                     if handler == "add":
-                        self.bot.scam_urls |= domains
+                        self.bot.scam_urls.update(domains)
                     elif handler == "delete":
-                        self.bot.scam_urls -= domains
+                        self.bot.scam_urls.difference_update(domains)
         except ClientResponseError:
             self.bot.logger.error("Scam API is down.")
 
@@ -268,92 +259,68 @@ class Moderation(commands.Cog):
         else:
             await self.scam_changes()
 
-    @loop(minutes=1)
-    async def check_applications(self):
-        db1 = self.bot.mongo_db("Applications")
-        db2 = self.bot.mongo_db("Applicants")
-
-        async for item in db1.find({}, {"_id": 0}):
-            app = Application(**item)
+    async def open_application(
+        self,
+        app: Application,
+        channel: ForumChannel,
+        applied_tags: list[ForumTag],
+        member: Member | User,
+        info: dict[str, str],
+    ):
+        key = {"id": member.id, "google_id": app.google_id}
+
+        # New Applicant
+        base_embed = Embed(
+            title=app.form,
+            color=member.color,
+            description="\n".join(x.mention for x in getattr(member, "roles", [])[1:]),
+        ).set_author(name=member.display_name, icon_url=member.display_avatar)
+
+        file = await member.display_avatar.with_size(4096).to_file()
+        base_embed.set_image(url=f"attachment://{file.filename}")
+        tdata = await channel.create_thread(
+            name=str(member),
+            content=f"{app.form} ► {member.mention}",
+            embed=base_embed,
+            file=file,
+            applied_tags=applied_tags,
+        )
+        await tdata.message.pin()
 
-            if not (channel := self.bot.get_channel(app.forum_id)):
-                channel: ForumChannel = await self.bot.fetch_channel(app.forum_id)
+        base_embed.set_image(url=None)
+        for title, answer in info.items():
+            base_embed.title, base_embed.description = title, str(answer or "No Answer Provided.")[:4000]
+            await tdata.thread.send(embed=base_embed)
 
-            applied_tags = []
-            if tag := get(channel.available_tags, name=app.form):
-                applied_tags.append(tag)
+        await self.bot.mongo_db("Applicants").replace_one(
+            key,
+            key | {"thread": tdata.thread.id},
+            upsert=True,
+        )
 
-            storage = await self.bot.aiogoogle.discover("sheets", "v4")
-            query = storage.spreadsheets.values.get(
-                spreadsheetId=app.google_id,
-                range=app.form,
-            )
+    @loop(minutes=1)
+    async def check_applications(self):
+        db = self.bot.mongo_db("Applications")
+        storage = await self.bot.google.sheets()
 
+        async for item in db.find({}, {"_id": 0}):
+            app = Application(**item)
             try:
-                data = await self.bot.aiogoogle.as_service_account(query)
-            except HTTPError as e:
-                self.bot.logger.error(f"Error fetching App {app.form!r}: {e}")
-                data = {}
-
-            values: list[str] = data.get("values", [])
-            if not values:
-                continue
-
-            headers, *values = values
-
-            id_question = next((x for x in headers if "ID" in x), None)
-            if not id_question:
-                continue
-
-            for row in values:
-                info = dict(zip(headers, row))
-
-                try:
-                    user_id = int(info.pop(id_question, ""))
-                except ValueError:
-                    continue
-
-                if not (member := channel.guild.get_member(user_id)):
-                    try:
-                        if app.check_presence:
-                            member = await channel.guild.fetch_member(user_id)
-                        else:
-                            member = await self.bot.fetch_user(user_id)
-                    except NotFound:
-                        continue
-
-                key = {"id": user_id, "google_id": app.google_id}
-                if await db2.find_one(key):
-                    continue
-
-                # New Applicant
-                base_embed = Embed(
-                    title=app.form,
-                    color=member.color,
-                    description="\n".join(x.mention for x in getattr(member, "roles", [])[1:]),
-                ).set_author(name=member.display_name, icon_url=member.display_avatar)
-
-                file = await member.display_avatar.with_size(4096).to_file()
-                base_embed.set_image(url=f"attachment://{file.filename}")
-                tdata = await channel.create_thread(
-                    name=str(member),
-                    content=f"{app.form} ► {member.mention}",
-                    embed=base_embed,
-                    file=file,
-                    applied_tags=applied_tags,
-                )
-                await tdata.message.pin()
-
-                base_embed.set_image(url=None)
-                for title, answer in info.items():
-                    base_embed.title, base_embed.description = title, str(answer or "No Answer Provided.")[:4000]
-                    await tdata.thread.send(embed=base_embed)
-
-                await db2.replace_one(
-                    key,
-                    key | {"thread": tdata.thread.id},
-                    upsert=True,
+                if not (channel := self.bot.get_channel(app.forum_id)):
+                    channel: ForumChannel = await self.bot.fetch_channel(app.forum_id)
+
+                applied_tags = []
+                if tag := get(channel.available_tags, name=app.form):
+                    applied_tags.append(tag)
+
+                await self.applications.poll(
+                    app,
+                    storage,
+                    channel.guild,
+                    lambda member, info: self.open_application(app, channel, applied_tags, member, info),
                 )
+            except Exception as e:
+                self.bot.logger.exception("Error checking App %r", app.form, exc_info=e)
 
     @loop(minutes=1)
     async def check_emails(self):
@@ -374,7 +341,7 @@ class Moderation(commands.Cog):
             and message.content
             and message.author != self.bot.user
             and (not await self.bot.is_owner(message.author))
-            and self.bot.scam_urls.intersection(REGEX_URL.findall(message.content))
+            and self.bot.scam_urls.search(message.content)
         ):
             with suppress(DiscordException):
                 await message.delete(delay=0)
@@ -386,7 +353,7 @@ class Moderation(commands.Cog):
     @commands.Cog.listener()
     async def on_ready(self):
         """Initialize the scam urls and schedule each 5 minutes"""
-        await self.scam_all()
+        await self.scam_load()
         await self.bot.scheduler.add_schedule(
             self.scam_load,
             id="Nitro Scam List",
@@ -431,17 +398,8 @@ class Moderation(commands.Cog):
                 ephemeral=True,
             )
 
-        db = interaction.client.mongo_db("Server")
-        if info := await db.find_one(
-            {
-                "id": interaction.guild_id,
-                "staff_chat": {"$exists": True},
-            },
-            {"_id": 0, "staff_chat": 1},
-        ):
-            channel_id = info["staff_chat"]
-        else:
-            channel_id = interaction.channel_id
+        info = await interaction.client.get_config(interaction.guild_id)
+        channel_id = info.staff_chat or interaction.channel_id
 
         view = Meeting(reporter=interaction.user, imposter=member, reason=reason, channel_id=channel_id)
         time = format_dt(utcnow() + timedelta(seconds=60), style="R")
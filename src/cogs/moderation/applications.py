@@ -0,0 +1,277 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Awaitable, Callable, Optional
+
+from aiogoogle.excs import HTTPError
+from aiogoogle.resource import GoogleAPI
+from discord import Guild, Member, NotFound, User
+
+from src.structures.bot import CustomBot
+
+__all__ = ("Application", "ApplicationSync", "PendingApplicant", "SheetCursor")
+
+Handler = Callable[[Member | User, dict[str, str]], Awaitable[Any]]
+
+
+@dataclass(slots=True, unsafe_hash=True)
+class Application:
+    google_id: str
+    server: int
+    forum_id: int
+    form: str = "Form Responses 1"
+    check_presence: bool = True
+    row: int = field(default=1, hash=False, compare=False)
+
+    @property
+    def key(self) -> dict[str, str]:
+        return {"google_id": self.google_id, "form": self.form}
+
+    @property
+    def sheet(self) -> str:
+        name = self.form.replace("'", "''")
+        return f"'{name}'"
+
+
+@dataclass(slots=True)
+class PendingApplicant:
+    """Applicant whose row is not handled yet
+
+    Attributes
+    ----------
+    row : int
+        Sheet row
+    info : dict[str, str]
+        Answers by question
+    failures : int
+        Failed attempts at handling it
+    """
+
+    row: int
+    info: dict[str, str]
+    failures: int = 0
+
+
+@dataclass(slots=True)
+class SheetCursor:
+    """Sync state of an application's sheet
+
+    Attributes
+    ----------
+    row : int
+        Last sheet row fetched, the first one being the headers
+    idle : int
+        Consecutive polls without new rows
+    due : float
+        Monotonic time of the next poll
+    saved : int
+        Row stored in the database
+    pending : dict[int, PendingApplicant]
+        Applicants waiting for their member or for another attempt, by user ID
+    """
+
+    row: int = 1
+    saved: int = 1
+    idle: int = 0
+    due: float = 0
+    pending: dict[int, PendingApplicant] = field(default_factory=dict)
+
+    @property
+    def stored_row(self) -> int:
+        """Row to resume from after a restart, keeping pending applicants"""
+        if self.pending:
+            return min(x.row for x in self.pending.values()) - 1
+        return self.row
+
+
+class ApplicationSync:
+    """Incremental reader of application sheets.
+
+    Each sheet only gets the rows after its cursor requested, applicants
+    already registered are resolved with a single query and sheets without
+    new rows get polled less often, up to max_delay.
+
+    The stored row only moves past an applicant once it was handled or given
+    up on after max_failures attempts, applicants wait for their member to
+    join for as long as it takes.
+
+    Attributes
+    ----------
+    bot : CustomBot
+        Bot instance
+    min_delay : float
+        Seconds between polls of an active sheet
+    max_delay : float
+        Max seconds between polls of an idle sheet
+    batch : int
+        Max rows requested per poll
+    max_failures : int
+        Attempts at handling an applicant
+    """
+
+    def __init__(
+        self,
+        bot: CustomBot,
+        min_delay: float = 60,
+        max_delay: float = 1800,
+        batch: int = 500,
+        max_failures: int = 5,
+    ) -> None:
+        self.bot = bot
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.batch = batch
+        self.max_failures = max_failures
+        self.cursors: dict[Application, SheetCursor] = {}
+
+    def __repr__(self) -> str:
+        return f"ApplicationSync(sheets={len(self.cursors)})"
+
+    async def fetch(self, app: Application, storage: GoogleAPI, start: int) -> tuple[list[str], list[list[str]]]:
+        query = storage.spreadsheets.values.batchGet(
+            spreadsheetId=app.google_id,
+            ranges=[f"{app.sheet}!1:1", f"{app.sheet}!{start}:{start + self.batch - 1}"],
+        )
+        data: dict[str, Any] = await self.bot.aiogoogle.as_service_account(query)
+        header_range, row_range = data.get("valueRanges") or [{}, {}]
+        headers = next(iter(header_range.get("values", [])), [])
+        return headers, row_range.get("values", [])
+
+    async def resolve(self, app: Application, guild: Guild, user_id: int, cached: bool) -> Optional[Member | User]:
+        if member := guild.get_member(user_id):
+            return member
+        if cached:
+            return None
+        try:
+            if app.check_presence:
+                return await guild.fetch_member(user_id)
+            return await self.bot.fetch_user(user_id)
+        except NotFound:
+            return None
+
+    async def poll(self, app: Application, storage: GoogleAPI, guild: Guild, handle: Handler) -> int:
+        """Handles the new applicants of a sheet, if it's due
+
+        Parameters
+        ----------
+        app : Application
+            Application to check
+        storage : GoogleAPI
+            Sheets client
+        guild : Guild
+            Server of the application
+        handle : Handler
+            Called with each applicant without a thread and their answers
+
+        Returns
+        -------
+        int
+            Applicants handled
+        """
+        cursor = self.cursors.get(app)
+        if cursor is None:
+            row = max(app.row, 1)
+            cursor = self.cursors[app] = SheetCursor(row=row, saved=row)
+
+        ready: list[tuple[Member | User, PendingApplicant]] = []
+        for user_id, item in list(cursor.pending.items()):
+            # Members joining get cached, users outside the server are fetched again
+            if member := await self.resolve(app, guild, user_id, cached=app.check_presence):
+                del cursor.pending[user_id]
+                ready.append((member, item))
+
+        if monotonic() >= cursor.due:
+            ready.extend(await self.sync(app, storage, guild, cursor))
+
+        handled = 0
+        for member, item in ready:
+            try:
+                await handle(member, item.info)
+            except Exception as e:
+                item.failures += 1
+                if item.failures < self.max_failures:
+                    cursor.pending[member.id] = item
+                    self.bot.logger.warning("App %r: failed to handle %s, row %s: %s", app.form, member.id, item.row, e)
+                else:
+                    self.bot.logger.exception(
+                        "App %r: gave up on %s, row %s", app.form, member.id, item.row, exc_info=e
+                    )
+            else:
+                handled += 1
+
+        if (row := cursor.stored_row) != cursor.saved:
+            await self.bot.mongo_db("Applications").update_one(app.key, {"$set": {"row": row}})
+            cursor.saved = row
+
+        return handled
+
+    async def sync(
+        self,
+        app: Application,
+        storage: GoogleAPI,
+        guild: Guild,
+        cursor: SheetCursor,
+    ) -> list[tuple[Member | User, PendingApplicant]]:
+        ready: list[tuple[Member | User, PendingApplicant]] = []
+        try:
+            headers, rows = await self.fetch(app, storage, cursor.row + 1)
+        except HTTPError as e:
+            self.bot.logger.error("Error fetching App %r: %s", app.form, e)
+            headers, rows = [], []
+
+        if not (id_question := next((x for x in headers if "ID" in x), None)):
+            rows = []
+
+        if rows:
+            cursor.idle = 0
+            delay = 0 if len(rows) >= self.batch else self.min_delay
+        else:
+            cursor.idle += 1
+            delay = min(self.min_delay * 2**cursor.idle, self.max_delay)
+        cursor.due = monotonic() + delay
+
+        if rows:
+            entries: dict[int, PendingApplicant] = {}
+            for index, row in enumerate(rows, start=cursor.row + 1):
+                info = dict(zip(headers, row))
+                try:
+                    user_id = int(info.pop(id_question, ""))
+                except ValueError:
+                    continue
+                if user_id not in cursor.pending:
+                    entries.setdefault(user_id, PendingApplicant(index, info))
+
+            if entries:
+                existing = {
+                    item["id"]
+                    async for item in self.bot.mongo_db("Applicants").find(
+                        {"google_id": app.google_id, "id": {"$in": list(entries)}},
+                        {"_id": 0, "id": 1},
+                    )
+                }
+                for user_id, item in entries.items():
+                    if user_id in existing:
+                        continue
+                    if member := await self.resolve(app, guild, user_id, cached=False):
+                        ready.append((member, item))
+                    elif app.check_presence:
+                        cursor.pending[user_id] = item
+
+        cursor.row += len(rows)
+        return ready
@@ -17,7 +17,7 @@ from itertools import groupby
 from random import choice, random
 from re import IGNORECASE
 from re import compile as re_compile
-from typing import Callable, Literal, Optional
+from typing import Any, Callable, Literal, Optional
 
 from discord import Embed, Guild, TextChannel, app_commands
 from discord.ext import commands
@@ -35,10 +35,11 @@ from src.cogs.pokedex.search import (
 from src.cogs.submission.oc_submission import ModCharactersView
 from src.structures.bot import CustomBot
 from src.structures.character import Character
-from src.structures.mon_typing import TypingEnum
+from src.structures.mon_typing import TYPE_CHART, TypingEnum
 from src.structures.move import Category
 from src.structures.movepool import Movepool
-from src.structures.species import Fusion, Species
+from src.structures.repository import character_facets
+from src.structures.species import SPECIES_REGISTRY, Fusion
 from src.utils.etc import WHITE_BAR, MapElements
 from src.views.move_view import MovepoolView
 from src.views.species_view import SpeciesComplex
@@ -113,12 +114,11 @@ class Pokedex(commands.Cog):
                 embed.add_field(name="Possible Types", value=possible_types, inline=False)
 
         elif flags.move_id:
-            mons = {x for x in Species.all() if flags.move_id in x.movepool}
-            db = ctx.bot.mongo_db("Characters")
-            key = {"server": ctx.guild.id}
+            mons = set(SPECIES_REGISTRY.learners(flags.move_id))
+            authors = None
             if role := get(ctx.guild.roles, name="Roleplayer"):
-                key["author"] = {"$in": [x.id for x in role.members]}
-            ocs = [Character.from_mongo_dict(x) async for x in db.find(key)]
+                authors = [x.id for x in role.members]
+            ocs = await ctx.bot.ocs.from_server(ctx.guild.id, authors)
             view = SpeciesComplex(member=ctx.author, target=ctx, mon_total=mons, keep_working=True, ocs=ocs)
             embed = view.embed
             embed.description = (
@@ -210,30 +210,22 @@ class Pokedex(commands.Cog):
         inverse : bool
             Used for inverse battles. Defaults to False
         """
-        if type2:
-            type1 += type2
+        types = dict.fromkeys(x for x in (type1, type2, type3) if x)
+        name = "/".join(x.name for x in types)
 
-        if type3:
-            type1 += type3
-
-        embed = Embed(title=f"{type1.name} when {mode}", color=type1.color)
+        embed = Embed(title=f"{name} when {mode}", color=type1.color)
         if inverse:
             embed.title += "(Inverse)"
         embed.set_image(url=WHITE_BAR)
 
         if mode == "Attacking":
-
-            def method(x: TypingEnum) -> float:
-                return type1.when_attacking(x, inverse=inverse)
-
+            values = TYPE_CHART.attacking(*types, inverse=inverse)
         else:
-
-            def method(x: TypingEnum) -> float:
-                return type1.when_attacked_by(x, inverse=inverse)
+            values = TYPE_CHART.weaknesses(*types, inverse=inverse)
 
         items = [x for x in TypingEnum if x not in (TypingEnum.Shadow, TypingEnum.Typeless)]
-        items.sort(key=method, reverse=True)
-        for k, v in groupby(items, key=method):
+        items.sort(key=values.__getitem__, reverse=True)
+        for k, v in groupby(items, key=values.__getitem__):
             if item := "\n".join(f"{x.emoji} {x.name}" for x in sorted(v, key=lambda x: x.name)):
                 embed.add_field(name=f"Damage {k}x", value=item)
 
@@ -335,18 +327,12 @@ class Pokedex(commands.Cog):
         embed = Embed(title="Select the Character", url=PLACEHOLDER, color=ctx.author.color)
         embed.set_image(url=WHITE_BAR)
         embeds = [embed]
-        db = self.bot.mongo_db("Characters")
-        total = [Character.from_mongo_dict(x) async for x in db.find({"server": guild.id})]
+        terms: list[tuple[str, Any]] = []
         filters: list[Callable[[Character], bool]] = []
-        ocs = [flags.species] if isinstance(flags.species, Character) else total
-        if flags.name:
-            name_pattern = re_compile(flags.name, IGNORECASE)
-            filters.append(lambda oc: name_pattern.search(oc.name))
         if flags.age:
-            filters.append(lambda oc: oc.age == flags.age)
-
+            terms.append(("age", flags.age))
         if member_id := getattr(flags.member, "id", flags.member):
-            filters.append(lambda oc: oc.author == member_id)
+            terms.append(("author", member_id))
         else:
             filters.append(lambda x: guild.get_member(x.author))
 
@@ -354,6 +340,7 @@ class Pokedex(commands.Cog):
         mon = Fusion(*items)
 
         if mon.bases:
+            terms.extend(("species", x.id) for x in mon.bases)
             filters.append(
                 lambda oc: (
                     mon.bases.issubset(oc.species.bases)
@@ -371,27 +358,15 @@ class Pokedex(commands.Cog):
                 embed.add_field(name=f"Abilities (Max {min(len(mon.abilities), 2)})", value=ab_text)
 
         if flags.pronoun:
-            filters.append(lambda oc: flags.pronoun in oc.pronoun)
-        if flags.backstory:
-            backstory_pattern = re_compile(flags.backstory, IGNORECASE)
-            filters.append(lambda oc: oc.backstory and backstory_pattern.search(oc.backstory))
-        if flags.personality:
-            personality_pattern = re_compile(flags.personality, IGNORECASE)
-            filters.append(lambda oc: oc.personality and personality_pattern.search(oc.personality))
-        if flags.extra:
-            extra_pattern = re_compile(flags.extra, IGNORECASE)
-            filters.append(lambda oc: oc.extra and extra_pattern.search(oc.extra))
-        if flags.unique_trait:
-            sp_ability_pattern = re_compile(flags.unique_trait, IGNORECASE)
-            filters.append(lambda oc: oc.sp_ability and any(map(sp_ability_pattern.search, oc.sp_ability.params)))
+            terms.append(("pronoun", flags.pronoun))
         if flags.type:
-            filters.append(lambda oc: flags.type in oc.types)
+            terms.append(("type", flags.type))
             if embed.color == ctx.author.color:
                 embed.color = flags.type.color
             embed.set_thumbnail(url=flags.type.emoji.url)
 
         if flags.move:
-            filters.append(lambda oc: flags.move in oc.moveset)
+            terms.append(("move", flags.move))
             title = repr(flags.move)
             if flags.move.banned:
                 title += " - Banned Move"
@@ -406,9 +381,30 @@ class Pokedex(commands.Cog):
                 embed.title = title
                 embed.description = description
         if flags.kind:
-            filters.append(lambda oc: oc.kind == flags.kind)
+            terms.append(("kind", flags.kind))
         if flags.weight:
             filters.append(lambda oc: oc.weight == flags.weight)
+        if flags.name:
+            name_pattern = re_compile(flags.name, IGNORECASE)
+            filters.append(lambda oc: name_pattern.search(oc.name))
+        if flags.backstory:
+            backstory_pattern = re_compile(flags.backstory, IGNORECASE)
+            filters.append(lambda oc: oc.backstory and backstory_pattern.search(oc.backstory))
+        if flags.personality:
+            personality_pattern = re_compile(flags.personality, IGNORECASE)
+            filters.append(lambda oc: oc.personality and personality_pattern.search(oc.personality))
+        if flags.extra:
+            extra_pattern = re_compile(flags.extra, IGNORECASE)
+            filters.append(lambda oc: oc.extra and extra_pattern.search(oc.extra))
+        if flags.unique_trait:
+            sp_ability_pattern = re_compile(flags.unique_trait, IGNORECASE)
+            filters.append(lambda oc: oc.sp_ability and any(map(sp_ability_pattern.search, oc.sp_ability.params)))
+
+        if isinstance(flags.species, Character):
+            ocs = [flags.species]
+            filters[:0] = [lambda oc, term=term: term in character_facets(oc) for term in terms]
+        else:
+            ocs = await self.bot.ocs.query(guild.id, terms)
 
         ocs = [mon for mon in ocs if all(i(mon) for i in filters)]
 
@@ -44,7 +44,8 @@ from src.structures.character import (
 from src.structures.mon_typing import TypingEnum
 from src.structures.move import Category, Move
 from src.structures.pronouns import Pronoun
-from src.structures.species import CustomSpecies, Fakemon, Fusion, Species
+from src.structures.species import SPECIES_REGISTRY, CustomSpecies, Fakemon, Fusion, Species
+from src.utils.autocomplete import AutocompleteIndex
 
 STANDARD = [
     Kind.Common,
@@ -75,6 +76,11 @@ def item_value(mon: Character | Species):
     return str(mon.id)
 
 
+MOVE_INDEX = AutocompleteIndex(sorted(Move.all(), key=item_name))
+ABILITY_INDEX = AutocompleteIndex(sorted(Ability.all(), key=item_name))
+SPECIES_INDEX = AutocompleteIndex(sorted(Species.all(), key=item_name))
+
+
 def foo(x: str) -> Optional[int]:
     x = x.strip()
     if x.isdigit():
@@ -148,12 +154,7 @@ class MoveTransformer(commands.Converter[str], Transformer):
         raise ValueError(f"Move {value!r} Not found.")
 
     async def autocomplete(self, _: Interaction[CustomBot], value: str, /) -> list[Choice[str]]:
-        items = list(Move.all())
-        if options := process.extract(value, choices=items, limit=25, processor=item_name, score_cutoff=60):
-            options = [x[0] for x in options]
-        elif not value:
-            options = items[:25]
-        return [Choice(name=x.name, value=x.id) for x in set(options)]
+        return [Choice(name=x.name, value=x.id) for x in MOVE_INDEX.search(value)]
 
     async def convert(self, _: commands.Context[CustomBot], argument: str, /):
         if move := Move.deduce(argument):
@@ -167,60 +168,57 @@ MoveArg = Transform[Move, MoveTransformer]
 
 class SpeciesTransformer(commands.Converter[str], Transformer):
     async def transform(self, itx: Interaction[CustomBot], value: Optional[str], /):
-        db = itx.client.mongo_db("Characters")
         value = value or ""
-        if value.isdigit() and (item := await db.find_one({"id": int(value), "server": itx.guild_id})):
-            return Character.from_mongo_dict(item)
+        if value.isdigit() and (oc := await itx.client.ocs.get(itx.guild_id, int(value))):
+            return oc
         if oc := Species.single_deduce(value):
             return oc
         raise ValueError(f"Species {value!r} not found")
 
     async def convert(self, ctx: commands.Context[CustomBot], argument: str, /):
-        db = ctx.bot.mongo_db("Characters")
         argument = argument or ""
-        if argument.isdigit() and (item := await db.find_one({"id": int(argument), "server": ctx.guild.id})):
-            return Character.from_mongo_dict(item)
+        if argument.isdigit() and (oc := await ctx.bot.ocs.get(ctx.guild.id, int(argument))):
+            return oc
         if oc := Species.single_deduce(argument):
             return oc
         raise ValueError(f"Species {argument!r} not found")
 
     async def autocomplete(self, ctx: Interaction[CustomBot], value: str, /) -> list[Choice[str]]:
-        db = ctx.client.mongo_db("Characters")
         guild: Guild = ctx.guild
-        key = {"server": ctx.guild_id}
         pk_filters: list[Callable[[Species], bool]] = []
         oc_filters: list[Callable[[Character], bool]] = []
+        mon_total = Species.all()
 
         if member := ctx.namespace.member:
-            key["author"] = member.id
+            total = await ctx.client.ocs.from_author(ctx.guild_id, member.id)
         else:
+            total = await ctx.client.ocs.from_server(ctx.guild_id)
             oc_filters.append(lambda x: bool(guild.get_member(x.author)))
 
         if (ability := ctx.namespace.ability) and (ability := Ability.from_ID(ability)):
-            key["abilities"] = {"$in": [ability.id]}
+            oc_filters.append(lambda x: x.species and ability in x.species.abilities)
             pk_filters.append(lambda x: ability in x.abilities)
 
         if (mon_type := ctx.namespace.type) and (mon_type := TypingEnum.deduce(mon_type)):
-            key["types"] = {"$in": [str(mon_type)]}
+            oc_filters.append(lambda x: mon_type in x.types)
             pk_filters.append(lambda x: mon_type in x.types)
 
         if (move := ctx.namespace.move) and (move := Move.from_ID(move)):
-            key["moveset"] = {"$in": [move.id]}
-            pk_filters.append(lambda x: move in x.total_movepool)
+            oc_filters.append(lambda x: move in x.moveset)
+            mon_total = SPECIES_REGISTRY.learners(move, total=True)
 
         if fused := Species.from_ID(ctx.namespace.fused):
-            key["species.fusion.species"] = {"$in": fused.id.split("/")}
+            fused_ids = set(fused.id.split("/"))
+            oc_filters.append(
+                lambda x: isinstance(x.species, Fusion) and not fused_ids.isdisjoint(i.id for i in x.species.bases)
+            )
             pk_filters.append(lambda x: fused == x)
         elif kind := Kind.associated(ctx.namespace.kind):
             oc_filters.append(lambda x: x.kind == kind)
             pk_filters.append(lambda x: isinstance(x, kind.value))
 
-        if not (
-            ocs := {
-                o async for x in db.find(key) if (o := Character.from_mongo_dict(x)) and all(i(o) for i in oc_filters)
-            }
-        ):
-            ocs = [x for x in Species.all() if not x.banned and all(i(x) for i in pk_filters)]
+        if not (ocs := {o for o in total if all(i(o) for i in oc_filters)}):
+            ocs = [x for x in mon_total if not x.banned and all(i(x) for i in pk_filters)]
 
         if data := process.extract(value, choices=ocs, limit=25, processor=item_name, score_cutoff=60):
             options = [x[0] for x in data]
@@ -248,30 +246,22 @@ class DefaultSpeciesTransformer(commands.Converter[str], Transformer):
 
     async def autocomplete(self, ctx: Interaction[CustomBot], value: str, /) -> list[Choice[str]]:
         if ctx.command and ctx.command.name == "find" and (fused := Species.from_ID(ctx.namespace.species)):
-            db = ctx.client.mongo_db("Characters")
+            fused_ids = set(fused.id.split("/"))
             items = [
                 base
-                async for x in db.find(
-                    {
-                        "$or": [
-                            {"species.chimera": {"$in": fused.id.split("/")}},
-                            {"species.fusion.species": {"$in": fused.id.split("/")}},
-                        ],
-                        "server": ctx.guild_id,
-                    }
-                )
-                if (oc := Character.from_mongo_dict(x))
-                and isinstance(oc.species, Fusion)
+                for oc in await ctx.client.ocs.from_server(ctx.guild_id)
+                if isinstance(oc.species, Fusion)
+                and not fused_ids.isdisjoint(x.id for x in oc.species.bases)
                 and ctx.guild.get_member(oc.author)
                 for base in oc.species.bases
                 if base != fused
             ]
+            if options := process.extract(value or "", choices=items, limit=25, processor=item_name, score_cutoff=60):
+                options = [x[0] for x in options]
+            elif not value:
+                options = items[:25]
         else:
-            items = [*Species.all()]
-        if options := process.extract(value or "", choices=items, limit=25, processor=item_name, score_cutoff=60):
-            options = [x[0] for x in options]
-        elif not value:
-            options = items[:25]
+            options = SPECIES_INDEX.search(value)
         return [Choice(name=x.name, value=x.id) for x in options]
 
 
@@ -293,35 +283,26 @@ class AbilityTransformer(commands.Converter[str], Transformer):
         raise ValueError(f"Ability {value!r} not found")
 
     async def autocomplete(self, _: Interaction[CustomBot], value: str, /) -> list[Choice[str]]:
-        items = list(Ability.all())
-        if options := process.extract(value or "", choices=items, limit=25, processor=item_name, score_cutoff=60):
-            options = [x[0] for x in options]
-        elif not value:
-            options = items[:25]
-        return [Choice(name=x.name, value=x.id) for x in options]
+        return [Choice(name=x.name, value=x.id) for x in ABILITY_INDEX.search(value)]
 
 
 AbilityArg = Transform[Ability, AbilityTransformer]
 
 
 class FakemonTransformer(commands.Converter[str], Transformer):
+    cache: dict[int, tuple[tuple[tuple[int, str], ...], AutocompleteIndex[Character]]] = {}
+
+    @staticmethod
+    def is_fakemon(oc: Character) -> bool:
+        return isinstance(oc.species, CustomSpecies) and oc.species.base is None
+
     async def process(self, bot: CustomBot, value: str, guild_id: int):
-        db = bot.mongo_db("Characters")
         oc: Optional[Character] = None
-        if value.isdigit() and (item := await db.find_one({"id": int(value), "server": guild_id})):
-            oc = Character.from_mongo_dict(item)
+        if value.isdigit() and (item := await bot.ocs.get(guild_id, int(value))):
+            oc = item
         elif ocs := process.extractOne(
             value or "",
-            choices=[
-                Character.from_mongo_dict(x)
-                async for x in db.find(
-                    {
-                        "species.evolves_from": {"$exists": 1},
-                        "species.base": {"$exists": 0},
-                        "server": guild_id,
-                    }
-                )
-            ],
+            choices=[x for x in await bot.ocs.from_server(guild_id) if self.is_fakemon(x)],
             processor=item_name,
             score_cutoff=60,
         ):
@@ -338,23 +319,17 @@ class FakemonTransformer(commands.Converter[str], Transformer):
 
     async def autocomplete(self, ctx: Interaction[CustomBot], value: str, /) -> list[Choice[str]]:
         guild: Guild = ctx.guild
-        db = ctx.client.mongo_db("Characters")
         mons = [
-            Character.from_mongo_dict(x)
-            async for x in db.find(
-                {
-                    "species.evolves_from": {"$exists": 1},
-                    "species.base": {"$exists": 0},
-                    "server": ctx.guild_id,
-                }
-            )
-            if guild.get_member(x["author"])
+            x
+            for x in await ctx.client.ocs.from_server(ctx.guild_id)
+            if self.is_fakemon(x) and guild.get_member(x.author)
         ]
-        if options := process.extract(value or "", choices=mons, limit=25, processor=item_name, score_cutoff=60):
-            options = [x[0] for x in options]
-        elif not value:
-            options = mons[:25]
-        return [Choice(name=x.species.name, value=str(x.id)) for x in set(options)]
+        key = tuple((x.id, item_name(x)) for x in mons)
+        cached_key, index = self.cache.get(ctx.guild_id, (None, None))
+        if index is None or cached_key != key:
+            index = AutocompleteIndex(mons, key=item_name)
+            self.cache[ctx.guild_id] = key, index
+        return [Choice(name=x.species.name, value=str(x.id)) for x in index.search(value)]
 
 
 FakemonArg = Transform[Character, FakemonTransformer]
@@ -15,31 +15,78 @@
 
 from __future__ import annotations
 
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
 from apscheduler.triggers.date import DateTrigger
+from bson import ObjectId
 from dateparser import parse
 from discord import AllowedMentions, Color, Embed, Interaction, app_commands
 from discord.ext import commands
+from discord.ext.tasks import loop
+from discord.utils import utcnow
+from pymongo.errors import PyMongoError
 
 from src.structures.bot import CustomBot
 from src.utils.etc import WHITE_BAR
 
 
 class Reminder(commands.Cog):
+    """Reminders stored in the "Reminder" collection.
+
+    Only the reminders due before the horizon get scheduled, the horizon
+    moves forward every hour so the scheduler holds a window of reminders
+    rather than all of them. It only moves once every reminder before it
+    got scheduled, a failed load gets retried from the same point.
+    """
+
+    window = timedelta(hours=6)
+
     def __init__(self, bot: CustomBot):
         self.bot = bot
+        self.horizon: Optional[datetime] = None
+        self.loading: Optional[datetime] = None
 
     async def cog_load(self):
+        with suppress(PyMongoError):
+            await self.bot.mongo_db("Reminder").create_index("due")
+        self.load_window.start()
+
+    async def cog_unload(self):
+        self.load_window.stop()
+
+    async def schedule(self, item: dict[str, Any]):
+        await self.bot.scheduler.add_schedule(
+            self.remind_action,
+            trigger=DateTrigger(item["due"]),
+            id=f"reminder-{item['_id']}",
+            args=(item["_id"],),
+        )
+
+    @loop(hours=1)
+    async def load_window(self):
+        """Schedules the reminders due before the next horizon"""
+        query: dict[str, datetime] = {"$lte": (horizon := utcnow() + self.window)}
+        if self.horizon:
+            query["$gt"] = self.horizon
+
+        # Reminders created while loading are scheduled by the command
+        self.loading = horizon
+        try:
+            async for item in self.bot.mongo_db("Reminder").find({"due": query}, {"_id": 1, "due": 1}):
+                await self.schedule(item)
+        except Exception as e:
+            self.bot.logger.exception("Failed to load the reminders due before %s", horizon, exc_info=e)
+        else:
+            self.horizon = horizon
+        finally:
+            self.loading = None
+
+    async def remind_action(self, reminder_id: ObjectId):
         remind = self.bot.mongo_db("Reminder")
-        async for item in remind.find({}):
-            await self.bot.scheduler.add_schedule(
-                self.remind_action,
-                trigger=DateTrigger(item["due"]),
-                id=f"reminder-{item['_id']}",
-                args=(item,),
-            )
-
-    async def remind_action(self, payload: dict[str, int]):
-        remind = self.bot.mongo_db("Reminder")
+        if not (payload := await remind.find_one({"_id": reminder_id})):
+            return
 
         author_id, channel_id, text, due = (
             payload["author"],
@@ -101,12 +148,8 @@ class Reminder(commands.Cog):
         result = await remind.insert_one(params)
         params["_id"] = result.inserted_id
         await itx.response.send_message("Reminder has been created successfully.!", ephemeral=True)
-        await self.bot.scheduler.add_schedule(
-            self.remind_action,
-            trigger=DateTrigger(until),
-            id=f"reminder-{result.inserted_id}",
-            args=(params,),
-        )
+        if (horizon := self.loading or self.horizon) and until <= horizon:
+            await self.schedule(params)
 
 
 async def setup(bot: CustomBot):
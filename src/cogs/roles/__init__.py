@@ -13,14 +13,14 @@
 # limitations under the License.
 
 
+import asyncio
 from datetime import datetime, timedelta, timezone
-from textwrap import TextWrapper
-from typing import Optional
+from hashlib import sha256
+from typing import Any, Optional
 
 from discord import (
     AllowedMentions,
     AutoModRule,
-    AutoModTrigger,
     Embed,
     EntityType,
     EventStatus,
@@ -30,6 +30,7 @@ from discord import (
     Member,
     Message,
     PrivacyLevel,
+    RawMemberRemoveEvent,
     RawReactionActionEvent,
     User,
     app_commands,
@@ -37,10 +38,11 @@ from discord import (
 from discord.ext import commands
 from discord.ui import Button, View
 from discord.utils import get, snowflake_time
+from orjson import OPT_SORT_KEYS, dumps
 
+from src.cogs.roles.automod import NoPingAutomod
 from src.cogs.roles.roles import BasicRoleSelect, RPModal, RPSearchManage, TimeArg
 from src.structures.bot import CustomBot
-from src.structures.character import Character
 from src.utils.etc import WHITE_BAR, Month
 
 __all__ = ("Roles", "setup")
@@ -52,7 +54,7 @@ class Roles(commands.Cog):
         self.cool_down: dict[int, datetime] = {}
         self.role_cool_down: dict[int, datetime] = {}
         self.auto_mods: dict[int, Optional[AutoModRule]] = {}
-        self.wrapper = TextWrapper(width=250, placeholder="", max_lines=10)
+        self.automod = NoPingAutomod(bot, self.fetch_automod)
         self.no_ping_roles: dict[int, int | None] = {}
         self.ready = False
 
@@ -100,26 +102,69 @@ class Roles(commands.Cog):
                         {"id": guild.id},
                         {"$unset": {"self_roles.no_ping_automod": ""}},
                     )
+                    await self.bot.configs.refresh(guild.id)
                     return
 
         return self.auto_mods[guild.id]
 
+    async def refresh_self_roles(self, item: dict[str, Any], semaphore: asyncio.Semaphore) -> bool:
+        """Registers a self roles view, editing its message only if the view changed.
+        Views that can't be registered are always edited.
+
+        Parameters
+        ----------
+        item : dict[str, Any]
+            Server document
+        semaphore : asyncio.Semaphore
+            Limits the concurrent edits
+
+        Returns
+        -------
+        bool
+            If the message was edited
+        """
+        info = item.get("self_roles", {})
+        view = BasicRoleSelect(items=info.get("items", []))
+        webhook_id = item.get("webhook_id")
+        payload = {"components": view.to_components(), "webhook_id": webhook_id}
+        fingerprint = sha256(dumps(payload, default=str, option=OPT_SORT_KEYS)).hexdigest()
+
+        # Views with items lacking a custom_id can't be registered, the edit keeps them working
+        if persistent := view.is_persistent():
+            self.bot.add_view(view, message_id=info["message"])
+            if info.get("fingerprint") == fingerprint:
+                return False
+
+        async with semaphore:
+            if webhook_id:
+                w = await self.bot.fetch_webhook(webhook_id)
+                await w.edit_message(message_id=info["message"], view=view)
+            else:
+                channel = self.bot.get_partial_messageable(info["channel"], guild_id=item["id"])
+                await channel.get_partial_message(info["message"]).edit(view=view)
+
+        if persistent:
+            await self.bot.mongo_db("Server").update_one(
+                {"_id": item["_id"]},
+                {"$set": {"self_roles.fingerprint": fingerprint}},
+            )
+            await self.bot.configs.refresh(item["id"])
+        return True
+
     async def load_self_roles(self):
         self.bot.logger.info("Loading Self Roles")
 
         db = self.bot.mongo_db("Server")
-        async for item in db.find({"self_roles": {"$exists": True}}):
-            info = item.get("self_roles", {})
-            channel = self.bot.get_partial_messageable(info["channel"], guild_id=item["id"])
-            msg = channel.get_partial_message(info["message"])
-            view = BasicRoleSelect(items=info.get("items", []))
-            if webhook_id := item.get("webhook_id"):
-                w = await self.bot.fetch_webhook(webhook_id)
-                await w.edit_message(message_id=msg.id, view=view)
-            else:
-                await msg.edit(view=view)
+        semaphore = asyncio.Semaphore(5)
+        items = [item async for item in db.find({"self_roles": {"$exists": True}})]
+        results = await asyncio.gather(*(self.refresh_self_roles(x, semaphore) for x in items), return_exceptions=True)
+
+        for item, result in zip(items, results):
+            if isinstance(result, Exception):
+                self.bot.logger.error("Failed to load Self Roles of %s", item["id"], exc_info=result)
 
-        self.bot.logger.info("Finished loading Self Roles")
+        edited = sum(x is True for x in results)
+        self.bot.logger.info("Finished loading Self Roles, %s of %s messages edited", edited, len(items))
 
     @commands.Cog.listener()
     async def on_ready(self):
@@ -147,19 +192,13 @@ class Roles(commands.Cog):
             (role_id := await self.fetch_no_ping_role(after.guild))
             and (roles := set(before.roles) ^ set(after.roles))
             and (no_ping_role := get(roles, id=role_id))
-            and (rule := await self.fetch_automod(after.guild))
         ):
-            members_text = " ".join(str(x.id) for x in sorted(no_ping_role.members, key=lambda x: x.id))
-            regex_patterns = [f"<@!?({line.replace(' ', '|')})>" for line in self.wrapper.wrap(members_text) if line]
-            if rule.trigger.regex_patterns != regex_patterns:
-                trigger = AutoModTrigger(regex_patterns=regex_patterns)
-                rule = await rule.edit(
-                    trigger=trigger,
-                    name="No Ping Automod",
-                    reason=f"Updated by {after}",
-                    enabled=True,
-                )
-                self.auto_mods[after.guild.id] = rule
+            self.automod.update(no_ping_role, after.id, no_ping_role in after.roles)
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload: RawMemberRemoveEvent):
+        if guild := self.bot.get_guild(payload.guild_id):
+            self.automod.remove(guild, payload.user.id)
 
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload: RawReactionActionEvent):
@@ -293,10 +332,9 @@ class Roles(commands.Cog):
         member : Member | User
             Member to ping
         """
-        db = self.bot.mongo_db("Characters")
         guild = itx.guild
         user = self.bot.supporting.get(itx.user, itx.user)
-        ocs = [Character.from_mongo_dict(x) async for x in db.find({"author": user.id, "server": guild.id})]
+        ocs = await self.bot.ocs.from_author(guild.id, user.id)
         modal = RPModal(user=user, ocs=ocs, to_user=member)
         if await modal.check(itx):
             await itx.response.send_modal(modal)
@@ -0,0 +1,219 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from typing import Awaitable, Callable, Iterable, Optional
+
+from discord import AutoModRule, AutoModTrigger, DiscordException, Guild, Role
+
+from src.structures.bot import CustomBot
+
+__all__ = ("NoPingAutomod", "build_patterns")
+
+RULE_NAME = "No Ping Automod"
+MAX_PATTERNS = 10
+MAX_PATTERN_LENGTH = 260
+MAX_RULES = 5
+
+
+def build_patterns(ids: Iterable[int]) -> list[str]:
+    """Mention patterns for the given user IDs, within Discord's pattern length
+
+    Parameters
+    ----------
+    ids : Iterable[int]
+        User IDs
+
+    Returns
+    -------
+    list[str]
+        Regex patterns, sorted by ID
+    """
+    patterns: list[str] = []
+    chunk: list[str] = []
+    length = base = len("<@!?()>")
+    for item in map(str, sorted(ids)):
+        size = len(item) + bool(chunk)
+        if chunk and length + size > MAX_PATTERN_LENGTH:
+            patterns.append(f"<@!?({'|'.join(chunk)})>")
+            chunk, length, size = [], base, len(item)
+        chunk.append(item)
+        length += size
+    if chunk:
+        patterns.append(f"<@!?({'|'.join(chunk)})>")
+    return patterns
+
+
+class NoPingAutomod:
+    """Keeps the No Ping automod rule in sync with the no-ping role.
+
+    Protected members are tracked per server out of role updates and
+    members leaving, so only changes to that set schedule a push, and
+    changes within delay seconds of each other get pushed together.
+    Patterns beyond a rule's limit go to extra rules named after the main
+    one, up to MAX_RULES.
+
+    Attributes
+    ----------
+    bot : CustomBot
+        Bot instance
+    fetch_rule : Callable[[Guild], Awaitable[Optional[AutoModRule]]]
+        Main rule of a server
+    delay : float
+        Seconds to wait for more changes before pushing
+    """
+
+    def __init__(
+        self,
+        bot: CustomBot,
+        fetch_rule: Callable[[Guild], Awaitable[Optional[AutoModRule]]],
+        delay: float = 10,
+    ) -> None:
+        self.bot = bot
+        self.fetch_rule = fetch_rule
+        self.delay = delay
+        self.members: dict[int, set[int]] = {}
+        self.pushed: dict[int, list[str]] = {}
+        self.extras: dict[int, list[AutoModRule]] = {}
+        self.tasks: dict[int, asyncio.Task] = {}
+        self.locks: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    def __repr__(self) -> str:
+        return f"NoPingAutomod(servers={len(self.members)}, pending={len(self.tasks)})"
+
+    def update(self, role: Role, member_id: int, protected: bool) -> None:
+        """Registers a member gaining or losing the no-ping role
+
+        Parameters
+        ----------
+        role : Role
+            No-ping role
+        member_id : int
+            Member ID
+        protected : bool
+            If the member has the role now
+        """
+        guild = role.guild
+        if (members := self.members.get(guild.id)) is None:
+            members = self.members[guild.id] = {x.id for x in role.members}
+        elif protected and member_id not in members:
+            members.add(member_id)
+        elif not protected and member_id in members:
+            members.remove(member_id)
+        else:
+            return
+
+        self.request(guild)
+
+    def remove(self, guild: Guild, member_id: int) -> None:
+        """Registers a member leaving the server
+
+        Parameters
+        ----------
+        guild : Guild
+            Server the member left
+        member_id : int
+            Member ID
+        """
+        if (members := self.members.get(guild.id)) and member_id in members:
+            members.remove(member_id)
+            self.request(guild)
+
+    def request(self, guild: Guild) -> None:
+        if guild.id not in self.tasks:
+            self.tasks[guild.id] = asyncio.create_task(self.schedule(guild), name=f"NoPingAutomod-{guild.id}")
+
+    async def schedule(self, guild: Guild) -> None:
+        await asyncio.sleep(self.delay)
+        self.tasks.pop(guild.id, None)
+        try:
+            await self.push(guild)
+        except DiscordException as e:
+            # Rules may have been created or deleted before the error
+            self.extras.pop(guild.id, None)
+            self.bot.logger.exception("Failed to update the No Ping Automod of %s", guild.id, exc_info=e)
+
+    async def fetch_extras(self, guild: Guild, rule: AutoModRule) -> list[AutoModRule]:
+        if (items := self.extras.get(guild.id)) is None:
+            items = sorted(
+                (
+                    x
+                    for x in await guild.fetch_automod_rules()
+                    if x.id != rule.id and x.creator_id == self.bot.user.id and x.name.startswith(RULE_NAME)
+                ),
+                key=lambda x: x.name,
+            )
+            self.extras[guild.id] = items
+        return items
+
+    async def push(self, guild: Guild) -> None:
+        """Updates the rules of a server if its patterns changed
+
+        Parameters
+        ----------
+        guild : Guild
+            Server to update
+        """
+        async with self.locks[guild.id]:
+            if not (rule := await self.fetch_rule(guild)):
+                return
+
+            patterns = build_patterns(self.members.get(guild.id, ()))
+            if patterns == self.pushed.get(guild.id, rule.trigger.regex_patterns):
+                return
+
+            if len(patterns) > MAX_PATTERNS * MAX_RULES:
+                self.bot.logger.warning("No Ping Automod of %s is over the limit, %s patterns", guild.id, len(patterns))
+
+            groups = [patterns[i : i + MAX_PATTERNS] for i in range(0, len(patterns), MAX_PATTERNS)][:MAX_RULES]
+            main, *others = groups or [[]]
+
+            if (previous := self.pushed.get(guild.id)) is not None:
+                previous = previous[:MAX_PATTERNS]
+            else:
+                previous = rule.trigger.regex_patterns
+
+            if previous != main:
+                await rule.edit(trigger=AutoModTrigger(regex_patterns=main), enabled=True, reason="No Ping role update")
+
+            extras = await self.fetch_extras(guild, rule)
+            items: list[AutoModRule] = []
+            for index, group in enumerate(others):
+                trigger = AutoModTrigger(regex_patterns=group)
+                if index < len(extras):
+                    extra = extras[index]
+                    if extra.trigger.regex_patterns != group:
+                        extra = await extra.edit(trigger=trigger, enabled=True, reason="No Ping role update")
+                else:
+                    extra = await guild.create_automod_rule(
+                        name=f"{RULE_NAME} {index + 2}",
+                        event_type=rule.event_type,
+                        trigger=trigger,
+                        actions=rule.actions,
+                        enabled=True,
+                        exempt_roles=rule.exempt_roles,
+                        exempt_channels=rule.exempt_channels,
+                        reason="No Ping role update",
+                    )
+                items.append(extra)
+
+            for extra in extras[len(others) :]:
+                await extra.delete(reason="No Ping role update")
+
+            self.extras[guild.id] = items
+            self.pushed[guild.id] = patterns
@@ -195,16 +195,11 @@ class RPSearchManage(View):
     async def check_ocs(self, itx: Interaction[CustomBot], btn: Button):
         resp: InteractionResponse = itx.response
         await resp.defer(ephemeral=True, thinking=True)
-        db = itx.client.mongo_db("Characters")
         items = [x.id if isinstance(x, Character) else x for x in self.ocs]
+        server = self.server_id or itx.guild_id
 
-        key = {
-            "author": self.member_id,
-            "server": self.server_id or itx.guild_id,
-        }
-
-        if not (ocs := [Character.from_mongo_dict(x) async for x in db.find({"id": {"$in": items}} | key)]):
-            ocs = [Character.from_mongo_dict(x) async for x in db.find(key)]
+        if not (ocs := await itx.client.ocs.from_ids(server, items, author=self.member_id)):
+            ocs = await itx.client.ocs.from_author(server, self.member_id)
 
         view = CharactersView(
             member=itx.user,
@@ -363,29 +358,21 @@ class RPModal(Modal):
                 items.append(data[0])
 
         cog1 = itx.client.get_cog("Roles")
-        db = itx.client.mongo_db("Characters")
         items.extend(
-            [
-                Character.from_mongo_dict(x)
-                async for x in db.find(
-                    {
-                        "id": {
-                            "$in": [
-                                int(item)
-                                for item in chain(
-                                    self.select_ocs1.values,
-                                    self.select_ocs2.values,
-                                    self.select_ocs3.values,
-                                    self.select_ocs4.values,
-                                )
-                                if item.isdigit()
-                            ]
-                        },
-                        "author": self.user.id,
-                        "server": itx.guild_id,
-                    }
-                )
-            ]
+            await itx.client.ocs.from_ids(
+                itx.guild_id,
+                [
+                    int(item)
+                    for item in chain(
+                        self.select_ocs1.values,
+                        self.select_ocs2.values,
+                        self.select_ocs3.values,
+                        self.select_ocs4.values,
+                    )
+                    if item.isdigit()
+                ],
+                author=self.user.id,
+            )
         )
 
         db1 = itx.client.mongo_db("Server")
@@ -236,7 +236,7 @@ class GoogleDocsOCParser(OCParser):
         content = text.content if isinstance(text, Message) else text
         content: str = codeblock_converter(content or "").content
         if doc_data := G_DOCUMENT.match(content):
-            doc = await docs_aioreader(url := doc_data.group(1), bot.aiogoogle)
+            doc = await docs_aioreader(url := doc_data.group(1), bot.aiogoogle, await bot.google.drive())
             msg_data = doc_convert(doc)
             msg_data["url"] = url
             return msg_data
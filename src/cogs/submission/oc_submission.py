@@ -47,7 +47,6 @@ from discord.ui import (
 )
 from discord.utils import MISSING, get
 from frozendict import frozendict
-from motor.motor_asyncio import AsyncIOMotorCollection
 
 from src.cogs.roles.roles import RPModal
 from src.cogs.submission.area_selection import RegionViewComplex
@@ -382,14 +381,13 @@ class Template(TemplateItem, Enum):
 
     async def process(self, oc: Character, itx: Interaction[CustomBot], ephemeral: bool):
         choices: list[Species] = []
-        db: AsyncIOMotorCollection = itx.client.mongo_db("Characters")
         mons = self.total_species
 
-        key = {"server": itx.guild_id}
+        authors = None
         if role := get(itx.guild.roles, name="Roleplayer"):
-            key["author"] = {"$in": [x.id for x in role.members]}
+            authors = [x.id for x in role.members]
 
-        ocs = [Character.from_mongo_dict(x) async for x in db.find(key)]
+        ocs = await itx.client.ocs.from_server(itx.guild_id, authors)
         view = SpeciesComplex(
             member=itx.user,
             target=itx,
@@ -760,11 +758,10 @@ class PreEvoSpeciesField(TemplateField, name="Pre-Evolution"):
         ephemeral: bool = False,
     ):
         mon_total = {x for x in Pokemon.all() if not x.banned}
-        db: AsyncIOMotorCollection = itx.client.mongo_db("Characters")
-        key = {"server": itx.guild_id}
+        authors = None
         if role := get(itx.guild.roles, name="Roleplayer"):
-            key["author"] = {"$in": [x.id for x in role.members]}
-        ocs = [Character.from_mongo_dict(x) async for x in db.find(key)]
+            authors = [x.id for x in role.members]
+        ocs = await itx.client.ocs.from_server(itx.guild_id, authors)
         view = SpeciesComplex(member=itx.user, target=itx, mon_total=mon_total, ocs=ocs)
         async with view.send(
             title="Select if it has a canon Pre-Evo (Skip if not needed)",
@@ -1434,7 +1431,7 @@ class CreationOCView(Basic):
     @button(emoji="\N{PRINTER}", style=ButtonStyle.blurple, row=3)
     async def printer(self, itx: Interaction[CustomBot], _: Button):
         await itx.response.defer(ephemeral=True, thinking=True)
-        oc_file = await self.oc.to_docx(itx.client)
+        oc_file = await self.oc.to_docx(itx.client, itx.user.id)
         await itx.followup.send(file=oc_file, ephemeral=True)
         itx.client.logger.info("User %s printed %s", str(itx.user), repr(self.oc))
 
@@ -1664,10 +1661,9 @@ class TemplateSelectionView(Basic):
 class SubmissionView(Basic):
     @select(cls=UserSelect, placeholder="Read User's OCs", custom_id="user-ocs", min_values=0, row=0)
     async def user_ocs(self, itx: Interaction[CustomBot], sct: UserSelect):
-        db: AsyncIOMotorCollection = itx.client.mongo_db("Characters")
         member: Member = sct.values[0] if sct.values else itx.user
         await itx.response.defer(ephemeral=True, thinking=True)
-        values = [Character.from_mongo_dict(x) async for x in db.find({"author": member.id, "server": itx.guild_id})]
+        values = await itx.client.ocs.from_author(itx.guild_id, member.id)
         values.sort(key=lambda x: x.name)
         view = ModCharactersView(member=itx.user, target=itx, ocs=values)
         view.embed.set_author(name=member.display_name, icon_url=member.display_avatar)
@@ -1711,12 +1707,11 @@ class SubmissionView(Basic):
         style=ButtonStyle.blurple,
     )
     async def oc_update(self, itx: Interaction[CustomBot], _: Button):
-        db: AsyncIOMotorCollection = itx.client.mongo_db("Characters")
         resp: InteractionResponse = itx.response
         member: Member = itx.user
         await resp.defer(ephemeral=True, thinking=True)
         member = itx.client.supporting.get(member, member)
-        values = [Character.from_mongo_dict(x) async for x in db.find({"author": member.id, "server": itx.guild_id})]
+        values = await itx.client.ocs.from_author(itx.guild_id, member.id)
         values.sort(key=lambda x: x.name)
         view = ModCharactersView(member=itx.user, target=itx, ocs=values)
         view.embed.set_author(name=member.display_name, icon_url=member.display_avatar.url)
@@ -1725,13 +1720,11 @@ class SubmissionView(Basic):
 
     @button(label="Delete", style=ButtonStyle.red, emoji="\N{WASTEBASKET}", row=1, custom_id="delete-oc")
     async def oc_delete(self, itx: Interaction[CustomBot], _: Button):
-        db: AsyncIOMotorCollection = itx.client.mongo_db("Characters")
         resp: InteractionResponse = itx.response
         member: Member = itx.user
         await resp.defer(ephemeral=True, thinking=True)
         member = itx.client.supporting.get(member, member)
-        key = {"author": member.id, "server": itx.guild_id}
-        values = [Character.from_mongo_dict(x) async for x in db.find(key)]
+        values = await itx.client.ocs.from_author(itx.guild_id, member.id)
         values.sort(key=lambda x: x.name)
         view = BaseCharactersView(
             member=itx.user,
@@ -1754,11 +1747,10 @@ class SubmissionView(Basic):
 
     # @button(label="Check Map", emoji="\N{WORLD MAP}", row=3, custom_id="see-map")
     async def see_map(self, itx: Interaction[CustomBot], _: Button):
-        db = itx.client.mongo_db("Characters")
-        key = {"server": itx.guild_id}
+        authors = None
         if role := get(itx.guild.roles, name="Roleplayer"):
-            key["author"] = {"$in": [x.id for x in role.members]}
-        ocs = [Character.from_mongo_dict(x) async for x in db.find(key)]
+            authors = [x.id for x in role.members]
+        ocs = await itx.client.ocs.from_server(itx.guild_id, authors)
         view = RegionViewComplex(member=itx.user, target=itx, ocs=ocs)
         await view.simple_send(ephemeral=True)
 
@@ -1768,21 +1760,12 @@ class SubmissionView(Basic):
 
     @button(label="RP Search", row=2, custom_id="rp-search", emoji="🔍")
     async def rp_search(self, itx: Interaction[CustomBot], _: Button):
-        db = itx.client.mongo_db("Characters")
         db1 = itx.client.mongo_db("Characters")
 
         guild = itx.guild
         user = itx.client.supporting.get(itx.user, itx.user)
 
-        ocs = [
-            Character.from_mongo_dict(x)
-            async for x in db.find(
-                {
-                    "author": user.id,
-                    "server": guild and guild.id,
-                }
-            )
-        ]
+        ocs = await itx.client.ocs.from_author(guild and guild.id, user.id)
         ocs.sort(key=lambda x: x.name)
 
         if info := await db1.find_one(
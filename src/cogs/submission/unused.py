@@ -14,15 +14,14 @@
 
 
 import asyncio
-import io
 import random
+from collections import defaultdict
 from contextlib import suppress
 from datetime import datetime, timedelta
 from itertools import zip_longest
 from textwrap import wrap
 from typing import Optional
 
-import matplotlib.pyplot as plt
 import numpy as np
 from cachetools import LRUCache
 from discord import (
@@ -53,7 +52,7 @@ from discord.app_commands import ContextMenu
 from discord.ext import commands
 from discord.ui import Button, View
 from discord.utils import MISSING, find, get
-from rapidfuzz import fuzz, process
+from rapidfuzz import process
 
 from src.cogs.submission.oc_parsers import ParserMethods
 from src.cogs.submission.oc_submission import (
@@ -65,6 +64,8 @@ from src.structures.ability import SpAbility
 from src.structures.bot import CustomBot
 from src.structures.character import Character, CharacterArg
 from src.structures.move import Move
+from src.structures.plotter import WeatherPlot
+from src.structures.proxy import ProxyStatus
 from src.structures.weather import Weather
 from src.utils.etc import MAP_ELEMENTS2, REPLY_EMOJI, WHITE_BAR, Month
 from src.utils.functions import safe_username
@@ -132,9 +133,9 @@ def datetime_ttu(_, value: timedelta, now: datetime):
 class Submission(commands.Cog):
     def __init__(self, bot: CustomBot):
         self.bot = bot
-        self.data_db: dict[int, dict] = {}
         self.ignore: set[int] = set()
         self.thread_owner: LRUCache[int, int] = LRUCache(maxsize=1000)
+        self.log_locks: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
         self.ready = False
         self.itx_menu1 = ContextMenu(
             name="Moves & Abilities",
@@ -161,9 +162,7 @@ class Submission(commands.Cog):
         resp: InteractionResponse = itx.response
         await resp.defer(ephemeral=True, thinking=True)
         moves: list[SpAbility | Move] = []
-        db = self.bot.mongo_db("Characters")
-        if data := await db.find_one({"id": message.id, "server": itx.guild_id}):
-            oc = Character.from_mongo_dict(data)
+        if oc := await self.bot.ocs.get(itx.guild_id, message.id):
             moves = list(oc.moveset)
             if sp_ability := oc.sp_ability:
                 moves.append(sp_ability)
@@ -190,8 +189,7 @@ class Submission(commands.Cog):
     async def check_ocs(self, itx: Interaction[CustomBot], member: Member):
         resp: InteractionResponse = itx.response
         await resp.defer(ephemeral=True, thinking=True)
-        db = self.bot.mongo_db("Characters")
-        ocs = [Character.from_mongo_dict(x) async for x in db.find({"author": member.id, "server": itx.guild_id})]
+        ocs = await self.bot.ocs.from_author(itx.guild_id, member.id)
         view = ModCharactersView(member=itx.user, ocs=ocs, target=itx, keep_working=True)
         embed = view.embed
         embed.color = member.color
@@ -224,15 +222,10 @@ class Submission(commands.Cog):
 
         data = data or {}
 
-        if not (info := self.data_db.get(server_id)):
-            db1 = self.bot.mongo_db("Server")
-            info = await db1.find_one(
-                {"id": server_id, "oc_list": {"$exists": True}},
-                {"_id": 0, "oc_list": 1},
-            )
+        info = await self.bot.get_config(server_id)
 
-        if not (channel := self.bot.get_channel(info["oc_list"])):
-            channel: ForumChannel = await self.bot.fetch_channel(info["oc_list"])
+        if not (channel := self.bot.get_channel(info.oc_list)):
+            channel: ForumChannel = await self.bot.fetch_channel(info.oc_list)
 
         if data:
             if not (thread := channel.get_thread(data["id"])):
@@ -337,31 +330,14 @@ class Submission(commands.Cog):
                 except DiscordException:
                     pass
 
-            db = self.bot.mongo_db("Characters")
+            if former is None:
+                former = await self.bot.ocs.get(oc.server, oc.id)
 
-            if former is None and (data := await db.find_one({"id": oc.id})):
-                former = Character.from_mongo_dict(data)
+            await self.bot.ocs.upsert(oc, reference_id)
 
-            await db.replace_one(
-                {
-                    "id": reference_id,
-                    "server": oc.server,
-                },
-                oc.to_mongo_dict(),
-                upsert=True,
-            )
+            info = await self.bot.get_config(oc.server)
 
-            if not (info := self.data_db.get(thread.guild.id)):
-                db1 = self.bot.mongo_db("Server")
-                info = await db1.find_one(
-                    {
-                        "id": oc.server,
-                        "oc_modifications.channel": {"$exists": True},
-                    },
-                    {"_id": 0, "oc_modifications": 1},
-                )
-
-            if logging and info:
+            if logging and info.oc_modifications.get("channel"):
                 self.bot.logger.info(
                     "Character has been %s! > %s > %s",
                     word,
@@ -373,7 +349,7 @@ class Submission(commands.Cog):
                     if former:
                         pack_embeds: list[list[Embed]] = []
                         pack_files: list[list[File]] = []
-                        log = await self.bot.webhook(info["oc_modifications"]["channel"], reason="Logging")
+                        log = await self.bot.webhook(info.oc_modifications["channel"], reason="Logging")
                         if isinstance(user, (User, Member)):
                             username, avatar_url = user.display_name, user.display_avatar.url
                         else:
@@ -409,7 +385,7 @@ class Submission(commands.Cog):
                             pack_files.append(files)
 
                         thread = MISSING
-                        if thread_id := info["oc_modifications"].get("thread"):
+                        if thread_id := info.oc_modifications.get("thread"):
                             thread = Object(id=thread_id)
 
                         for embeds, files in zip(pack_embeds, pack_files):
@@ -444,27 +420,19 @@ class Submission(commands.Cog):
         else:
             refer_author = message.author
 
-        if not (info := self.data_db.get(message.guild.id)):
-            info = await self.bot.mongo_db("Server").find_one(
-                {
-                    "id": message.guild.id,
-                    "oc_images": {"$exists": True},
-                    "staff": {"$exists": True},
-                },
-                {"_id": 0, "oc_images": 1, "staff": 1},
-            )
+        info = await self.bot.get_config(message.guild.id)
 
-        if msg_data and info:
+        if msg_data and info.oc_images and info.staff:
             author: Member = self.bot.supporting.get(refer_author, refer_author)
             if oc := Character.process(**msg_data):
                 if isinstance(oc.image, File):
-                    w = await self.bot.webhook(info["staff"])
+                    w = await self.bot.webhook(info.staff)
                     msg = await w.send(
                         content=oc.document_url or "",
                         file=oc.image,
                         username=safe_username(author.display_name),
                         avatar_url=author.display_avatar.url,
-                        thread=Object(id=info["oc_images"]),
+                        thread=Object(id=info.oc_images),
                         wait=True,
                     )
                     if msg.attachments:
@@ -517,8 +485,6 @@ class Submission(commands.Cog):
             return
 
         author = message.author.name.title()
-        db = self.bot.mongo_db("RP Logs")
-        db2 = self.bot.mongo_db("Tupper-logs")
         key, oc = message.author.name, Character(author=user.id, server=user.guild.id)
 
         kwargs = kwargs or {}
@@ -587,7 +553,7 @@ class Submission(commands.Cog):
                             content = EMOJI_REGEX.sub(url, content)
 
         if channel_id and message_id:
-            if item := await db.find_one({"id": message_id, "channel": channel_id}):
+            if item := await self.bot.log_writer.find_one("RP Logs", {"id": message_id, "channel": channel_id}):
                 aux = info_channel.get_partial_message(item["log"])
             else:
                 ch = self.bot.get_partial_messageable(id=channel_id)
@@ -595,34 +561,40 @@ class Submission(commands.Cog):
             view.add_item(Button(label=phrase[:80], url=aux.jump_url, emoji=REPLY_EMOJI))
 
         text = wrap(content or "\u200b", 2000, replace_whitespace=False, placeholder="")
-        for index, paragraph in enumerate(text):
-            msg = await log_w.send(
-                content=paragraph,
-                username=safe_username(message.author.display_name),
-                avatar_url=message.author.display_avatar.url,
-                thread=info_channel,
-                files=[await x.to_file() for x in message.attachments],
-                allowed_mentions=AllowedMentions.none(),
-                view=view if len(text) == index + 1 else MISSING,
-                wait=True,
-                silent=True,
-            )
+        files = [await x.to_file() for x in message.attachments]
+        logs: list[Message] = []
+        async with self.log_locks[info_channel.id]:
+            for index, paragraph in enumerate(text, start=1):
+                last = len(text) == index
+                msg = await log_w.send(
+                    content=paragraph,
+                    username=safe_username(message.author.display_name),
+                    avatar_url=message.author.display_avatar.url,
+                    thread=info_channel,
+                    files=files if last else MISSING,
+                    allowed_mentions=AllowedMentions.none(),
+                    view=view if last else MISSING,
+                    wait=True,
+                    silent=True,
+                )
+                logs.append(msg)
 
-            await db.insert_one(
+        self.bot.log_writer.add(
+            "RP Logs",
+            *(
                 {
                     "id": message.id,
                     "channel": message.channel.id,
                     "log": msg.id,
                     "log-channel": info_channel.id,
                 }
-            )
-            await db2.insert_one(
-                {
-                    "channel": info_channel.id,
-                    "id": msg.id,
-                    "author": oc.author,
-                }
-            )
+                for msg in logs
+            ),
+        )
+        self.bot.log_writer.add(
+            "Tupper-logs",
+            *({"channel": info_channel.id, "id": msg.id, "author": oc.author} for msg in logs),
+        )
 
     async def on_message_proxy(self, message: Message):
         """This method processes tupper messages
@@ -637,76 +609,25 @@ class Submission(commands.Cog):
         if context.command:
             return
 
-        messages: list[Message] = []
-
-        def checker(m: Message):
-            if m.webhook_id and message.channel == m.channel:
-                messages.append(m)
-            return False
-
-        done, pending = await asyncio.wait(
-            [
-                asyncio.create_task(
-                    self.bot.wait_for("message", check=checker, timeout=2),
-                    name="Message",
-                ),
-                asyncio.create_task(
-                    self.bot.wait_for("message_edit", check=lambda x, _: x == message),
-                    name="Edit",
-                ),
-                asyncio.create_task(
-                    self.bot.wait_for("message_delete", check=lambda x: x == message),
-                    name="Delete",
-                ),
-            ],
-            return_when=asyncio.FIRST_COMPLETED,
-        )
-
-        for future in pending:
-            future.cancel()
-
-        for future in done:
-            future.exception()
+        result = await self.bot.proxies.track(message)
 
-        if any(future.get_name() == "Edit" for future in done):
+        if result.status == ProxyStatus.Edited:
             return
 
-        if not messages:
-            if any(future.get_name() == "Message" for future in done):
+        if not result.proxies:
+            if result.status == ProxyStatus.Timeout:
                 await self.on_message_tupper(message, message.author)
             return
 
-        db = self.bot.mongo_db("Characters")
         kwargs: dict[str, Character] = {}
-        async for x in db.find(
-            {
-                "author": message.author.id,
-                "server": message.guild.id if message.guild else 0,
-            }
-        ):
-            oc = Character.from_mongo_dict(x)
+        for oc in await self.bot.ocs.from_author(message.guild.id if message.guild else 0, message.author.id):
             for name in oc.name.split(","):
                 if name := name.strip():
                     kwargs[name.split()[0]] = oc
                     kwargs[name] = oc
 
-        attachments = message.attachments
-        for msg in sorted(messages, key=lambda x: x.id):
-            if data := TUPPER_REPLY_PATTERN.search(msg.content):
-                text = str(data.group("content") or msg.content)
-            else:
-                text = msg.content
-
-            if (
-                fuzz.WRatio(text, message.content, score_cutoff=95)
-                or text in message.content
-                or (
-                    attachments
-                    and len(attachments) == len(msg.attachments)
-                    and all(x.filename == y.filename for x, y in zip(attachments, msg.attachments))
-                )
-            ):
-                await self.on_message_tupper(msg, message.author, kwargs)
+        for msg in result.proxies:
+            await self.on_message_tupper(msg, message.author, kwargs)
 
     async def load_submssions(self):
         self.bot.logger.info("Loading Submission menu")
@@ -718,7 +639,6 @@ class Submission(commands.Cog):
                 "oc_submission_msg": {"$exists": True},
             },
         ):
-            self.data_db[item["id"]] = item
             view = SubmissionView(timeout=None)
             channel = self.bot.get_partial_messageable(id=item["oc_submission"], guild_id=item["id"])
             message = channel.get_partial_message(item["oc_submission_msg"])
@@ -743,27 +663,11 @@ class Submission(commands.Cog):
         if not isinstance(parent := thread.parent, ForumChannel) or self.bot.user == thread.owner:
             return
 
-        if not (item := self.data_db.get(thread.guild.id)):
-            db = self.bot.mongo_db("Server")
-            item = await db.find_one(
-                {
-                    "id": thread.guild.id,
-                    "rp_planning": {"$exists": True},
-                    "looking_for_rp": {"$exists": True},
-                    "rp_session_log": {"$exists": True},
-                },
-                {
-                    "_id": 0,
-                    "threading": 1,
-                    "no_thread_categories": 1,
-                    "rp_planning": 1,
-                    "looking_for_rp": 1,
-                    "rp_session_log": 1,
-                },
-            )
-            item = item or {}
+        item = await self.bot.get_config(thread.guild.id)
+        if not (item.rp_planning and item.looking_for_rp and item.rp_session_log):
+            return
 
-        if thread.category_id in item.get("no_thread_categories", []):
+        if thread.category_id in item.no_thread_categories:
             return
 
         await asyncio.sleep(1)
@@ -772,14 +676,14 @@ class Submission(commands.Cog):
         except NotFound:
             return
 
-        if thread.parent_id == item.get("rp_planning"):
+        if thread.parent_id == item.rp_planning:
             db = self.bot.mongo_db("RP Search Banner")
             if aux := await db.find_one({"author": thread.owner.id, "server": thread.guild.id}):
                 image = aux["image"]
             else:
                 image = DEFAULT_IMAGE
 
-            ping_role = thread.guild.get_role(item["looking_for_rp"])
+            ping_role = thread.guild.get_role(item.looking_for_rp)
             await msg.pin(reason=f"Thread created by {thread.owner}")
             embed = Embed(
                 title="Reminder",
@@ -796,7 +700,7 @@ class Submission(commands.Cog):
                 allowed_mentions=AllowedMentions(roles=[ping_role]),
                 mention_author=True,
             )
-        elif item.get("threading"):
+        elif item.threading:
             data = await parent.create_thread(
                 name=thread.name,
                 content=msg.content[:2000],
@@ -856,12 +760,9 @@ class Submission(commands.Cog):
         if not message.guild:
             return
 
-        if not (item := self.data_db.get(message.guild.id)):
-            db = self.bot.mongo_db("Server")
-            item = await db.find_one({"id": message.guild.id})
-            item = item or {}
+        item = await self.bot.get_config(message.guild.id)
 
-        if message.channel.id == item.get("oc_submission"):
+        if message.channel.id == item.oc_submission:
             await self.on_message_submission(message)
         elif isinstance(message.channel, Thread):
             tag = get(message.channel.applied_tags, name="Don't Chat Here")
@@ -892,8 +793,8 @@ class Submission(commands.Cog):
             return
 
         content: str = payload.data.get("content", "")
-        db = self.bot.mongo_db("RP Logs")
-        if item := await db.find_one({"id": payload.message_id, "channel": payload.channel_id}):
+        query = {"id": payload.message_id, "channel": payload.channel_id}
+        if item := await self.bot.log_writer.find_one("RP Logs", query):
             log_channel = Object(id=item["log-channel"])
             w = await self.bot.webhook(log_channel.id)
             await w.edit_message(item["log"], content=content, thread=log_channel)
@@ -912,24 +813,18 @@ class Submission(commands.Cog):
         if not message.guild or previous.content == message.content:
             return
 
-        db = self.bot.mongo_db("RP Logs")
-        if not (info := self.data_db.get(message.guild.id)):
-            db1 = self.bot.mongo_db("Server")
-            info = await db1.find_one(
-                {"id": message.guild.id, "oc_submission": {"$exists": True}},
-                {"_id": 0, "oc_submission": 1},
-            )
-            info = info or {}
+        info = await self.bot.get_config(message.guild.id)
 
-        if message.channel.id == info.get("oc_submission"):
+        if message.channel.id == info.oc_submission:
             await self.on_message_submission(message)
         elif (
             isinstance(message.channel, Thread)
             and isinstance(message.channel.parent, ForumChannel)
-            and message.channel.category_id not in info.get("no_thread_categories", [])
+            and message.channel.category_id not in info.no_thread_categories
             and not message.channel.name.endswith(" Logs")
         ):
-            if item := await db.find_one({"id": message.id, "channel": message.channel.id}):
+            query = {"id": message.id, "channel": message.channel.id}
+            if item := await self.bot.log_writer.find_one("RP Logs", query):
                 log_channel = Object(id=item["log-channel"])
                 w = await self.bot.webhook(log_channel.id)
                 await w.edit_message(item["log"], content=message.content, thread=log_channel)
@@ -972,9 +867,8 @@ class Submission(commands.Cog):
             Information
         """
         db = self.bot.mongo_db("Roleplayers")
-        db2 = self.bot.mongo_db("Characters")
         await db.delete_one({"server": payload.guild_id, "id": payload.thread_id})
-        await db2.delete_many({"server": payload.guild_id, "thread": payload.thread_id})
+        await self.bot.ocs.delete_thread(payload.guild_id, payload.thread_id)
 
     @commands.Cog.listener()
     async def on_raw_message_delete(self, payload: RawMessageDeleteEvent) -> None:
@@ -986,20 +880,17 @@ class Submission(commands.Cog):
             Information
         """
 
-        ocs_db = self.bot.mongo_db("Characters")
-        if oc_data := await ocs_db.find_one_and_delete({"id": payload.message_id, "server": payload.guild_id}):
-            oc = Character.from_mongo_dict(oc_data)
-            if not await ocs_db.find_one({"author": oc.author, "server": payload.guild_id}):
+        if oc := await self.bot.ocs.delete(payload.guild_id, payload.message_id):
+            if not await self.bot.ocs.from_author(payload.guild_id, oc.author):
                 guild = self.bot.get_guild(payload.guild_id)
                 if thread := get(guild.threads, id=oc.thread):
                     await thread.delete()
 
-        log_db = self.bot.mongo_db("RP Logs")
-        proxy_db = self.bot.mongo_db("Tupper-logs")
-        if item := await log_db.find_one_and_delete({"id": payload.message_id, "channel": payload.channel_id}):
+        query = {"id": payload.message_id, "channel": payload.channel_id}
+        if item := await self.bot.log_writer.find_one_and_delete("RP Logs", query):
             log_channel = Object(id=item["log-channel"])
             w = await self.bot.webhook(log_channel.id)
-            await proxy_db.delete_one({"channel": log_channel.id, "id": item["log"]})
+            await self.bot.log_writer.find_one_and_delete("Tupper-logs", {"channel": log_channel.id, "id": item["log"]})
             with suppress(DiscordException):
                 await w.delete_message(item["log"], thread=log_channel)
 
@@ -1037,8 +928,7 @@ class Submission(commands.Cog):
                 await itx.followup.send(content=character.id, embeds=character.embeds, view=view, ephemeral=True)
             return
 
-        db = self.bot.mongo_db("Characters")
-        ocs = [Character.from_mongo_dict(item) async for item in db.find({"author": member.id, "server": itx.guild_id})]
+        ocs = await self.bot.ocs.from_author(itx.guild_id, member.id)
         ocs.sort(key=lambda x: x.name)
         view = ModCharactersView(member=itx.user, ocs=ocs, target=itx, keep_working=True)
         embed = view.embed
@@ -1174,36 +1064,12 @@ class Submission(commands.Cog):
         mean = np.mean(probabilities)
         std_dev = np.std(probabilities)
 
-        plt.figure(figsize=(12, 6))
-        bars = plt.bar([x.ref_name for x in keys], values, color="skyblue", label="Probabilities")
-
-        for bar, value in zip(bars, values):
-            plt.text(
-                bar.get_x() + bar.get_width() / 2,
-                bar.get_height() - (max(values) * 0.05),
-                f"{value} %",
-                ha="center",
-                va="bottom",
-                fontsize=10,
-                color="black",
-            )
-
-        plt.title(
-            f"Weather Probabilities in {channel.name} (Mean: {mean:.2f}% | SD: {std_dev:.2f}%)",
-            fontsize=18,
+        plot = WeatherPlot(
+            title=f"Weather Probabilities in {channel.name} (Mean: {mean:.2f}% | SD: {std_dev:.2f}%)",
+            labels=tuple(x.ref_name for x in keys),
+            values=values,
         )
-        plt.legend(fontsize=14)
-        plt.grid(True, linestyle="--", alpha=0.7)
-        plt.xlabel("Weather Type", fontsize=14)
-        plt.ylabel("Probability (%)", fontsize=14)
-        plt.xticks(ticks=np.arange(len(keys)), labels=[x.ref_name for x in keys], rotation=45, ha="right", fontsize=12)
-        plt.yticks(fontsize=12)
-        plt.tight_layout()
-
-        buf = io.BytesIO()
-        plt.savefig(buf, format="png")
-        buf.seek(0)
-        file = File(buf, filename="plot.png")
+        file = await self.bot.plotter.render(plot, key=channel.id)
         await ctx.reply(file=file, ephemeral=True, embed=embed)
 
 
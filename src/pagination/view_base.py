@@ -268,7 +268,7 @@ class Basic(View):
                 data.pop("ephemeral", None)
                 self.message = await target.channel.send(**data)
             if message := self.message:
-                target.client.msg_cache.add(message.id)
+                target.client.msg_cache_add(message)
         elif isinstance(target, Webhook):
             self.message = await target.send(**data, wait=True)
         else:
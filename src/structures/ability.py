@@ -24,9 +24,10 @@ from typing import Any, Callable, Optional
 from discord import Embed
 from discord.utils import find, get
 from frozendict import frozendict
-from rapidfuzz import process
 
+from src.utils.deducer import FuzzyDeducer
 from src.utils.functions import fix
+from src.utils.snapshot import load_snapshot
 
 __all__ = (
     "Ability",
@@ -36,6 +37,7 @@ __all__ = (
 )
 
 ALL_ABILITIES = frozendict()
+ABILITY_DEDUCER: FuzzyDeducer[Ability] = FuzzyDeducer(())
 ABILITIES_DEFINING = ["Beast Boost", "Protosynthesis", "Quark Drive"]
 
 
@@ -129,17 +131,7 @@ class Ability:
         """
         if isinstance(item, cls):
             return item
-        if not (data := ALL_ABILITIES.get(fix(item))) and (
-            items := process.extractOne(
-                item,
-                cls.all(),
-                processor=lambda x: getattr(x, "name", x),
-                score_cutoff=85,
-            )
-        ):
-            data = items[0]
-        if isinstance(data, Ability):
-            return data
+        return ABILITY_DEDUCER(item)
 
     @classmethod
     def from_ID(cls, item: str) -> Optional[Ability]:
@@ -295,5 +287,17 @@ class AbilityEncoder(JSONEncoder):
         return super(AbilityEncoder, self).default(o)
 
 
-with open("resources/abilities.json", mode="r", encoding="utf8") as f:
-    ALL_ABILITIES = frozendict({ab.id: ab for ab in map(Ability.hook, load(f)) if ab})
+def load_abilities() -> frozendict[str, Ability]:
+    """Reads the ability resources
+
+    Returns
+    -------
+    frozendict[str, Ability]
+        Abilities by ID
+    """
+    with open("resources/abilities.json", mode="r", encoding="utf8") as f:
+        return frozendict({ab.id: ab for ab in map(Ability.hook, load(f)) if ab})
+
+
+ALL_ABILITIES = load_snapshot("abilities", load_abilities, "resources/abilities.json")
+ABILITY_DEDUCER = FuzzyDeducer(ALL_ABILITIES.values(), by_id=ALL_ABILITIES)
@@ -0,0 +1,264 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from contextlib import suppress
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Optional
+
+from pymongo.errors import AutoReconnect, BulkWriteError, NetworkTimeout
+
+if TYPE_CHECKING:
+    from src.structures.bot import CustomBot
+
+__all__ = ("BatchWriter",)
+
+# Errors after which the whole batch can be written again
+TRANSIENT_ERRORS = (AutoReconnect, NetworkTimeout)
+# Error code of a duplicate key, as reported for documents already written
+DUPLICATE_KEY = 11000
+
+
+class BatchWriter:
+    """Write-behind buffer for Mongo inserts.
+
+    Documents are buffered per collection and written with insert_many once
+    the buffer reaches max_size or delay seconds after the first pending
+    document, whichever comes first. Buffered documents can still be looked
+    up or discarded, and everything left gets flushed on exit.
+
+    Batches failing on connection errors go back to the buffer and get
+    written again after delay seconds. Other failures write the batch one
+    document at a time, so only the documents that can't be stored are lost.
+
+    Attributes
+    ----------
+    bot : CustomBot
+        Bot instance
+    max_size : int
+        Pending documents that trigger a flush
+    delay : float
+        Max seconds a document stays buffered
+    """
+
+    def __init__(self, bot: CustomBot, max_size: int = 100, delay: float = 2) -> None:
+        self.bot = bot
+        self.max_size = max_size
+        self.delay = delay
+        self.buffers: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+        self.writing: dict[str, list[dict[str, Any]]] = {}
+        self.pending = asyncio.Event()
+        self.full = asyncio.Event()
+        self.flushed = asyncio.Event()
+        self.flushed.set()
+        self.lock = asyncio.Lock()
+        self.task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return sum(map(len, self.buffers.values()))
+
+    def __repr__(self) -> str:
+        return f"BatchWriter(pending={len(self)}, max_size={self.max_size}, delay={self.delay})"
+
+    async def __aenter__(self) -> BatchWriter:
+        if self.task is None:
+            self.task = asyncio.create_task(self.run(), name="BatchWriter")
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        if task := self.task:
+            self.task = None
+            async with self.lock:
+                task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        if not await self.flush():
+            self.bot.logger.error("BatchWriter exited with %s unwritten documents", len(self))
+
+    def add(self, name: str, *docs: dict[str, Any]) -> None:
+        """Buffers documents for a collection
+
+        Parameters
+        ----------
+        name : str
+            Collection name
+        docs : dict[str, Any]
+            Documents to insert
+        """
+        self.buffers[name].extend(docs)
+        self.pending.set()
+        if len(self) >= self.max_size:
+            self.full.set()
+
+    def find(self, name: str, query: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """Buffered document matching every key of the query
+
+        Parameters
+        ----------
+        name : str
+            Collection name
+        query : dict[str, Any]
+            Exact values to match
+
+        Returns
+        -------
+        Optional[dict[str, Any]]
+            Document if found
+        """
+        for doc in chain(self.buffers.get(name, ()), self.writing.get(name, ())):
+            if all(doc.get(k) == v for k, v in query.items()):
+                return doc
+
+    def discard(self, name: str, query: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """Removes a buffered document matching every key of the query
+
+        Parameters
+        ----------
+        name : str
+            Collection name
+        query : dict[str, Any]
+            Exact values to match
+
+        Returns
+        -------
+        Optional[dict[str, Any]]
+            Removed document if found
+        """
+        for doc in self.buffers.get(name, ()):
+            if all(doc.get(k) == v for k, v in query.items()):
+                self.buffers[name].remove(doc)
+                return doc
+
+    async def find_one(self, name: str, query: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """Looks for a document among the buffered and the stored ones
+
+        Parameters
+        ----------
+        name : str
+            Collection name
+        query : dict[str, Any]
+            Exact values to match
+
+        Returns
+        -------
+        Optional[dict[str, Any]]
+            Document if found
+        """
+        if (doc := self.find(name, query)) is not None:
+            return doc
+        return await self.bot.mongo_db(name).find_one(query)
+
+    async def find_one_and_delete(self, name: str, query: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """Deletes a document, whether it is buffered or stored
+
+        Parameters
+        ----------
+        name : str
+            Collection name
+        query : dict[str, Any]
+            Exact values to match
+
+        Returns
+        -------
+        Optional[dict[str, Any]]
+            Deleted document if found
+        """
+        if (doc := self.discard(name, query)) is not None:
+            return doc
+        if self.find(name, query) is not None:
+            await self.flushed.wait()
+            # Batches which failed to be written are buffered again
+            if (doc := self.discard(name, query)) is not None:
+                return doc
+        return await self.bot.mongo_db(name).find_one_and_delete(query)
+
+    async def write(self, name: str, docs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Inserts documents into a collection
+
+        Parameters
+        ----------
+        name : str
+            Collection name
+        docs : list[dict[str, Any]]
+            Documents to insert
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            Documents to write again later
+        """
+        try:
+            await self.bot.mongo_db(name).insert_many(docs, ordered=False)
+        except TRANSIENT_ERRORS as e:
+            self.bot.logger.warning("Retrying %s documents of %s: %s", len(docs), name, e)
+            return docs
+        except BulkWriteError as e:
+            # insert_many assigns the _id of each document, so the ones
+            # written before a retry are reported as duplicates
+            errors = [x for x in e.details.get("writeErrors", []) if x.get("code") != DUPLICATE_KEY]
+            if errors:
+                self.bot.logger.error("Failed to write %s documents into %s: %s", len(errors), name, errors[0])
+        except Exception as e:
+            if len(docs) == 1:
+                self.bot.logger.exception("Failed to write a document into %s", name, exc_info=e)
+                return []
+            return [doc for item in docs for doc in await self.write(name, [item])]
+        return []
+
+    async def flush(self) -> bool:
+        """Writes every buffered document
+
+        Returns
+        -------
+        bool
+            If nothing had to be buffered again
+        """
+        async with self.lock:
+            self.writing, self.buffers = self.buffers, defaultdict(list)
+            self.pending.clear()
+            self.full.clear()
+            self.flushed.clear()
+            retry: dict[str, list[dict[str, Any]]] = {}
+            done: set[str] = set()
+            try:
+                for name, docs in self.writing.items():
+                    if docs and (items := await self.write(name, docs)):
+                        retry[name] = items
+                    done.add(name)
+            finally:
+                # Batches interrupted by a cancellation are kept as well
+                retry.update((k, v) for k, v in self.writing.items() if k not in done and v)
+                self.writing = {}
+                for name, docs in retry.items():
+                    self.buffers[name][:0] = docs
+                if retry:
+                    self.pending.set()
+                self.flushed.set()
+            return not retry
+
+    async def run(self) -> None:
+        while True:
+            await self.pending.wait()
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self.full.wait(), timeout=self.delay)
+            try:
+                if not await self.flush():
+                    await asyncio.sleep(self.delay)
+            except Exception as e:
+                self.bot.logger.exception("BatchWriter failed to flush", exc_info=e)
+                await asyncio.sleep(self.delay)
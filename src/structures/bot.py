@@ -13,6 +13,7 @@
 # limitations under the License.
 
 
+import asyncio
 import sys
 from contextlib import suppress
 from io import BytesIO
@@ -50,6 +51,13 @@ from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
 from mystbin import Client as MystBinClient
 from orjson import dumps
 
+from src.structures.proxy import ProxyTracker
+from src.structures.server_config import ServerConfig
+from src.utils.discovery import DiscoveryRegistry
+from src.utils.domains import DomainSet
+from src.utils.file_cache import FileCache
+from src.utils.message_cache import MessageCache
+
 __all__ = ("CustomBot",)
 
 
@@ -64,12 +72,28 @@ class CustomBot(Bot):
         logger instance
     scheduler : AsyncScheduler
         apscheduler's async instance
+    google : DiscoveryRegistry
+        shared Google API clients
     session : ClientSession
         aiohttp's session
     m_bin : MystBinClient
         client for posting requests
-    msg_cache : set[int]
-        messages IDs to ignore
+    files : FileCache
+        downloaded files, used by get_file
+    msg_cache : MessageCache
+        messages IDs to ignore, bounded and expiring
+    proxies : ProxyTracker
+        matches messages with the webhook messages proxying them
+    ocs : CharacterRepository
+        parsed characters, assigned on startup
+    configs : ServerConfigs
+        server configurations, assigned on startup
+    log_writer : BatchWriter
+        buffered Mongo inserts, assigned on startup
+    renderer : DocumentRenderer
+        character document renderer, assigned on startup
+    plotter : PlotRenderer
+        chart renderer, assigned on startup
     dagpi : DagpiClient:
         Dagpi client
     """
@@ -94,12 +118,15 @@ class CustomBot(Bot):
         self.scheduler = scheduler
         self.logger = logger
         self.aiogoogle = aiogoogle
+        self.google = DiscoveryRegistry(aiogoogle)
         self.session = ClientSession(json_serialize=dumps, raise_for_status=True)
         self.m_bin = MystBinClient(session=self.session)
+        self.files = FileCache(self.session)
         self.mongodb = AsyncIOMotorClient(getenv("MONGO_URI"))
         self.start_time = utcnow()
-        self.msg_cache: set[int] = set()
-        self.scam_urls: set[str] = set()
+        self.msg_cache = MessageCache()
+        self.proxies = ProxyTracker(self)
+        self.scam_urls = DomainSet()
         self.webhook_cache: dict[int, Webhook] = {}
         self.supporting: dict[Member, Member] = {}
 
@@ -109,6 +136,21 @@ class CustomBot(Bot):
     def mongo_db(self, db: str) -> AsyncIOMotorCollection:
         return self.mongodb.discord[db]
 
+    async def get_config(self, guild_id: Optional[int], /) -> ServerConfig:
+        """Cached configuration of a server
+
+        Parameters
+        ----------
+        guild_id : Optional[int]
+            Server ID
+
+        Returns
+        -------
+        ServerConfig
+            Configuration, empty if the server has none
+        """
+        return await self.configs.get_config(guild_id)
+
     async def setup_hook(self) -> None:
         await self.load_extension("jishaku")
         await self.scheduler.start_in_background()
@@ -237,16 +279,18 @@ class CustomBot(Bot):
             author=wrapper(func=embed.set_author, arg="icon_url", name=embed.author.name, url=embed.author.url),
             footer=wrapper(func=embed.set_footer, arg="icon_url", text=embed.footer.text),
         )
-        for item in set(properties) - set(exclude):
-            if image := properties[item]:
-                if image.startswith("attachment://"):
-                    continue
-                file = await self.get_file(image, filename=item)
-                if isinstance(file, File):
-                    files.append(file)
-                    image = f"attachment://{file.filename}"
-                method = methods[item]
-                method(image)
+        items = [
+            (item, image)
+            for item in set(properties) - set(exclude)
+            if (image := properties[item]) and not image.startswith("attachment://")
+        ]
+        results = await asyncio.gather(*(self.get_file(image, filename=item) for item, image in items))
+        for (item, image), file in zip(items, results):
+            if isinstance(file, File):
+                files.append(file)
+                image = f"attachment://{file.filename}"
+            method = methods[item]
+            method(image)
 
         return files, embed
 
@@ -268,15 +312,14 @@ class CustomBot(Bot):
             File for discord usage
         """
         with suppress(Exception):
-            async with self.session.get(str(url)) as resp:
-                data = await resp.read()
-                fp = BytesIO(data)
-                text = resp.content_type.split("/")
-                if filename and "." not in filename:
-                    filename = f"{filename}.{text[-1]}"
-                if not filename:
-                    filename = ".".join(text)
-                return File(fp=fp, filename=filename, spoiler=spoiler)
+            entry, data = await self.files.fetch(str(url))
+            fp = BytesIO(data)
+            text = entry.content_type.split("/")
+            if filename and "." not in filename:
+                filename = f"{filename}.{text[-1]}"
+            if not filename:
+                filename = ".".join(text)
+            return File(fp=fp, filename=filename, spoiler=spoiler)
 
     def webhook_lazy(self, channel: Messageable | int) -> Optional[Webhook]:
         """Function which returns first webhook if cached
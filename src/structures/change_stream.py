@@ -0,0 +1,78 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+from typing import Any, Awaitable, Callable, Mapping, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import OperationFailure, PyMongoError
+
+__all__ = ("follow_changes",)
+
+# Error code of $changeStream on deployments which aren't replica sets
+CHANGE_STREAM_UNSUPPORTED = 40573
+
+
+async def follow_changes(
+    db: AsyncIOMotorCollection,
+    apply: Callable[[Mapping[str, Any]], Any],
+    on_open: Callable[[bool], Awaitable[Any]],
+    max_delay: float,
+    on_close: Optional[Callable[[], Any]] = None,
+) -> None:
+    """Feeds the change stream of a collection to apply until the deployment
+    turns out not to support change streams.
+
+    After an error the stream is opened again, waiting twice as long after
+    each failed attempt up to max_delay, and resumes after the last applied
+    change. on_open runs every time the stream opens, telling whether it
+    resumed; when it didn't, changes may have been missed in between.
+
+    Parameters
+    ----------
+    db : AsyncIOMotorCollection
+        Watched collection
+    apply : Callable[[Mapping[str, Any]], Any]
+        Called with every change event
+    on_open : Callable[[bool], Awaitable[Any]]
+        Called with whether the stream resumed, once it is open
+    max_delay : float
+        Max seconds between reconnection attempts
+    on_close : Optional[Callable[[], Any]], optional
+        Called whenever an open stream stops, by default None
+    """
+    token: Optional[Mapping[str, Any]] = None
+    delay = 0
+    while True:
+        try:
+            async with db.watch(full_document="updateLookup", resume_after=token) as stream:
+                try:
+                    await on_open(token is not None)
+                    delay = 0
+                    async for change in stream:
+                        apply(change)
+                        token = None if change["operationType"] == "invalidate" else stream.resume_token
+                finally:
+                    if on_close:
+                        on_close()
+        except OperationFailure as e:
+            if e.code == CHANGE_STREAM_UNSUPPORTED:
+                return
+            token = None
+        except PyMongoError:
+            pass
+
+        delay = min(max(delay * 2, 1), max_delay)
+        await asyncio.sleep(delay)
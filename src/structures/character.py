@@ -30,7 +30,6 @@ from docx import Document as document
 from docx.document import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.shared import Inches
-from motor.motor_asyncio import AsyncIOMotorCollection
 from rapidfuzz import process
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
@@ -834,7 +833,41 @@ class Character:
 
         return data
 
-    async def to_docx(self, bot: CustomBot):
+    async def to_docx(self, bot: CustomBot, user_id: Optional[int] = None) -> File:
+        """Renders the character as a Word document, off the event loop
+
+        Parameters
+        ----------
+        bot : CustomBot
+            Bot instance
+        user_id : Optional[int], optional
+            User requesting the document, by default None
+
+        Returns
+        -------
+        File
+            Document
+        """
+        return await bot.renderer.render(self, "docx", user_id)
+
+    async def to_pdf(self, bot: CustomBot, user_id: Optional[int] = None) -> File:
+        """Renders the character as a PDF document, off the event loop
+
+        Parameters
+        ----------
+        bot : CustomBot
+            Bot instance
+        user_id : Optional[int], optional
+            User requesting the document, by default None
+
+        Returns
+        -------
+        File
+            Document
+        """
+        return await bot.renderer.render(self, "pdf", user_id)
+
+    def render_docx(self, image: Optional[bytes] = None) -> bytes:
         doc: Document = document()
 
         params_header = self.params_header
@@ -850,8 +883,8 @@ class Character:
         for index, item in enumerate(params_header.values()):
             row_cells[index].text = str(item)
 
-        if img_file := await bot.get_file(self.image_url):
-            doc.add_picture(img_file.fp, width=Inches(6))
+        if image:
+            doc.add_picture(BytesIO(image), width=Inches(6))
 
         if self.moveset:
             doc.add_heading("Favorite Moves", level=1)
@@ -937,11 +970,9 @@ class Character:
                 doc.add_paragraph(other).alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
 
         doc.save(fp := BytesIO())
-        fp.seek(0)
-        return File(fp=fp, filename=f"{self.id or 'Character'}.docx")
+        return fp.getvalue()
 
-    async def to_pdf(self, bot: CustomBot) -> File:
-        """To PDF"""
+    def render_pdf(self, image: Optional[bytes] = None) -> bytes:
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
         styles = getSampleStyleSheet()
@@ -965,9 +996,8 @@ class Character:
         content.append(Paragraph(f"<strong>{self.pronoun_emoji}〛{self.name}</strong>", styles["Heading1"]))
 
         # Add an image
-        if img_file := await bot.get_file(self.image_url):
-            img_stream = BytesIO(img_file.fp.read())
-            content.append(Image(img_stream))
+        if image:
+            content.append(Image(BytesIO(image)))
 
         if self.moveset:
             content.append(Paragraph("Favorite Moves", styles["Heading2"]))
@@ -1110,9 +1140,7 @@ class Character:
 
         # Build the PDF document
         doc.build(content)
-        buffer.seek(0)
-
-        return File(fp=buffer, filename=f"{self.id or 'Character'}.pdf")
+        return buffer.getvalue()
 
     def generated_image(self, background: Optional[str] = None) -> Optional[str]:
         """Generated Image
@@ -1304,14 +1332,9 @@ class Character:
 
 class CharacterTransform(Transformer):
     async def transform(self, interaction: Interaction[CustomBot], value: str, /):
-        db: AsyncIOMotorCollection = interaction.client.mongo_db("Characters")
         if not (member := interaction.namespace.member):
             member = interaction.client.supporting.get(interaction.user, interaction.user)
-        ocs = {
-            oc.id: oc
-            async for x in db.find({"author": member.id, "server": interaction.guild_id})
-            if (oc := Character.from_mongo_dict(x))
-        }
+        ocs = {oc.id: oc for oc in await interaction.client.ocs.from_author(interaction.guild_id, member.id)}
         if value.isdigit() and (oc := ocs.get(int(value))):
             return oc
         if options := process.extractOne(
@@ -1323,14 +1346,9 @@ class CharacterTransform(Transformer):
             return options[0]
 
     async def autocomplete(self, interaction: Interaction[CustomBot], value: str, /) -> list[Choice[str]]:
-        db: AsyncIOMotorCollection = interaction.client.mongo_db("Characters")
         if not (member := interaction.namespace.member):
             member = interaction.client.supporting.get(interaction.user, interaction.user)
-        ocs = {
-            oc.id: oc
-            async for x in db.find({"author": member.id, "server": interaction.guild_id})
-            if (oc := Character.from_mongo_dict(x))
-        }
+        ocs = {oc.id: oc for oc in await interaction.client.ocs.from_author(interaction.guild_id, member.id)}
         if value.isdigit() and (oc := ocs.get(int(value))):
             options = [oc]
         elif options := process.extract(
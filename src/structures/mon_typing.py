@@ -17,18 +17,21 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
+from itertools import combinations_with_replacement
 from json import load
 from re import split
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Iterable, Optional
 
+import numpy as np
 from discord import PartialEmoji
 from discord.utils import find, get
 from frozendict import frozendict
-from rapidfuzz import process
 
+from src.utils.deducer import FuzzyDeducer
 from src.utils.functions import fix
 
-__all__ = ("TypingEnum",)
+__all__ = ("TypingEnum", "TypeChart", "TYPE_CHART")
 
 Z_MOVE_RANGE = frozendict(
     {
@@ -152,10 +155,7 @@ class Typing:
         Typing
             Type with resulting chart
         """
-        if (a := self.chart) != (b := other.chart):
-            chart = {x: o for x in a | b if (o := a.get(x, 1.0) * b.get(x, 1.0)) != 1.0}
-            return Typing.from_dict(ids=self.ids | other.ids, name=f"{self.name}/{other.name}", chart=frozendict(chart))
-        return self
+        return combine_typings(self, other)
 
     def __contains__(self, other: Typing) -> bool:
         """contains method
@@ -240,6 +240,29 @@ class Typing:
         return base
 
 
+@lru_cache(maxsize=512)
+def combine_typings(a: Typing, b: Typing) -> Typing:
+    """Combines two typings, multiplying their charts
+
+    Parameters
+    ----------
+    a : Typing
+        First typing
+    b : Typing
+        Second typing
+
+    Returns
+    -------
+    Typing
+        Resulting typing
+    """
+    if a.chart != b.chart:
+        x, y = a.chart, b.chart
+        chart = {k: o for k in x | y if (o := x.get(k, 1.0) * y.get(k, 1.0)) != 1.0}
+        return Typing.from_dict(ids=a.ids | b.ids, name=f"{a.name}/{b.name}", chart=frozendict(chart))
+    return a
+
+
 class TypingEnum(Typing, Enum):
     Normal = {
         "name": "Normal",
@@ -580,12 +603,7 @@ class TypingEnum(Typing, Enum):
         if isinstance(item, cls):
             return item
 
-        name = fix(item).title()
-        if data := TypingEnum.get(name=name):
-            return data
-        items = {x: x.name for x in TypingEnum}
-        if data := process.extractOne(name, items, score_cutoff=85):
-            return data[-1]
+        return TYPE_DEDUCER(item)
 
     @classmethod
     def deduce_many(cls, *elems: str | TypingEnum, lang: str = "en-US"):
@@ -619,7 +637,7 @@ class TypingEnum(Typing, Enum):
             value
         """
         data = [o for x in others if (o := TypingEnum.deduce(x) if isinstance(x, str) else TypingEnum(x))]
-        return super(TypingEnum, self).when_attacked_by(*data, inverse=inverse)
+        return TYPE_CHART.multiplier(data, [self], inverse=inverse)
 
     def when_attacking(self, *others: Typing | str, inverse: bool = False) -> float:
         """method to determine multiplier
@@ -630,7 +648,157 @@ class TypingEnum(Typing, Enum):
             value
         """
         data = [o for x in others if (o := TypingEnum.deduce(x) if isinstance(x, str) else TypingEnum(x))]
-        return super(TypingEnum, self).when_attacking(*data, inverse=inverse)
+        return float(np.prod([TYPE_CHART.multiplier([self], [x], inverse=inverse) for x in data]))
+
+
+TYPE_DEDUCER: FuzzyDeducer[TypingEnum] = FuzzyDeducer(TypingEnum, normalizer=lambda x: fix(x).title())
+
+
+class TypeChart:
+    """Dense type effectiveness matrix.
+
+    Rows are defending types, columns attacking types, both indexed in
+    TypingEnum order. Defending rows for every single and dual typing are
+    precomputed.
+
+    Attributes
+    ----------
+    types : tuple[TypingEnum, ...]
+        Types in matrix order
+    matrix : np.ndarray
+        Multiplier of each defending type against each attacking type
+    combos : dict[frozenset[TypingEnum], np.ndarray]
+        Defending rows per typing
+    """
+
+    def __init__(self, types: Iterable[TypingEnum]) -> None:
+        self.types = tuple(types)
+        self.index = {x: i for i, x in enumerate(self.types)}
+        index_by_id = {x.id: i for i, x in enumerate(self.types)}
+        self.matrix = np.ones((len(self.types), len(self.types)))
+        for i, item in enumerate(self.types):
+            for k, v in item.chart.items():
+                if (j := index_by_id.get(k)) is not None:
+                    self.matrix[i, j] = v
+        self.combos: dict[frozenset[TypingEnum], np.ndarray] = {
+            frozenset(x): self.matrix[list(map(self.index.get, x))].prod(axis=0)
+            for x in map(set, combinations_with_replacement(self.types, 2))
+        }
+
+    def defending(self, types: Iterable[TypingEnum]) -> np.ndarray:
+        """Multipliers a typing receives from each attacking type
+
+        Parameters
+        ----------
+        types : Iterable[TypingEnum]
+            Defending types
+
+        Returns
+        -------
+        np.ndarray
+            Row in matrix order
+        """
+        key = frozenset(types)
+        if (row := self.combos.get(key)) is None:
+            row = self.matrix[[self.index[x] for x in key]].prod(axis=0)
+        return row
+
+    @staticmethod
+    def invert(values: np.ndarray) -> np.ndarray:
+        return np.where(values > 1, 0.5, np.where(values < 1, 2.0, 1.0))
+
+    def multiplier(
+        self,
+        attacking: Iterable[TypingEnum],
+        defending: Iterable[TypingEnum],
+        inverse: bool = False,
+    ) -> float:
+        """Combined multiplier of attacking types against a typing
+
+        Parameters
+        ----------
+        attacking : Iterable[TypingEnum]
+            Attacking types
+        defending : Iterable[TypingEnum]
+            Defending types
+        inverse : bool, optional
+            Inverse battle rules, by default False
+
+        Returns
+        -------
+        float
+            Multiplier
+        """
+        values = self.defending(defending)[[self.index[x] for x in attacking]]
+        if inverse:
+            values = self.invert(values)
+        return float(values.prod())
+
+    def weaknesses(self, *types: TypingEnum, inverse: bool = False) -> dict[TypingEnum, float]:
+        """Multiplier each attacking type deals to a typing
+
+        Parameters
+        ----------
+        types : TypingEnum
+            Defending types
+        inverse : bool, optional
+            Inverse battle rules, by default False
+
+        Returns
+        -------
+        dict[TypingEnum, float]
+            Multiplier per attacking type
+        """
+        row = self.defending(types)
+        if inverse:
+            row = self.invert(row)
+        return dict(zip(self.types, row.tolist()))
+
+    def attacking(self, *types: TypingEnum, inverse: bool = False) -> dict[TypingEnum, float]:
+        """Multiplier an attacking typing deals to each type
+
+        Parameters
+        ----------
+        types : TypingEnum
+            Attacking types
+        inverse : bool, optional
+            Inverse battle rules, by default False
+
+        Returns
+        -------
+        dict[TypingEnum, float]
+            Multiplier per defending type
+        """
+        values = self.matrix[:, [self.index[x] for x in dict.fromkeys(types)]]
+        if inverse:
+            values = self.invert(values)
+        return dict(zip(self.types, values.prod(axis=1).tolist()))
+
+    def coverage(self, *types: TypingEnum, inverse: bool = False) -> dict[frozenset[TypingEnum], float]:
+        """Best multiplier a moveset reaches against every single and dual typing
+
+        Parameters
+        ----------
+        types : TypingEnum
+            Types of the moves
+        inverse : bool, optional
+            Inverse battle rules, by default False
+
+        Returns
+        -------
+        dict[frozenset[TypingEnum], float]
+            Best multiplier per defending typing
+        """
+        if not types:
+            return {}
+        keys = list(self.combos)
+        values = np.stack([self.combos[x] for x in keys])[:, [self.index[x] for x in set(types)]]
+        if inverse:
+            values = self.invert(values)
+        return dict(zip(keys, values.max(axis=1).tolist()))
+
+
+TYPE_CHART = TypeChart(TypingEnum)
 
 
 with open("resources/dex_types.json", mode="r", encoding="utf8") as f:
@@ -24,11 +24,12 @@ from typing import Any, Callable, Optional
 from discord import Embed, PartialEmoji
 from discord.utils import find, get, utcnow
 from frozendict import frozendict
-from rapidfuzz import process
 
 from src.structures.mon_typing import TypingEnum
+from src.utils.deducer import FuzzyDeducer
 from src.utils.etc import WHITE_BAR
 from src.utils.functions import fix
+from src.utils.snapshot import load_snapshot
 
 __all__ = (
     "Move",
@@ -38,6 +39,7 @@ __all__ = (
 
 ALL_MOVES = frozendict()
 ALL_MOVES_BY_NAME = frozendict()
+MOVE_DEDUCER: FuzzyDeducer[Move] = FuzzyDeducer(())
 ALL_MOVES_DEX: dict[str, dict[str, dict[str, str]]] = {"Physical": {}, "Special": {}, "Status": {}}
 
 
@@ -662,7 +664,6 @@ class Move:
             return ALL_MOVES.get(fix(item))
 
     @classmethod
-    @lru_cache(maxsize=None)
     def deduce(cls, item: str) -> Optional[Move]:
         """This is a method that determines the Move out of
         the existing entries, it has a 85% of precision.
@@ -679,13 +680,7 @@ class Move:
         """
         if data := cls.from_ID(item):
             return data
-        if value := process.extractOne(
-            item,
-            ALL_MOVES,
-            processor=lambda x: getattr(x, "name", x),
-            score_cutoff=85,
-        ):
-            return value[0]
+        return MOVE_DEDUCER(item)
 
     @classmethod
     @lru_cache(maxsize=None)
@@ -710,16 +705,38 @@ class Move:
         return frozenset(items)
 
 
-with open("resources/moves.json", mode="r", encoding="utf8") as f:
-    DATA: list[Move] = [Move(x) for x in load(f) if x]
+MOVE_SOURCES = (
+    "resources/moves.json",
+    "resources/shadow_moves.json",
+    *(f"resources/dex_{cat.name.lower()}.json" for cat in Category),
+)
+
+
+def load_moves() -> tuple[list[Move], dict[str, dict[str, dict[str, str]]]]:
+    """Reads the move resources
+
+    Returns
+    -------
+    tuple[list[Move], dict[str, dict[str, dict[str, str]]]]
+        Moves and their dex entries per category
+    """
+    with open("resources/moves.json", mode="r", encoding="utf8") as f:
+        data = [Move(x) for x in load(f) if x]
+
+    with open("resources/shadow_moves.json", mode="r", encoding="utf8") as f:
+        data.extend(Move(x) for x in load(f) if x)
+
+    dex = {}
+    for cat in Category:
+        with open(f"resources/dex_{cat.name.lower()}.json", mode="r", encoding="utf8") as f:
+            dex[cat.name] = load(f)
 
-with open("resources/shadow_moves.json", mode="r", encoding="utf8") as f:
-    DATA.extend(Move(x) for x in load(f) if x)
+    return data, dex
 
-for cat in Category:
-    with open(f"resources/dex_{cat.name.lower()}.json", mode="r", encoding="utf8") as f:
-        ALL_MOVES_DEX[cat.name] = load(f)
 
+DATA, DEX_DATA = load_snapshot("moves", load_moves, *MOVE_SOURCES)
+ALL_MOVES_DEX.update(DEX_DATA)
 
 ALL_MOVES = frozendict({item.id: item for item in DATA})
 ALL_MOVES_BY_NAME = frozendict({item.name: item for item in DATA})
+MOVE_DEDUCER = FuzzyDeducer(DATA, by_name=ALL_MOVES_BY_NAME, by_id=ALL_MOVES)
@@ -16,40 +16,237 @@
 from __future__ import annotations
 
 import operator
-from dataclasses import astuple, dataclass, field
 from json import JSONEncoder
 from typing import Any, Callable, Iterable, Optional
 
 from frozendict import frozendict
 
-from src.structures.move import Move
+from src.structures.move import ALL_MOVES, Move
 from src.utils.functions import fix
 
 __all__ = ("Movepool", "MovepoolEncoder")
 
+MOVE_BITS: dict[Move, int] = {}
+BIT_MOVES: list[Move] = []
+FIELDS = ("level", "tm", "event", "tutor", "egg", "levelup", "other")
+
+
+def move_bit(move: Move) -> int:
+    """Interned bit position of a move
+
+    Parameters
+    ----------
+    move : Move
+        Move to intern
+
+    Returns
+    -------
+    int
+        Bit position
+    """
+    if (index := MOVE_BITS.get(move)) is None:
+        index = MOVE_BITS[move] = len(BIT_MOVES)
+        BIT_MOVES.append(move)
+    return index
+
+
+def encode_moves(moves: Iterable[Move] | int) -> int:
+    """Converts moves into a bitmask
+
+    Parameters
+    ----------
+    moves : Iterable[Move] | int
+        Moves or an existing bitmask
+
+    Returns
+    -------
+    int
+        Bitmask
+    """
+    if isinstance(moves, int):
+        return moves
+    mask = 0
+    for move in moves:
+        mask |= 1 << move_bit(move)
+    return mask
+
+
+def decode_moves(mask: int) -> frozenset[Move]:
+    """Converts a bitmask into moves
+
+    Parameters
+    ----------
+    mask : int
+        Bitmask
+
+    Returns
+    -------
+    frozenset[Move]
+        Moves
+    """
+    items: list[Move] = []
+    while mask:
+        low = mask & -mask
+        items.append(BIT_MOVES[low.bit_length() - 1])
+        mask ^= low
+    return frozenset(items)
+
+
+MASK_OPERATORS: dict[Callable[[Any, Any], Any], Callable[[int, int], int]] = {
+    operator.or_: operator.or_,
+    operator.and_: operator.and_,
+    operator.xor: operator.xor,
+    operator.sub: lambda a, b: a & ~b,
+}
+
 
-@dataclass(unsafe_hash=True, repr=False, slots=True)
 class Movepool:
     """
     Class which represents a movepool
+
+    Every category is stored as a bitmask over interned moves, the
+    attributes decode them into frozensets on demand.
     """
 
-    level: frozendict[int, frozenset[Move]] = field(default_factory=frozendict)
-    tm: frozenset[Move] = field(default_factory=frozenset)
-    event: frozenset[Move] = field(default_factory=frozenset)
-    tutor: frozenset[Move] = field(default_factory=frozenset)
-    egg: frozenset[Move] = field(default_factory=frozenset)
-    levelup: frozenset[Move] = field(default_factory=frozenset)
-    other: frozenset[Move] = field(default_factory=frozenset)
-
-    def __post_init__(self):
-        self.level = frozendict({int(k): x for k, v in self.level.items() if (x := frozenset(v))})
-        self.tm = frozenset(self.tm)
-        self.event = frozenset(self.event)
-        self.tutor = frozenset(self.tutor)
-        self.egg = frozenset(self.egg)
-        self.levelup = frozenset(self.levelup)
-        self.other = frozenset(self.other)
+    __slots__ = ("_level", "_tm", "_event", "_tutor", "_egg", "_levelup", "_other", "_decoded")
+
+    def __init__(
+        self,
+        level: Optional[dict[int, Iterable[Move] | int]] = None,
+        tm: Iterable[Move] | int = 0,
+        event: Iterable[Move] | int = 0,
+        tutor: Iterable[Move] | int = 0,
+        egg: Iterable[Move] | int = 0,
+        levelup: Iterable[Move] | int = 0,
+        other: Iterable[Move] | int = 0,
+    ) -> None:
+        self._decoded: dict[str, Any] = {}
+        self._level = frozendict({int(k): x for k, v in (level or {}).items() if (x := encode_moves(v))})
+        self._tm = encode_moves(tm)
+        self._event = encode_moves(event)
+        self._tutor = encode_moves(tutor)
+        self._egg = encode_moves(egg)
+        self._levelup = encode_moves(levelup)
+        self._other = encode_moves(other)
+
+    def _masks(self) -> tuple[int, ...]:
+        return self._tm, self._event, self._tutor, self._egg, self._levelup, self._other
+
+    def _decode(self, key: str, mask: int) -> frozenset[Move]:
+        if (item := self._decoded.get(key)) is None:
+            item = self._decoded[key] = decode_moves(mask)
+        return item
+
+    @property
+    def level_mask(self) -> int:
+        mask = 0
+        for item in self._level.values():
+            mask |= item
+        return mask
+
+    @property
+    def mask(self) -> int:
+        """Bitmask including every move in the movepool
+
+        Returns
+        -------
+        int
+            Bitmask
+        """
+        mask = self.level_mask
+        for item in self._masks():
+            mask |= item
+        return mask
+
+    @property
+    def level(self) -> frozendict[int, frozenset[Move]]:
+        if (item := self._decoded.get("level")) is None:
+            item = frozendict({k: decode_moves(v) for k, v in self._level.items()})
+            self._decoded["level"] = item
+        return item
+
+    @level.setter
+    def level(self, value: dict[int, Iterable[Move] | int]):
+        self._level = frozendict({int(k): x for k, v in value.items() if (x := encode_moves(v))})
+        self._decoded.pop("level", None)
+        self._decoded.pop("level_moves", None)
+
+    @property
+    def tm(self) -> frozenset[Move]:
+        return self._decode("tm", self._tm)
+
+    @tm.setter
+    def tm(self, value: Iterable[Move] | int):
+        self._tm = encode_moves(value)
+        self._decoded.pop("tm", None)
+
+    @property
+    def event(self) -> frozenset[Move]:
+        return self._decode("event", self._event)
+
+    @event.setter
+    def event(self, value: Iterable[Move] | int):
+        self._event = encode_moves(value)
+        self._decoded.pop("event", None)
+
+    @property
+    def tutor(self) -> frozenset[Move]:
+        return self._decode("tutor", self._tutor)
+
+    @tutor.setter
+    def tutor(self, value: Iterable[Move] | int):
+        self._tutor = encode_moves(value)
+        self._decoded.pop("tutor", None)
+
+    @property
+    def egg(self) -> frozenset[Move]:
+        return self._decode("egg", self._egg)
+
+    @egg.setter
+    def egg(self, value: Iterable[Move] | int):
+        self._egg = encode_moves(value)
+        self._decoded.pop("egg", None)
+
+    @property
+    def levelup(self) -> frozenset[Move]:
+        return self._decode("levelup", self._levelup)
+
+    @levelup.setter
+    def levelup(self, value: Iterable[Move] | int):
+        self._levelup = encode_moves(value)
+        self._decoded.pop("levelup", None)
+
+    @property
+    def other(self) -> frozenset[Move]:
+        return self._decode("other", self._other)
+
+    @other.setter
+    def other(self, value: Iterable[Move] | int):
+        self._other = encode_moves(value)
+        self._decoded.pop("other", None)
+
+    def __hash__(self) -> int:
+        return hash((tuple(sorted(self._level.items())), *self._masks()))
+
+    def __reduce__(self):
+        return self.__class__, (self.level, self.tm, self.event, self.tutor, self.egg, self.levelup, self.other)
+
+    def mask_reduce(self):
+        """Pickle reduction over the raw bitmasks, only valid while the
+        moves are interned in the same order, as in resource snapshots.
+
+        Returns
+        -------
+        tuple
+            Reduction
+        """
+        return self.__class__, (dict(self._level), *self._masks())
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo: dict[int, Any]):
+        return self.copy()
 
     @classmethod
     def shadow(cls):
@@ -57,7 +254,7 @@ class Movepool:
 
     @classmethod
     def hook(cls, dct: dict[str, Any]):
-        if set(dct).issubsset(Movepool.__slots__):
+        if set(dct).issubset(FIELDS):
             return Movepool.from_dict(**dct)
         return dct
 
@@ -84,26 +281,29 @@ class Movepool:
             repr
         """
         elements = dict(
-            level=len(self.level_moves),
-            tm=len(self.tm),
-            event=len(self.event),
-            tutor=len(self.tutor),
-            egg=len(self.egg),
-            levelup=len(self.levelup),
-            other=len(self.other),
+            level=self.level_mask.bit_count(),
+            tm=self._tm.bit_count(),
+            event=self._event.bit_count(),
+            tutor=self._tutor.bit_count(),
+            egg=self._egg.bit_count(),
+            levelup=self._levelup.bit_count(),
+            other=self._other.bit_count(),
         )
         data = ", ".join(f"{k}={v}" for k, v in elements.items() if v)
         return f"Movepool({data})"
 
     def methods_for(self, move: Move):
+        if (index := MOVE_BITS.get(move)) is None:
+            return []
+        bit = 1 << index
         elements = dict(
-            level=move in self.level_moves,
-            tm=move in self.tm,
-            event=move in self.event,
-            tutor=move in self.tutor,
-            egg=move in self.egg,
-            levelup=move in self.levelup,
-            other=move in self.other,
+            level=self.level_mask & bit,
+            tm=self._tm & bit,
+            event=self._event & bit,
+            tutor=self._tutor & bit,
+            egg=self._egg & bit,
+            levelup=self._levelup & bit,
+            other=self._other & bit,
         )
         return [k for k, v in elements.items() if v]
 
@@ -115,14 +315,14 @@ class Movepool:
         int
             total of moves
         """
-        return len(self())
+        return self.mask.bit_count()
 
     def __bool__(self):
-        return any(astuple(self))
+        return bool(self._level) or any(self._masks())
 
     def __eq__(self, other: Movepool) -> bool:
         if isinstance(other, Movepool):
-            return astuple(self) == astuple(other)
+            return self._level == other._level and self._masks() == other._masks()
         return NotImplemented
 
     def __lt__(self, other: Movepool):
@@ -143,29 +343,32 @@ class Movepool:
         other : Movepool
             Movepool to apply operations against
         method : Callable[[frozenset[Move], frozenset[Move]], frozenset[Move]]
-            Method to be used
+            Method to be used, set operators get applied over the bitmasks
 
         Returns
         -------
         Movepool
             Resulting movepool
         """
-        level: dict[int, frozenset[Move]] = {}
+        if (func := MASK_OPERATORS.get(method)) is None:
+
+            def func(a: int, b: int) -> int:
+                return encode_moves(method(decode_moves(a), decode_moves(b)))
+
+        level: dict[int, int] = {}
 
-        for index in sorted(self.level | other.level):
-            first = self.level.get(index, set())
-            last = other.level.get(index, set())
-            if data := method(first, last):
-                level[index] = frozenset(data)
+        for index in sorted(self._level | other._level):
+            if data := func(self._level.get(index, 0), other._level.get(index, 0)):
+                level[index] = data
 
         return Movepool(
-            level=frozendict(level),
-            tm=method(self.tm, other.tm),
-            egg=method(self.egg, other.egg),
-            event=method(self.event, other.event),
-            tutor=method(self.tutor, other.tutor),
-            levelup=method(self.levelup, other.levelup),
-            other=method(self.other, other.other),
+            level=level,
+            tm=func(self._tm, other._tm),
+            egg=func(self._egg, other._egg),
+            event=func(self._event, other._event),
+            tutor=func(self._tutor, other._tutor),
+            levelup=func(self._levelup, other._levelup),
+            other=func(self._other, other._other),
         )
 
     def __add__(self, other: Movepool) -> Movepool:
@@ -291,13 +494,7 @@ class Movepool:
             List of moves that belong to this instance.
         """
         key = key or operator.attrgetter("name")
-        moves: set[Move] = set()
-        for item in astuple(self):
-            if isinstance(item, frozenset):
-                moves.update(item)
-            elif isinstance(item, frozendict):
-                moves.update(*item.values())
-        return sorted(moves, key=key, reverse=reverse)
+        return sorted(decode_moves(self.mask), key=key, reverse=reverse)
 
     def __contains__(self, item: Move) -> bool:
         """Check if movepool contains a move.
@@ -312,15 +509,9 @@ class Movepool:
         bool
             Wether included or not
         """
-        return (
-            (self.tm and item in self.tm)
-            or (self.tutor and item in self.event)
-            or (self.tutor and item in self.tutor)
-            or (self.egg and item in self.egg)
-            or (self.levelup and item in self.levelup)
-            or (self.other and item in self.other)
-            or (self.level and item in self.level_moves)
-        )
+        if (index := MOVE_BITS.get(item)) is None:
+            return False
+        return bool(self.mask >> index & 1)
 
     def assign(
         self,
@@ -373,7 +564,7 @@ class Movepool:
                 if (k := int(k)) != 0:
                     level[k] = moves
                 else:
-                    self.levelup |= moves
+                    self.levelup = self._levelup | encode_moves(moves)
             self.level = frozendict(level)
         elif isinstance(value := value or set(), Iterable):
             moves = set()
@@ -385,17 +576,17 @@ class Movepool:
             moves = frozenset(moves)
             match key:
                 case "TM":
-                    self.tm |= moves
+                    self.tm = self._tm | encode_moves(moves)
                 case "EVENT":
-                    self.event |= moves
+                    self.event = self._event | encode_moves(moves)
                 case "TUTOR":
-                    self.tutor |= moves
+                    self.tutor = self._tutor | encode_moves(moves)
                 case "EGG":
-                    self.egg |= moves
+                    self.egg = self._egg | encode_moves(moves)
                 case "LEVEL" | "LEVELUP":
-                    self.levelup |= moves
+                    self.levelup = self._levelup | encode_moves(moves)
                 case _:
-                    self.other |= moves
+                    self.other = self._other | encode_moves(moves)
 
         if unused and notify:
             print("Missing: ", "\n".join(unused))
@@ -462,36 +653,25 @@ class Movepool:
             resulting movepool
         """
 
-        total_remove = to_remove
-
         if isinstance(to_remove, Movepool):
-            total_remove = total_remove()
-
-        def foo(moves: Iterable[Move]):
-            data = filter(lambda x: x not in total_remove, moves)
-            items = sorted(data, key=lambda x: x.name)
-            return frozenset(items)
+            mask = ~to_remove.mask
+        else:
+            mask = ~encode_moves(to_remove)
 
-        level = {k: foo(v) for k, v in sorted(self.level.items())}
         return Movepool(
-            level=frozendict(level),
-            tm=foo(self.tm),
-            event=foo(self.event),
-            tutor=foo(self.tutor),
-            egg=foo(self.egg),
-            other=foo(self.other),
+            level={k: v & mask for k, v in sorted(self._level.items())},
+            tm=self._tm & mask,
+            event=self._event & mask,
+            tutor=self._tutor & mask,
+            egg=self._egg & mask,
+            other=self._other & mask,
         )
 
     def add_level_moves(self, level: int, *moves: Move):
-        aux = dict(self.level.setdefault(level, frozenset()))
-        aux[level] |= frozenset(moves)
-        self.level = frozendict(aux)
+        self.level = self._level | {level: self._level.get(level, 0) | encode_moves(moves)}
 
     def remove_level_moves(self, level: int, *moves: Move):
-        if total := self.level.get(level, set()) - frozenset(moves):
-            self.level[level] = total
-        else:
-            self.level.pop(level, None)
+        self.level = self._level | {level: self._level.get(level, 0) & ~encode_moves(moves)}
 
     @classmethod
     def from_dict(cls, **kwargs) -> Movepool:
@@ -503,7 +683,7 @@ class Movepool:
             Generated movepool
         """
         movepool = cls()
-        for item in movepool.__slots__:
+        for item in FIELDS:
             if value := kwargs.get(item):
                 movepool.assign(key=item, value=value)
         return movepool
@@ -518,7 +698,7 @@ class Movepool:
             Generated movepool
         """
         movepool = cls()
-        for item in movepool.__slots__:
+        for item in FIELDS:
             if value := kwargs.get(item):
                 movepool.assign(key=item, value=value, notify=True)
         return movepool
@@ -740,12 +920,18 @@ class Movepool:
         frozenset[Move]
             Frozenset out of level moves
         """
-        moves: set[Move] = set()
-        moves.update(*self.level.values())
-        return frozenset(moves)
+        return self._decode("level_moves", self.level_mask)
 
     def copy(self):
-        return Movepool() + self
+        return Movepool(
+            level=self._level,
+            tm=self._tm,
+            event=self._event,
+            tutor=self._tutor,
+            egg=self._egg,
+            levelup=self._levelup,
+            other=self._other,
+        )
 
     @classmethod
     def default(cls, movepool: Optional[Movepool] = None):
@@ -762,3 +948,7 @@ class MovepoolEncoder(JSONEncoder):
         if isinstance(o, Movepool):
             return o.as_dict
         return super(MovepoolEncoder, self).default(o)
+
+
+for item in sorted(ALL_MOVES.values(), key=lambda x: x.id):
+    move_bit(item)
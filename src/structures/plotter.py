@@ -0,0 +1,174 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+from dataclasses import astuple, dataclass
+from hashlib import sha256
+from io import BytesIO
+from typing import TYPE_CHECKING, Optional
+
+from cachetools import LRUCache
+from discord import File
+from orjson import dumps
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+    from src.structures.process_pool import ProcessPool
+
+__all__ = ("PlotRenderer", "WeatherPlot", "render_weather_plot")
+
+
+@dataclass(frozen=True, slots=True)
+class WeatherPlot:
+    """Inputs of a weather probability chart
+
+    Attributes
+    ----------
+    title : str
+        Chart title
+    labels : tuple[str, ...]
+        Weather names, sorted by probability
+    values : tuple[int, ...]
+        Weather probabilities
+    """
+
+    title: str
+    labels: tuple[str, ...]
+    values: tuple[int, ...]
+
+    @property
+    def digest(self) -> str:
+        return sha256(dumps(astuple(self))).hexdigest()
+
+
+_TEMPLATE: Optional[Figure] = None
+
+
+def _template() -> Figure:
+    global _TEMPLATE
+    if _TEMPLATE is None:
+        from matplotlib.figure import Figure
+
+        _TEMPLATE = Figure(figsize=(12, 6))
+        _TEMPLATE.add_subplot()
+    return _TEMPLATE
+
+
+def render_weather_plot(plot: WeatherPlot) -> bytes:
+    """Renders a weather chart as PNG, meant for worker processes
+
+    Each worker keeps a single figure around and redraws its axes.
+
+    Parameters
+    ----------
+    plot : WeatherPlot
+        Chart inputs
+
+    Returns
+    -------
+    bytes
+        PNG image
+    """
+    import numpy as np
+
+    fig = _template()
+    (ax,) = fig.axes
+    ax.clear()
+
+    values = np.array(plot.values)
+    bars = ax.bar(plot.labels, values, color="skyblue", label="Probabilities")
+    for bar, value in zip(bars, plot.values):
+        ax.text(
+            bar.get_x() + bar.get_width() / 2,
+            bar.get_height() - (values.max() * 0.05),
+            f"{value} %",
+            ha="center",
+            va="bottom",
+            fontsize=10,
+            color="black",
+        )
+
+    ax.set_title(plot.title, fontsize=18)
+    ax.legend(fontsize=14)
+    ax.grid(True, linestyle="--", alpha=0.7)
+    ax.set_xlabel("Weather Type", fontsize=14)
+    ax.set_ylabel("Probability (%)", fontsize=14)
+    ax.set_xticks(np.arange(len(plot.labels)), labels=plot.labels, rotation=45, ha="right", fontsize=12)
+    ax.tick_params(axis="y", labelsize=12)
+    fig.tight_layout()
+
+    buf = BytesIO()
+    fig.savefig(buf, format="png")
+    return buf.getvalue()
+
+
+class PlotRenderer:
+    """Renders charts in the shared process pool.
+
+    PNGs are cached by a digest of their inputs and identical renders in
+    progress are shared. Each key tracks the digest it rendered last, so a
+    change in the weather of a channel drops its previous chart.
+
+    Attributes
+    ----------
+    pool : ProcessPool
+        Worker processes
+    """
+
+    def __init__(self, pool: ProcessPool, maxsize: int = 128) -> None:
+        self.pool = pool
+        self.latest: LRUCache[int, str] = LRUCache(maxsize=maxsize)
+
+    def __repr__(self) -> str:
+        return f"PlotRenderer(keys={len(self.latest)}, pool={self.pool!r})"
+
+    def invalidate(self, key: int) -> None:
+        """Drops the last chart rendered for a key
+
+        Parameters
+        ----------
+        key : int
+            Key used on render, like a channel ID
+        """
+        if digest := self.latest.pop(key, None):
+            self.pool.discard(("plot", digest))
+
+    async def render(self, plot: WeatherPlot, key: Optional[int] = None, filename: str = "plot.png") -> File:
+        """Renders a weather chart
+
+        Parameters
+        ----------
+        plot : WeatherPlot
+            Chart inputs
+        key : Optional[int], optional
+            Owner of the chart, its previous chart gets dropped if it differs, by default None
+        filename : str, optional
+            Attachment name, by default plot.png
+
+        Returns
+        -------
+        File
+            PNG image
+        """
+        digest = plot.digest
+        if key is not None and (previous := self.latest.get(key)) != digest:
+            if previous:
+                self.pool.discard(("plot", previous))
+            self.latest[key] = digest
+
+        content = await self.pool.cached(("plot", digest), render_weather_plot, plot)
+        return File(fp=BytesIO(content), filename=filename)
@@ -0,0 +1,152 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Any, Callable, Hashable, Optional
+
+from cachetools import LRUCache
+
+__all__ = ("ProcessPool",)
+
+
+def result_size(result: Any) -> int:
+    """Bytes a cached result takes, its length for binary results"""
+    if isinstance(result, (bytes, bytearray, memoryview)):
+        return max(len(result), 1)
+    return sys.getsizeof(result)
+
+
+class ProcessPool:
+    """Process pool shared by the CPU-bound renderers.
+
+    Workers are spawned on first use. Results are cached by key within
+    cache_bytes, larger ones aren't cached, and identical calls in progress
+    share one future. If a worker dies, the pool gets replaced and the call
+    is tried once more.
+
+    Attributes
+    ----------
+    max_workers : int
+        Worker processes
+    cache : LRUCache[Hashable, Any]
+        Results by key, sized by their bytes
+    """
+
+    def __init__(self, max_workers: int = 2, cache_bytes: int = 64 * 1024**2) -> None:
+        self.max_workers = max_workers
+        self.cache: LRUCache[Hashable, Any] = LRUCache(maxsize=cache_bytes, getsizeof=result_size)
+        self.inflight: dict[Hashable, asyncio.Future] = {}
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def __repr__(self) -> str:
+        return f"ProcessPool(workers={self.max_workers}, cached={len(self.cache)}, running={len(self.inflight)})"
+
+    async def __aenter__(self) -> ProcessPool:
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        if executor := self.executor:
+            self.executor = None
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=get_context("spawn"))
+        return self.executor
+
+    def _drop(self, executor: ProcessPoolExecutor) -> None:
+        if self.executor is executor:
+            self.executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Calls a function in a worker process
+
+        Parameters
+        ----------
+        func : Callable[..., Any]
+            Picklable function
+        args : Any
+            Picklable arguments
+
+        Returns
+        -------
+        Any
+            Result of the call
+
+        Raises
+        ------
+        BrokenProcessPool
+            If the workers died twice in a row
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._executor()
+        try:
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            self._drop(executor)
+
+        executor = self._executor()
+        try:
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            self._drop(executor)
+            raise
+
+    async def cached(self, key: Hashable, func: Callable[..., Any], *args: Any) -> Any:
+        """Calls a function in a worker process, unless its result is cached
+
+        Parameters
+        ----------
+        key : Hashable
+            Cache key, identifying the function and its arguments
+        func : Callable[..., Any]
+            Picklable function
+        args : Any
+            Picklable arguments
+
+        Returns
+        -------
+        Any
+            Result of the call
+        """
+        try:
+            return self.cache[key]
+        except KeyError:
+            pass
+
+        if (future := self.inflight.get(key)) is None:
+            future = self.inflight[key] = asyncio.ensure_future(self.run(func, *args))
+            future.add_done_callback(lambda _: self.inflight.pop(key, None))
+        result = await asyncio.shield(future)
+        if result_size(result) <= self.cache.maxsize:
+            self.cache[key] = result
+        return result
+
+    def discard(self, key: Hashable) -> None:
+        """Drops a cached result
+
+        Parameters
+        ----------
+        key : Hashable
+            Cache key
+        """
+        self.cache.pop(key, None)
@@ -0,0 +1,207 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from enum import StrEnum, auto
+from typing import TYPE_CHECKING, Optional
+
+from discord import Message
+from rapidfuzz import fuzz
+
+from src.utils.matches import TUPPER_REPLY_PATTERN
+
+if TYPE_CHECKING:
+    from src.structures.bot import CustomBot
+
+__all__ = ("ProxyStatus", "ProxyResult", "ProxyTracker")
+
+
+class ProxyStatus(StrEnum):
+    Timeout = auto()
+    Deleted = auto()
+    Edited = auto()
+
+
+@dataclass(slots=True)
+class ProxyResult:
+    """Outcome of tracking a message
+
+    Attributes
+    ----------
+    message : Message
+        Original message
+    status : ProxyStatus
+        What ended the tracking
+    proxies : list[Message]
+        Webhook messages matching the original, by ID
+    """
+
+    message: Message
+    status: ProxyStatus = ProxyStatus.Timeout
+    proxies: list[Message] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class PendingProxy:
+    result: ProxyResult
+    future: asyncio.Future[ProxyResult]
+    deadline: float
+
+
+def proxy_content(message: Message) -> str:
+    if data := TUPPER_REPLY_PATTERN.search(message.content):
+        return str(data.group("content") or message.content)
+    return message.content
+
+
+def is_proxy_of(original: Message, proxy: Message) -> bool:
+    """Checks if a webhook message reposts the original one
+
+    Parameters
+    ----------
+    original : Message
+        Message sent by the user
+    proxy : Message
+        Message sent by a webhook
+
+    Returns
+    -------
+    bool
+        If the content or the attachments match
+    """
+    text = proxy_content(proxy)
+    attachments = original.attachments
+    return bool(
+        text in original.content
+        or fuzz.WRatio(text, original.content, score_cutoff=95)
+        or (
+            attachments
+            and len(attachments) == len(proxy.attachments)
+            and all(x.filename == y.filename for x, y in zip(attachments, proxy.attachments))
+        )
+    )
+
+
+class ProxyTracker:
+    """Matches messages with the webhook messages that proxy them.
+
+    Tracked messages stay pending for a fixed window, incoming webhook
+    messages are matched against the pending messages of their channel and
+    assigned to the most recent one they repost. Pending messages resolve
+    once deleted, edited or when the window ends, all of them sharing one
+    timer. Messages with proxies get dispatched as ``message_proxy``.
+
+    Attributes
+    ----------
+    bot : CustomBot
+        Bot instance
+    window : float
+        Seconds a message stays pending
+    """
+
+    def __init__(self, bot: CustomBot, window: float = 2) -> None:
+        self.bot = bot
+        self.window = window
+        self.pending: dict[int, PendingProxy] = {}
+        self.channels: defaultdict[int, dict[int, PendingProxy]] = defaultdict(dict)
+        self.deadlines: deque[PendingProxy] = deque()
+        self.sweeper: Optional[asyncio.Task] = None
+        bot.add_listener(self.on_message, "on_message")
+        bot.add_listener(self.on_message_edit, "on_message_edit")
+        bot.add_listener(self.on_message_delete, "on_message_delete")
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def __repr__(self) -> str:
+        return f"ProxyTracker(pending={len(self)}, window={self.window})"
+
+    def track(self, message: Message) -> asyncio.Future[ProxyResult]:
+        """Starts tracking a message, tracking it again returns the same future
+
+        Parameters
+        ----------
+        message : Message
+            Message sent by an user
+
+        Returns
+        -------
+        asyncio.Future[ProxyResult]
+            Resolves once the window ends, or the message gets edited or deleted
+        """
+        if item := self.pending.get(message.id):
+            return item.future
+
+        loop = asyncio.get_running_loop()
+        item = PendingProxy(
+            result=ProxyResult(message=message),
+            future=loop.create_future(),
+            deadline=loop.time() + self.window,
+        )
+        self.pending[message.id] = item
+        self.channels[message.channel.id][message.id] = item
+        self.deadlines.append(item)
+
+        if self.sweeper is None or self.sweeper.done():
+            self.sweeper = asyncio.create_task(self.sweep(), name="ProxyTracker")
+
+        return item.future
+
+    def resolve(self, message_id: int, status: ProxyStatus) -> None:
+        if not (item := self.pending.pop(message_id, None)):
+            return
+
+        result = item.result
+        channel_id = result.message.channel.id
+        if (items := self.channels.get(channel_id)) is not None:
+            items.pop(message_id, None)
+            if not items:
+                del self.channels[channel_id]
+
+        result.status = status
+        result.proxies.sort(key=lambda x: x.id)
+        if not item.future.done():
+            item.future.set_result(result)
+        if result.proxies and status != ProxyStatus.Edited:
+            self.bot.dispatch("message_proxy", result)
+
+    async def sweep(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self.deadlines:
+            item = self.deadlines[0]
+            if (delay := item.deadline - loop.time()) > 0:
+                await asyncio.sleep(delay)
+                continue
+            self.deadlines.popleft()
+            self.resolve(item.result.message.id, ProxyStatus.Timeout)
+
+    async def on_message(self, message: Message) -> None:
+        if not message.webhook_id or not (items := self.channels.get(message.channel.id)):
+            return
+
+        for item in sorted(items.values(), key=lambda x: x.result.message.id, reverse=True):
+            if is_proxy_of(item.result.message, message):
+                item.result.proxies.append(message)
+                break
+
+    async def on_message_edit(self, before: Message, _: Message) -> None:
+        self.resolve(before.id, ProxyStatus.Edited)
+
+    async def on_message_delete(self, message: Message) -> None:
+        self.resolve(message.id, ProxyStatus.Deleted)
@@ -0,0 +1,140 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from contextlib import asynccontextmanager, suppress
+from hashlib import sha256
+from io import BytesIO
+from typing import TYPE_CHECKING, Any, Literal, Optional
+
+from discord import File
+from orjson import OPT_SORT_KEYS, dumps
+
+if TYPE_CHECKING:
+    from src.structures.bot import CustomBot
+    from src.structures.character import Character
+    from src.structures.process_pool import ProcessPool
+
+__all__ = ("DocumentRenderer", "render_document")
+
+DocumentKind = Literal["docx", "pdf"]
+
+
+def render_document(kind: DocumentKind, data: dict[str, Any], image: Optional[bytes]) -> bytes:
+    """Renders a character out of its Mongo document, meant for worker processes
+
+    Parameters
+    ----------
+    kind : DocumentKind
+        docx or pdf
+    data : dict[str, Any]
+        Character as returned by to_mongo_dict
+    image : Optional[bytes]
+        Character image
+
+    Returns
+    -------
+    bytes
+        Rendered document
+    """
+    from src.structures.character import Character
+
+    oc = Character.from_mongo_dict(data)
+    if kind == "pdf":
+        return oc.render_pdf(image)
+    return oc.render_docx(image)
+
+
+class DocumentRenderer:
+    """Renders character documents in the shared process pool.
+
+    Results are cached by the character's revision, which is a digest of its
+    document and image, and each user may only render a limited amount of
+    documents at once.
+
+    Attributes
+    ----------
+    bot : CustomBot
+        Bot instance
+    pool : ProcessPool
+        Worker processes
+    per_user : int
+        Concurrent renders per user
+    """
+
+    def __init__(self, bot: CustomBot, pool: ProcessPool, per_user: int = 1) -> None:
+        self.bot = bot
+        self.pool = pool
+        self.per_user = per_user
+        self.users: dict[int, asyncio.Semaphore] = {}
+        self.waiting: Counter[int] = Counter()
+
+    def __repr__(self) -> str:
+        return f"DocumentRenderer(users={len(self.users)}, pool={self.pool!r})"
+
+    @staticmethod
+    def revision(data: dict[str, Any], image: Optional[bytes]) -> str:
+        digest = sha256(dumps(data, default=str, option=OPT_SORT_KEYS))
+        digest.update(image or b"")
+        return digest.hexdigest()
+
+    @asynccontextmanager
+    async def slot(self, user_id: Optional[int]):
+        if user_id is None:
+            yield
+            return
+
+        semaphore = self.users.setdefault(user_id, asyncio.Semaphore(self.per_user))
+        self.waiting[user_id] += 1
+        try:
+            async with semaphore:
+                yield
+        finally:
+            self.waiting[user_id] -= 1
+            if not self.waiting[user_id]:
+                del self.waiting[user_id]
+                self.users.pop(user_id, None)
+
+    async def render(self, oc: Character, kind: DocumentKind = "docx", user_id: Optional[int] = None) -> File:
+        """Renders a character document
+
+        Parameters
+        ----------
+        oc : Character
+            Character to render
+        kind : DocumentKind, optional
+            docx or pdf, by default docx
+        user_id : Optional[int], optional
+            User requesting it, by default None
+
+        Returns
+        -------
+        File
+            Rendered document
+        """
+        async with self.slot(user_id):
+            image = None
+            if url := oc.image_url:
+                with suppress(Exception):
+                    _, image = await self.bot.files.fetch(str(url))
+
+            data = oc.to_mongo_dict()
+            key = kind, self.revision(data, image)
+            content = await self.pool.cached(key, render_document, kind, data, image)
+
+        return File(fp=BytesIO(content), filename=f"{oc.id or 'Character'}.{kind}")
@@ -0,0 +1,445 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from contextlib import suppress
+from typing import Any, Iterable, Mapping, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from pymongo.errors import PyMongoError
+
+from src.structures.change_stream import follow_changes
+from src.structures.character import Character
+from src.structures.species import Fusion
+
+__all__ = ("CharacterRepository", "character_facets")
+
+INDEXES = [
+    IndexModel([("server", ASCENDING), ("id", ASCENDING)]),
+    IndexModel([("server", ASCENDING), ("author", ASCENDING)]),
+    IndexModel([("server", ASCENDING), ("thread", ASCENDING)]),
+]
+
+
+def character_facets(oc: Character) -> frozenset[tuple[str, Any]]:
+    """Indexed values of a character
+
+    Parameters
+    ----------
+    oc : Character
+        Character
+
+    Returns
+    -------
+    frozenset[tuple[str, Any]]
+        Pairs of field and value, usable as query terms
+    """
+    items: set[tuple[str, Any]] = {("author", oc.author), ("kind", oc.kind), ("age", oc.age)}
+    if isinstance(oc.species, Fusion):
+        items.update(("species", x.id) for x in oc.species.bases)
+    elif mon := getattr(oc.species, "base", oc.species):
+        items.add(("species", mon.id))
+    items.update(("type", x) for x in oc.types)
+    items.update(("pronoun", x) for x in oc.pronoun)
+    items.update(("move", x) for x in oc.moveset)
+    return frozenset(items)
+
+
+class CharacterRepository:
+    """In-memory copy of the Characters collection.
+
+    Servers are loaded on first access, documents are parsed once and kept
+    indexed by ID, by server and by author. Writes made through the
+    repository update the indexes right away, while a change stream keeps
+    them in sync with writes made elsewhere. The stream reconnects after
+    errors, resuming where it stopped when possible.
+
+    Attributes
+    ----------
+    db : AsyncIOMotorCollection
+        Characters collection
+    ocs : dict[int, Character]
+        Characters by ID
+    servers : defaultdict[int, dict[int, Character]]
+        Characters by server and ID
+    authors : defaultdict[tuple[int, int], dict[int, Character]]
+        Characters by server, author and ID
+    facets : defaultdict[tuple[int, str, Any], set[int]]
+        Character IDs by server and query term
+    max_delay : float
+        Max seconds between reconnection attempts of the change stream
+    """
+
+    def __init__(self, db: AsyncIOMotorCollection, watch: bool = True, max_delay: float = 300) -> None:
+        self.db = db
+        self.watch = watch
+        self.max_delay = max_delay
+        self.ocs: dict[int, Character] = {}
+        self.servers: defaultdict[int, dict[int, Character]] = defaultdict(dict)
+        self.authors: defaultdict[tuple[int, int], dict[int, Character]] = defaultdict(dict)
+        self.facets: defaultdict[tuple[int, str, Any], set[int]] = defaultdict(set)
+        self.terms: dict[int, frozenset[tuple[str, Any]]] = {}
+        self.object_ids: dict[Any, int] = {}
+        self.loaded: set[int] = set()
+        self.loading: dict[int, list[Mapping[str, Any]]] = {}
+        self.generation = 0
+        self.locks: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.watcher: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.ocs)
+
+    def __repr__(self) -> str:
+        return f"CharacterRepository(ocs={len(self)}, servers={len(self.loaded)})"
+
+    async def __aenter__(self) -> CharacterRepository:
+        with suppress(PyMongoError):
+            await self.db.create_indexes(INDEXES)
+        if self.watch and self.watcher is None:
+            self.watcher = asyncio.create_task(self.listen(), name="CharacterRepository")
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        if watcher := self.watcher:
+            self.watcher = None
+            watcher.cancel()
+            with suppress(asyncio.CancelledError):
+                await watcher
+
+    def add(self, data: dict[str, Any]) -> Character:
+        """Parses a document and indexes it
+
+        Parameters
+        ----------
+        data : dict[str, Any]
+            Mongo document
+
+        Returns
+        -------
+        Character
+            Parsed character
+        """
+        data = dict(data)
+        object_id = data.get("_id")
+        oc = Character.from_mongo_dict(data)
+        self.discard(oc.id)
+        self.ocs[oc.id] = oc
+        self.servers[oc.server][oc.id] = oc
+        self.authors[oc.server, oc.author][oc.id] = oc
+        self.terms[oc.id] = terms = character_facets(oc)
+        for field, value in terms:
+            self.facets[oc.server, field, value].add(oc.id)
+        if object_id is not None:
+            self.object_ids[object_id] = oc.id
+        return oc
+
+    def discard(self, oc_id: int) -> Optional[Character]:
+        """Removes a character from the indexes
+
+        Parameters
+        ----------
+        oc_id : int
+            Character ID
+
+        Returns
+        -------
+        Optional[Character]
+            Removed character if it was indexed
+        """
+        if oc := self.ocs.pop(oc_id, None):
+            self.servers[oc.server].pop(oc_id, None)
+            key = oc.server, oc.author
+            if (items := self.authors.get(key)) is not None:
+                items.pop(oc_id, None)
+                if not items:
+                    del self.authors[key]
+            for field, value in self.terms.pop(oc_id, ()):
+                key = oc.server, field, value
+                if (ids := self.facets.get(key)) is not None:
+                    ids.discard(oc_id)
+                    if not ids:
+                        del self.facets[key]
+        return oc
+
+    async def load(self, server: int) -> dict[int, Character]:
+        """Loads the characters of a server if needed
+
+        Parameters
+        ----------
+        server : int
+            Server ID
+
+        Returns
+        -------
+        dict[int, Character]
+            Characters by ID
+        """
+        if server not in self.loaded:
+            async with self.locks[server]:
+                if server not in self.loaded:
+                    generation = self.generation
+                    # Changes seen while reading may concern documents the cursor already passed
+                    self.loading[server] = changes = []
+                    try:
+                        async for item in self.db.find({"server": server}):
+                            self.add(item)
+                    finally:
+                        del self.loading[server]
+                    # A clear() while reading leaves the server partially loaded
+                    if generation == self.generation:
+                        self.loaded.add(server)
+                        for change in changes:
+                            self.apply(change)
+        return self.servers[server]
+
+    async def get(self, server: int, oc_id: int) -> Optional[Character]:
+        """Character by ID
+
+        Parameters
+        ----------
+        server : int
+            Server ID
+        oc_id : int
+            Character ID
+
+        Returns
+        -------
+        Optional[Character]
+            Character if found
+        """
+        items = await self.load(server)
+        return items.get(oc_id)
+
+    async def from_server(self, server: int, authors: Optional[Iterable[int]] = None) -> list[Character]:
+        """Characters of a server
+
+        Parameters
+        ----------
+        server : int
+            Server ID
+        authors : Optional[Iterable[int]], optional
+            Only include characters of these authors, by default all
+
+        Returns
+        -------
+        list[Character]
+            Characters
+        """
+        items = await self.load(server)
+        if authors is None:
+            return list(items.values())
+        authors = set(authors)
+        return [oc for oc in items.values() if oc.author in authors]
+
+    async def from_author(self, server: int, author: int) -> list[Character]:
+        """Characters of an author in a server
+
+        Parameters
+        ----------
+        server : int
+            Server ID
+        author : int
+            Author ID
+
+        Returns
+        -------
+        list[Character]
+            Characters
+        """
+        await self.load(server)
+        if items := self.authors.get((server, author)):
+            return list(items.values())
+        return []
+
+    async def from_ids(self, server: int, ids: Iterable[int], author: Optional[int] = None) -> list[Character]:
+        """Characters matching the given IDs
+
+        Parameters
+        ----------
+        server : int
+            Server ID
+        ids : Iterable[int]
+            Character IDs
+        author : Optional[int], optional
+            Only include characters of this author, by default any
+
+        Returns
+        -------
+        list[Character]
+            Characters
+        """
+        items = await self.load(server)
+        return [
+            oc for oc_id in dict.fromkeys(ids) if (oc := items.get(oc_id)) and (author is None or oc.author == author)
+        ]
+
+    async def query(self, server: int, terms: Iterable[tuple[str, Any]] = ()) -> list[Character]:
+        """Characters matching every term, looked up through the facet index.
+
+        Terms are intersected from the least to the most common one, so the
+        result is only as large as the most selective term allows.
+
+        Parameters
+        ----------
+        server : int
+            Server ID
+        terms : Iterable[tuple[str, Any]], optional
+            Pairs of field and value, see character_facets
+
+        Returns
+        -------
+        list[Character]
+            Characters
+        """
+        items = await self.load(server)
+        if not (terms := set(terms)):
+            return list(items.values())
+
+        sets = sorted((self.facets.get((server, field, value), set()) for field, value in terms), key=len)
+        ids = set(sets[0]).intersection(*sets[1:])
+        return [items[oc_id] for oc_id in ids if oc_id in items]
+
+    async def upsert(self, oc: Character, reference_id: Optional[int] = None) -> Character:
+        """Stores a character, replacing the one with the reference ID
+
+        Parameters
+        ----------
+        oc : Character
+            Character to store
+        reference_id : Optional[int], optional
+            ID of the stored document, by default the character's ID
+
+        Returns
+        -------
+        Character
+            Indexed character
+        """
+        reference_id = reference_id or oc.id
+        data = oc.to_mongo_dict()
+        async with self.locks[oc.server]:
+            item = await self.db.find_one_and_replace(
+                {"id": reference_id, "server": oc.server},
+                data,
+                projection={"_id": 1},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+            if item:
+                data["_id"] = item["_id"]
+            self.discard(reference_id)
+            return self.add(data)
+
+    async def delete(self, server: int, oc_id: int) -> Optional[Character]:
+        """Deletes a character
+
+        Parameters
+        ----------
+        server : int
+            Server ID
+        oc_id : int
+            Character ID
+
+        Returns
+        -------
+        Optional[Character]
+            Deleted character if any
+        """
+        async with self.locks[server]:
+            data = await self.db.find_one_and_delete({"id": oc_id, "server": server})
+            oc = self.discard(oc_id)
+            if data:
+                self.object_ids.pop(data.get("_id"), None)
+        if data and oc is None:
+            oc = Character.from_mongo_dict(data)
+        return oc
+
+    async def delete_thread(self, server: int, thread: int) -> None:
+        """Deletes the characters listed in a thread
+
+        Parameters
+        ----------
+        server : int
+            Server ID
+        thread : int
+            Thread ID
+        """
+        async with self.locks[server]:
+            await self.db.delete_many({"server": server, "thread": thread})
+            for oc in [x for x in self.servers[server].values() if x.thread == thread]:
+                self.discard(oc.id)
+
+    def clear(self) -> None:
+        """Drops every loaded character"""
+        self.ocs.clear()
+        self.servers.clear()
+        self.authors.clear()
+        self.facets.clear()
+        self.terms.clear()
+        self.object_ids.clear()
+        self.loaded.clear()
+        self.generation += 1
+
+    def apply(self, change: Mapping[str, Any]) -> None:
+        """Applies a change stream event to the indexes, changes of servers
+        being loaded are kept until the load finishes
+
+        Parameters
+        ----------
+        change : Mapping[str, Any]
+            Change event
+        """
+        match change["operationType"]:
+            case "insert" | "replace" | "update":
+                if not (data := change.get("fullDocument")):
+                    return
+                if (server := data.get("server")) in self.loading:
+                    self.loading[server].append(change)
+                elif server in self.loaded:
+                    self.add(data)
+            case "delete":
+                if (oc_id := self.object_ids.pop(change["documentKey"]["_id"], None)) is not None:
+                    self.discard(oc_id)
+                else:
+                    # Delete events carry no server, it may belong to any being loaded
+                    for changes in self.loading.values():
+                        changes.append(change)
+            case "drop" | "rename" | "invalidate":
+                self.clear()
+
+    async def reset(self, resumed: bool) -> None:
+        """Drops the loaded characters unless the change stream resumed
+
+        Parameters
+        ----------
+        resumed : bool
+            Whether the stream continued after the last applied change
+        """
+        if not resumed:
+            self.clear()
+
+    async def listen(self) -> None:
+        """Keeps the indexes in sync through the collection's change stream.
+
+        Characters are dropped whenever the stream can't resume, so they get
+        loaded again on use. Deployments without change streams only rely on
+        the write methods.
+        """
+        await follow_changes(self.db, self.apply, self.reset, self.max_delay)
+        self.clear()
+        self.watch = False
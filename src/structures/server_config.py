@@ -0,0 +1,261 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass, field, fields
+from time import monotonic
+from typing import Any, Mapping, Optional
+
+from frozendict import frozendict
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import PyMongoError
+
+from src.structures.change_stream import follow_changes
+
+__all__ = ("ServerConfig", "ServerConfigs")
+
+
+@dataclass(frozen=True, slots=True)
+class ServerConfig:
+    """Settings of a server, as stored in the Server collection
+
+    Attributes
+    ----------
+    id : int
+        Server ID
+    data : frozendict[str, Any]
+        Whole document, for settings without a dedicated attribute
+    """
+
+    id: int
+    oc_list: Optional[int] = None
+    oc_submission: Optional[int] = None
+    oc_submission_msg: Optional[int] = None
+    oc_images: Optional[int] = None
+    oc_modifications: frozendict[str, Any] = field(default_factory=frozendict)
+    staff: Optional[int] = None
+    staff_chat: Optional[int] = None
+    tickets: Optional[int] = None
+    webhook_id: Optional[int] = None
+    rp_planning: Optional[int] = None
+    looking_for_rp: Optional[int] = None
+    rp_session_log: Optional[int] = None
+    threading: bool = False
+    no_thread_categories: frozenset[int] = frozenset()
+    self_roles: frozendict[str, Any] = field(default_factory=frozendict)
+    member_boost: frozendict[str, Any] = field(default_factory=frozendict)
+    data: frozendict[str, Any] = field(default_factory=frozendict, repr=False)
+
+    def __bool__(self) -> bool:
+        return bool(self.data)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    @classmethod
+    def from_mongo_dict(cls, data: dict[str, Any]) -> ServerConfig:
+        data = frozendict({k: v for k, v in data.items() if k != "_id"})
+        items: dict[str, Any] = {x.name: data[x.name] for x in fields(cls) if x.name in data}
+        for key in ("oc_modifications", "self_roles", "member_boost"):
+            if key in items:
+                items[key] = frozendict(items[key] or {})
+        if "no_thread_categories" in items:
+            items["no_thread_categories"] = frozenset(items["no_thread_categories"] or ())
+        items["data"] = data
+        return cls(**items)
+
+
+class ServerConfigs:
+    """In-memory copy of the Server collection.
+
+    Every document gets loaded on startup and a change stream keeps them in
+    sync with writes made anywhere else. The stream reconnects after errors;
+    while it is down, configurations are only trusted for ttl seconds and
+    servers are looked up on demand after that.
+
+    Attributes
+    ----------
+    db : AsyncIOMotorCollection
+        Server collection
+    configs : dict[int, ServerConfig]
+        Configurations by server ID
+    ttl : float
+        Seconds a configuration is used while the change stream is down
+    max_delay : float
+        Max seconds between reconnection attempts of the change stream
+    """
+
+    def __init__(
+        self,
+        db: AsyncIOMotorCollection,
+        watch: bool = True,
+        ttl: float = 60,
+        max_delay: float = 300,
+    ) -> None:
+        self.db = db
+        self.watch = watch
+        self.ttl = ttl
+        self.max_delay = max_delay
+        self.configs: dict[int, ServerConfig] = {}
+        self.fetched: dict[int, float] = {}
+        self.object_ids: dict[Any, int] = {}
+        self.loaded = False
+        self.live = False
+        self.streamed = False
+        self.watcher: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.configs)
+
+    def __repr__(self) -> str:
+        return f"ServerConfigs(servers={len(self)})"
+
+    async def __aenter__(self) -> ServerConfigs:
+        with suppress(PyMongoError):
+            await self.load()
+        if self.watch and self.watcher is None:
+            self.watcher = asyncio.create_task(self.listen(), name="ServerConfigs")
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        if watcher := self.watcher:
+            self.watcher = None
+            watcher.cancel()
+            with suppress(asyncio.CancelledError):
+                await watcher
+
+    def add(self, data: dict[str, Any]) -> Optional[ServerConfig]:
+        """Parses a document and indexes it
+
+        Parameters
+        ----------
+        data : dict[str, Any]
+            Mongo document
+
+        Returns
+        -------
+        Optional[ServerConfig]
+            Parsed configuration, None if the document has no server ID
+        """
+        if not isinstance(server_id := data.get("id"), int):
+            return None
+        config = ServerConfig.from_mongo_dict(data)
+        self.configs[server_id] = config
+        self.fetched[server_id] = monotonic()
+        if (object_id := data.get("_id")) is not None:
+            self.object_ids[object_id] = server_id
+        return config
+
+    async def load(self) -> None:
+        """Loads every configuration"""
+        self.loaded = False
+        items = [x async for x in self.db.find({})]
+        self.clear()
+        for item in items:
+            self.add(item)
+        self.loaded = True
+
+    def clear(self) -> None:
+        """Drops every configuration"""
+        self.configs.clear()
+        self.fetched.clear()
+        self.object_ids.clear()
+        self.loaded = False
+
+    async def refresh(self, guild_id: int) -> ServerConfig:
+        """Reloads the configuration of a server
+
+        Parameters
+        ----------
+        guild_id : int
+            Server ID
+
+        Returns
+        -------
+        ServerConfig
+            Configuration
+        """
+        if data := await self.db.find_one({"id": guild_id}):
+            return self.add(data)
+        self.configs.pop(guild_id, None)
+        self.fetched[guild_id] = monotonic()
+        return ServerConfig(id=guild_id)
+
+    async def get_config(self, guild_id: Optional[int]) -> ServerConfig:
+        """Configuration of a server
+
+        Parameters
+        ----------
+        guild_id : Optional[int]
+            Server ID
+
+        Returns
+        -------
+        ServerConfig
+            Configuration, empty if the server has none
+        """
+        if guild_id is None:
+            return ServerConfig(id=guild_id)
+        if self.live or (guild_id in self.fetched and monotonic() - self.fetched[guild_id] < self.ttl):
+            return self.configs.get(guild_id) or ServerConfig(id=guild_id)
+        return await self.refresh(guild_id)
+
+    def apply(self, change: Mapping[str, Any]) -> None:
+        """Applies a change stream event to the configurations
+
+        Parameters
+        ----------
+        change : Mapping[str, Any]
+            Change event
+        """
+        match change["operationType"]:
+            case "insert" | "replace" | "update":
+                if data := change.get("fullDocument"):
+                    self.add(data)
+            case "delete":
+                if (server_id := self.object_ids.pop(change["documentKey"]["_id"], None)) is not None:
+                    self.configs.pop(server_id, None)
+                    self.fetched.pop(server_id, None)
+            case "drop" | "rename" | "invalidate":
+                self.clear()
+
+    async def resync(self, resumed: bool) -> None:
+        """Loads every configuration again unless the change stream resumed.
+        The first stream follows the load done on startup.
+
+        Parameters
+        ----------
+        resumed : bool
+            Whether the stream continued after the last applied change
+        """
+        if not self.loaded or (not resumed and self.streamed):
+            await self.load()
+        self.live = self.streamed = True
+
+    def suspend(self) -> None:
+        """Trusts the configurations only for ttl seconds again"""
+        self.live = False
+
+    async def listen(self) -> None:
+        """Keeps the configurations in sync through the collection's change
+        stream, trusting them without ttl while it is open. Deployments without
+        change streams only see the startup load, explicit refreshes and on
+        demand lookups.
+        """
+        await follow_changes(self.db, self.apply, self.resync, self.max_delay, on_close=self.suspend)
+        self.watch = False
@@ -20,19 +20,22 @@ from collections import defaultdict
 from dataclasses import asdict, dataclass, field
 from enum import Enum
 from functools import reduce
+from inspect import getfile
 from itertools import combinations_with_replacement
 from json import JSONEncoder, load
 from typing import Any, Callable, Iterable, Optional, Type
 
 from discord.utils import find, get
 from frozendict import frozendict
-from rapidfuzz import process
 
-from src.structures.ability import Ability
+from src.structures.ability import ALL_ABILITIES, Ability
 from src.structures.mon_typing import TypingEnum
-from src.structures.movepool import Movepool
+from src.structures.move import ALL_MOVES, MOVE_SOURCES, Move
+from src.structures.movepool import FIELDS, Movepool
 from src.structures.pronouns import Pronoun
-from src.utils.functions import common_pop_get, fix
+from src.utils.deducer import FuzzyDeducer
+from src.utils.functions import common_pop_get
+from src.utils.snapshot import load_snapshot
 
 __all__ = (
     "Species",
@@ -46,6 +49,8 @@ __all__ = (
     "Variant",
     "ALL_SPECIES",
     "SPECIES_BY_NAME",
+    "SPECIES_REGISTRY",
+    "SpeciesRegistry",
 )
 
 
@@ -74,6 +79,56 @@ PHRASES = {
 }
 
 
+def species_query(text: str) -> str:
+    """Normalizes a species query, regional prefixes become suffixes
+
+    Parameters
+    ----------
+    text : str
+        Query, e.g. "Galarian Meowth"
+
+    Returns
+    -------
+    str
+        Normalized query, e.g. "Meowth Galar"
+    """
+    word = text.strip().title()
+    for key, value in PHRASES.items():
+        phrase1, phrase2 = f"{value} ".title(), f"{key} ".title()
+        if word.startswith(phrase1) or word.startswith(phrase2):
+            word = word.removeprefix(phrase1)
+            word = word.removeprefix(phrase2)
+            if key != "KANTO":
+                word = f"{word} {key}".title()
+            break
+    return word
+
+
+def inherit_movepool(movepool: Movepool, ancestors: Iterable[Species]) -> Movepool:
+    """Adds what can be inherited from previous evolutions to a movepool
+
+    Parameters
+    ----------
+    movepool : Movepool
+        Base movepool
+    ancestors : Iterable[Species]
+        Previous evolutions, closest first
+
+    Returns
+    -------
+    Movepool
+        Resulting movepool
+    """
+    aux = movepool
+    for mon in ancestors:
+        if not aux:
+            aux += mon.movepool
+        else:
+            moves = mon.movepool.without_moves(aux)
+            aux += Movepool(egg=mon.movepool.egg, other=moves())
+    return aux
+
+
 def merge_multiple_strings(strings: Iterable[str]):
 
     groups = defaultdict(list)
@@ -166,9 +221,14 @@ class Species:
 
     @property
     def evol_line(self):
+        if SPECIES_REGISTRY.is_registered(self):
+            return SPECIES_REGISTRY.evol_line(self)
+
         items = [self]
         aux = self
         while isinstance(mon := aux.species_evolves_from, Species):
+            if SPECIES_REGISTRY.is_registered(mon):
+                return [*SPECIES_REGISTRY.evol_line(mon), *items[::-1]]
             items.append(aux := mon)
         return items[::-1]
 
@@ -181,14 +241,7 @@ class Species:
     ) -> frozenset[Species]:
         include = tuple(include) if isinstance(include, Iterable) else (include or cls)
         exclude = tuple(exclude) if isinstance(exclude, Iterable) else (exclude or None)
-
-        def check(x: Species):
-            condition = isinstance(x, include)
-            if exclude is not None:
-                condition &= not isinstance(x, exclude)
-            return condition
-
-        return frozenset(filter(check, ALL_SPECIES.values()))
+        return SPECIES_REGISTRY.all(include, exclude)
 
     @classmethod
     def find(cls, predicate: Callable[[Species], Any]):
@@ -216,15 +269,17 @@ class Species:
         if TypingEnum.Shadow in self.types:
             return Movepool.shadow()
 
+        if SPECIES_REGISTRY.is_registered(self):
+            return SPECIES_REGISTRY.total_movepool(self)
+
         mon = self
-        aux = self.movepool
+        ancestors: list[Species] = []
         while mon := mon.species_evolves_from:
-            if not aux:
-                aux += mon.movepool
-            else:
-                moves = mon.movepool.without_moves(aux)
-                aux += Movepool(egg=mon.movepool.egg, other=moves())
-        return aux
+            ancestors.append(mon)
+            if SPECIES_REGISTRY.is_registered(mon):
+                ancestors.extend(SPECIES_REGISTRY.ancestors(mon))
+                break
+        return inherit_movepool(self.movepool, ancestors)
 
     @property
     def species_evolves_to(self) -> list[Species]:
@@ -265,27 +320,8 @@ class Species:
             elif isinstance(elem, cls):
                 items.append(elem)
 
-        entries = list(cls.all())
-
-        for word in filter(bool, [x.strip().title() for x in ",".join(aux).split(",")]):
-            for key, value in PHRASES.items():
-                phrase1, phrase2 = f"{value} ".title(), f"{key} ".title()
-                if word.startswith(phrase1) or word.startswith(phrase2):
-                    word = word.removeprefix(phrase1)
-                    word = word.removeprefix(phrase2)
-                    if key != "KANTO":
-                        word = f"{word} {key}".title()
-                    break
-
-            if data := SPECIES_BY_NAME.get(word) or ALL_SPECIES.get(fix(word)):
-                items.append(data)
-            elif elements := process.extractOne(
-                query=word,
-                choices=entries,
-                processor=lambda x: getattr(x, "name", x),
-                score_cutoff=85,
-            ):
-                items.append(elements[0])
+        deducer = SPECIES_REGISTRY.deducer(cls)
+        items.extend(x for word in ",".join(aux).split(",") if (x := deducer(word)))
 
         return frozenset(items)
 
@@ -318,28 +354,10 @@ class Species:
             if isinstance(elem, cls):
                 return elem
 
-        entries = list(cls.all())
-        items = [o for x in ",".join(aux).split(",") if (o := x.strip().title())]
-
-        for word in items:
-            for key, value in PHRASES.items():
-                phrase1, phrase2 = f"{value} ".title(), f"{key} ".title()
-                if word.startswith(phrase1) or word.startswith(phrase2):
-                    word = word.removeprefix(phrase1)
-                    word = word.removeprefix(phrase2)
-                    if key != "KANTO":
-                        word = f"{word} {key}".title()
-                    break
-
-            if data := SPECIES_BY_NAME.get(word) or ALL_SPECIES.get(fix(word)):
+        deducer = SPECIES_REGISTRY.deducer(cls)
+        for word in ",".join(aux).split(","):
+            if data := deducer(word):
                 return data
-            if elements := process.extractOne(
-                query=word,
-                choices=entries,
-                processor=lambda x: getattr(x, "name", x),
-                score_cutoff=85,
-            ):
-                return elements[0]
 
     @classmethod
     def any_deduce(cls, item: str):
@@ -379,7 +397,7 @@ class Species:
             return item
 
         if isinstance(item, str):
-            values = {i.id: i for i in cls.all()} or ALL_SPECIES
+            values = SPECIES_REGISTRY.ids(cls)
             items = {x for i in item.split("_") if (x := values.get(i))}
             if len(items) > 1:
                 items = {Fusion(*items)}
@@ -596,7 +614,7 @@ class Fusion(Species):
             return item
 
         if isinstance(item, str):
-            values = {i.id: i for i in cls.all()} or ALL_SPECIES
+            values = SPECIES_REGISTRY.ids(cls)
             items = {x for i in item.split("_") if (x := values.get(i))}
             return Fusion(*items)
 
@@ -731,6 +749,279 @@ class Variant(CustomSpecies):
     "This class Represents a Variant"
 
 
+SPECIES_KINDS: tuple[Type[Species], ...] = (Pokemon, Legendary, Mythical, Mega, UltraBeast, Paradox, GMax)
+
+
+@dataclass(frozen=True, slots=True)
+class SpeciesRegistry:
+    """Immutable lookup tables over the loaded species.
+
+    Attributes
+    ----------
+    by_id : frozendict[str, Species]
+        Species indexed by ID
+    by_name : frozendict[str, Species]
+        Species indexed by name
+    buckets : frozendict[Type[Species], frozenset[Species]]
+        Species grouped by their exact class
+    evolves_from : frozendict[str, tuple[Species, ...]]
+        Previous evolutions per species ID, closest first
+    evolves_to : frozendict[str, frozenset[Species]]
+        Later evolutions per species ID, at any depth
+    """
+
+    by_id: frozendict[str, Species] = field(default_factory=frozendict)
+    by_name: frozendict[str, Species] = field(default_factory=frozendict)
+    buckets: frozendict[Type[Species], frozenset[Species]] = field(default_factory=frozendict)
+    evolves_from: frozendict[str, tuple[Species, ...]] = field(default_factory=frozendict)
+    evolves_to: frozendict[str, frozenset[Species]] = field(default_factory=frozendict)
+    _all_cache: dict[tuple, frozenset[Species]] = field(default_factory=dict, compare=False, repr=False)
+    _ids_cache: dict[Type[Species], frozendict[str, Species]] = field(default_factory=dict, compare=False, repr=False)
+    _deducers: dict[Type[Species], FuzzyDeducer[Species]] = field(default_factory=dict, compare=False, repr=False)
+    _movepools: dict[str, Movepool] = field(default_factory=dict, compare=False, repr=False)
+    _learners: dict[bool, dict[str, dict[Move, frozenset[Species]]]] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+    @classmethod
+    def from_species(cls, items: Iterable[Species]):
+        items = [x for x in items if isinstance(x, Species)]
+        buckets: dict[Type[Species], set[Species]] = defaultdict(set)
+        for item in items:
+            buckets[type(item)].add(item)
+
+        by_id = {x.id: x for x in items}
+        evolves_from: dict[str, tuple[Species, ...]] = {}
+        evolves_to: dict[str, set[Species]] = defaultdict(set)
+        for item in items:
+            ancestors: list[Species] = []
+            mon = item
+            while (mon := by_id.get(mon.evolves_from)) and mon is not item and mon not in ancestors:
+                ancestors.append(mon)
+                evolves_to[mon.id].add(item)
+            evolves_from[item.id] = tuple(ancestors)
+
+        registry = cls(
+            by_id=frozendict(by_id),
+            by_name=frozendict({x.name: x for x in items}),
+            buckets=frozendict({k: frozenset(v) for k, v in buckets.items()}),
+            evolves_from=frozendict(evolves_from),
+            evolves_to=frozendict({k: frozenset(v) for k, v in evolves_to.items()}),
+        )
+
+        for kind in (Species, *SPECIES_KINDS):
+            registry.all(kind)
+            registry.ids(kind)
+
+        return registry
+
+    def all(
+        self,
+        include: tuple[Type[Species], ...] | Type[Species] = Species,
+        exclude: Optional[tuple[Type[Species], ...] | Type[Species]] = None,
+    ) -> frozenset[Species]:
+        """Species which are instances of include but not of exclude
+
+        Parameters
+        ----------
+        include : tuple[Type[Species], ...] | Type[Species], optional
+            Classes to include, by default Species
+        exclude : Optional[tuple[Type[Species], ...] | Type[Species]], optional
+            Classes to exclude, by default None
+
+        Returns
+        -------
+        frozenset[Species]
+            Matching species
+        """
+        key = include, exclude
+        if (items := self._all_cache.get(key)) is None:
+            items = frozenset().union(
+                *(
+                    v
+                    for k, v in self.buckets.items()
+                    if issubclass(k, include) and not (exclude and issubclass(k, exclude))
+                )
+            )
+            self._all_cache[key] = items
+        return items
+
+    def ids(self, kind: Type[Species] = Species) -> frozendict[str, Species]:
+        """ID index restricted to a class, falls back to every species if empty
+
+        Parameters
+        ----------
+        kind : Type[Species], optional
+            Class to filter by, by default Species
+
+        Returns
+        -------
+        frozendict[str, Species]
+            Species indexed by ID
+        """
+        if (items := self._ids_cache.get(kind)) is None:
+            items = frozendict({x.id: x for x in self.all(kind)}) or self.by_id
+            self._ids_cache[kind] = items
+        return items
+
+    def is_registered(self, mon: Species) -> bool:
+        return self.by_id.get(mon.id) is mon
+
+    def ancestors(self, mon: Species) -> tuple[Species, ...]:
+        """Previous evolutions, closest first
+
+        Parameters
+        ----------
+        mon : Species
+            Registered species
+
+        Returns
+        -------
+        tuple[Species, ...]
+            Previous evolutions
+        """
+        return self.evolves_from.get(mon.id, ())
+
+    def descendants(self, mon: Species) -> frozenset[Species]:
+        """Later evolutions, at any depth
+
+        Parameters
+        ----------
+        mon : Species
+            Registered species
+
+        Returns
+        -------
+        frozenset[Species]
+            Later evolutions
+        """
+        return self.evolves_to.get(mon.id, frozenset())
+
+    def evol_line(self, mon: Species) -> list[Species]:
+        return [*reversed(self.ancestors(mon)), mon]
+
+    def total_movepool(self, mon: Species) -> Movepool:
+        """Movepool including what gets inherited from previous evolutions
+
+        Parameters
+        ----------
+        mon : Species
+            Registered species
+
+        Returns
+        -------
+        Movepool
+            Memoized movepool
+        """
+        if (item := self._movepools.get(mon.id)) is None:
+            item = inherit_movepool(mon.movepool, self.ancestors(mon))
+            self._movepools[mon.id] = item
+        return item
+
+    def learnsets(self, total: bool = False) -> dict[str, dict[Move, frozenset[Species]]]:
+        """Inverted index from moves to the species which learn them
+
+        Parameters
+        ----------
+        total : bool, optional
+            Whether to index total movepools, by default False
+
+        Returns
+        -------
+        dict[str, dict[Move, frozenset[Species]]]
+            Species per move, per learn method
+        """
+        if (index := self._learners.get(total)) is None:
+            aux: dict[str, dict[Move, set[Species]]] = {x: defaultdict(set) for x in FIELDS}
+            for mon in self.by_id.values():
+                movepool = mon.total_movepool if total else mon.movepool
+                for method, posting in aux.items():
+                    for move in movepool[method]:
+                        posting[move].add(mon)
+            index = {k: {x: frozenset(y) for x, y in v.items()} for k, v in aux.items()}
+            self._learners[total] = index
+        return index
+
+    def learners(
+        self,
+        *moves: Move,
+        methods: Optional[Iterable[str]] = None,
+        total: bool = False,
+    ) -> frozenset[Species]:
+        """Species which can learn every move provided
+
+        Parameters
+        ----------
+        moves : Move
+            Moves to look for
+        methods : Optional[Iterable[str]], optional
+            Learn methods to consider, by default all of them
+        total : bool, optional
+            Whether to consider total movepools, by default False
+
+        Returns
+        -------
+        frozenset[Species]
+            Matching species
+        """
+        index = self.learnsets(total)
+        postings = [index[x] for x in methods or FIELDS]
+        items: Optional[frozenset[Species]] = None
+        for move in moves:
+            data = frozenset().union(*(x.get(move, ()) for x in postings))
+            items = data if items is None else items & data
+            if not items:
+                break
+        return items or frozenset()
+
+    def learn_methods(self, move: Move, total: bool = False) -> dict[Species, list[str]]:
+        """Learn methods per species for a move
+
+        Parameters
+        ----------
+        move : Move
+            Move to look for
+        total : bool, optional
+            Whether to consider total movepools, by default False
+
+        Returns
+        -------
+        dict[Species, list[str]]
+            Methods each species learns the move by
+        """
+        data: dict[Species, list[str]] = defaultdict(list)
+        for method, posting in self.learnsets(total).items():
+            for mon in posting.get(move, ()):
+                data[mon].append(method)
+        return dict(data)
+
+    def deducer(self, kind: Type[Species] = Species) -> FuzzyDeducer[Species]:
+        """Fuzzy deducer whose candidates are restricted to a class
+
+        Parameters
+        ----------
+        kind : Type[Species], optional
+            Class to filter by, by default Species
+
+        Returns
+        -------
+        FuzzyDeducer[Species]
+            Deducer, exact name and ID matches consider every species
+        """
+        if (item := self._deducers.get(kind)) is None:
+            item = FuzzyDeducer(
+                sorted(self.all(kind), key=lambda x: x.name),
+                by_name=self.by_name,
+                by_id=self.by_id,
+                normalizer=species_query,
+            )
+            self._deducers[kind] = item
+        return item
+
+
+SPECIES_REGISTRY = SpeciesRegistry()
+
+
 class SpeciesEncoder(JSONEncoder):
     """Species encoder"""
 
@@ -758,12 +1049,29 @@ class SpeciesEncoder(JSONEncoder):
         return super(SpeciesEncoder, self).default(o)
 
 
-with open("resources/species.json", mode="r", encoding="utf8") as f:
-    DATA: list[Species] = load(f, object_hook=lambda x: Species.hook(x, x))
-    ALL_SPECIES: frozendict[str, Species] = frozendict({item.id: item for item in DATA if isinstance(item, Species)})
-    SPECIES_BY_NAME: frozendict[str, Species] = frozendict(
-        {item.name: item for item in DATA if isinstance(item, Species)}
-    )
+def load_species() -> SpeciesRegistry:
+    """Reads the species resources
+
+    Returns
+    -------
+    SpeciesRegistry
+        Registry of the game species
+    """
+    with open("resources/species.json", mode="r", encoding="utf8") as f:
+        return SpeciesRegistry.from_species(load(f, object_hook=lambda x: Species.hook(x, x)))
+
+
+SPECIES_REGISTRY = load_snapshot(
+    "species",
+    load_species,
+    "resources/species.json",
+    *MOVE_SOURCES,
+    getfile(Movepool),
+    refs={Move: ALL_MOVES, Ability: ALL_ABILITIES, TypingEnum: TypingEnum.__members__},
+    reducers={Movepool: Movepool.mask_reduce},
+)
+ALL_SPECIES: frozendict[str, Species] = SPECIES_REGISTRY.by_id
+SPECIES_BY_NAME: frozendict[str, Species] = SPECIES_REGISTRY.by_name
 
 
 with open("resources/dex_species.json", mode="r", encoding="utf8") as f:
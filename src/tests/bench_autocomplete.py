@@ -0,0 +1,79 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Autocomplete latency per keystroke, scoring every move against scoring the index shortlist.
+
+Run from the repository root: python -m src.tests.bench_autocomplete
+"""
+
+from random import Random
+from statistics import quantiles
+from time import perf_counter
+
+from rapidfuzz import process
+
+import src.structures  # noqa: F401
+from src.structures.move import Move
+from src.utils.autocomplete import AutocompleteIndex
+
+
+def typo(rng: Random, text: str) -> str:
+    if len(text) < 4:
+        return text
+    index = rng.randrange(1, len(text) - 1)
+    return text[:index] + text[index + 1] + text[index] + text[index + 2 :]
+
+
+def keystrokes(names: list[str], amount: int = 200, seed: int = 0) -> list[str]:
+    rng = Random(seed)
+    queries: list[str] = []
+    for name in rng.sample(names, min(amount, len(names))):
+        name = typo(rng, name) if rng.random() < 0.3 else name
+        queries.extend(name[:i] for i in range(1, len(name) + 1))
+    return queries
+
+
+def measure(queries: list[str], search) -> tuple[float, float]:
+    times: list[float] = []
+    for query in queries:
+        start = perf_counter()
+        search(query)
+        times.append((perf_counter() - start) * 1000)
+    cuts = quantiles(times, n=100)
+    return cuts[49], cuts[98]
+
+
+def main() -> None:
+    items = sorted(Move.all(), key=lambda x: x.name)
+    names = [x.name for x in items]
+    index = AutocompleteIndex(items, maxsize=None)
+    queries = keystrokes(names)
+
+    def full(query: str):
+        return process.extract(query, names, limit=25, score_cutoff=60)
+
+    print(f"{len(items)} moves, {len(queries)} keystrokes")
+    print("full scan  p50 %.2f ms, p99 %.2f ms" % measure(queries, full))
+    print("shortlist  p50 %.2f ms, p99 %.2f ms" % measure(queries, lambda x: index._search(x, 25)))
+
+    agree = 0
+    for query in queries:
+        expected = [name for name, *_ in full(query)[:1]]
+        found = [x.name for x in index._search(query, 1)]
+        agree += expected == found
+    print(f"same top result for {agree}/{len(queries)} keystrokes, ties in score can differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Scam link detection on chat messages, exact URL lookup against domain suffix lookup.
+
+Run from the repository root: python -m src.tests.bench_domains
+"""
+
+from random import Random
+from timeit import repeat
+
+import src.structures  # noqa: F401
+from src.utils.domains import DomainSet
+from src.utils.matches import REGEX_URL
+
+WORDS = "hey anyone up for a match tonight check this out lol nice free nitro gift".split()
+
+
+def build(size: int = 20_000, seed: int = 0) -> tuple[list[str], list[str]]:
+    rng = Random(seed)
+    domains = [f"{''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=8))}.com" for _ in range(size)]
+    links = (
+        "https://{}",
+        "https://{}/free-nitro?gift=1",
+        "https://login.{}",
+        "[claim](https://{})",
+        "(https://{}), hurry",
+    )
+    messages = []
+    for _ in range(size):
+        text = " ".join(rng.choices(WORDS, k=rng.randint(3, 12)))
+        if (roll := rng.random()) < 0.02:
+            text += " " + rng.choice(links).format(rng.choice(domains))
+        elif roll < 0.1:
+            text += " https://discord.com/channels/1/2/3"
+        messages.append(text)
+    return domains, messages
+
+
+def main(number: int = 5) -> None:
+    domains, messages = build()
+    exact, suffixes = set(domains), DomainSet(domains)
+
+    def scan_exact() -> int:
+        return sum(bool(exact.intersection(REGEX_URL.findall(x))) for x in messages)
+
+    def scan_suffixes() -> int:
+        return sum(suffixes.search(x) is not None for x in messages)
+
+    print(f"{'method':<10} {'detections':>10} {'µs/msg':>8}")
+    for name, scan in (("exact", scan_exact), ("suffix", scan_suffixes)):
+        elapsed = min(repeat(scan, number=1, repeat=number)) / len(messages) * 1e6
+        print(f"{name:<10} {scan():>10} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Event loop lag while rendering character documents and charts, inline against the process pool.
+
+Run from the repository root: python -m src.tests.bench_renderer
+"""
+
+import asyncio
+from time import perf_counter
+from typing import Awaitable, Callable
+
+import src.structures  # noqa: F401
+from src.structures.character import Character
+from src.structures.plotter import PlotRenderer, WeatherPlot, render_weather_plot
+from src.structures.process_pool import ProcessPool
+from src.structures.renderer import DocumentRenderer
+from src.structures.species import Species
+
+
+class Files:
+    async def fetch(self, url: str):
+        raise ValueError(url)
+
+
+class Bot:
+    files = Files()
+
+
+async def lag(stop: asyncio.Event, delays: list[float], interval: float = 0.005) -> None:
+    while not stop.is_set():
+        start = perf_counter()
+        await asyncio.sleep(interval)
+        delays.append(perf_counter() - start - interval)
+
+
+async def measure(func: Callable[[], Awaitable[None]]) -> tuple[float, float]:
+    """Elapsed time and max event loop lag of a call, in ms"""
+    stop, delays = asyncio.Event(), []
+    task = asyncio.create_task(lag(stop, delays))
+    await asyncio.sleep(0.05)
+    start = perf_counter()
+    await func()
+    elapsed = perf_counter() - start
+    stop.set()
+    await task
+    return elapsed * 1000, max(delays) * 1000
+
+
+async def main() -> None:
+    oc = Character(
+        id=1,
+        author=1,
+        server=1,
+        name="Test",
+        species=next(iter(Species.all())),
+        backstory=("Lorem ipsum dolor sit amet. " * 40 + "\n") * 20,
+    )
+
+    async def inline():
+        oc.render_docx(None)
+        oc.render_pdf(None)
+
+    print("inline  elapsed %.0f ms, max lag %.0f ms" % await measure(inline))
+
+    async with ProcessPool() as pool:
+        renderer = DocumentRenderer(Bot(), pool)
+        # Spawns and warms up the workers
+        await asyncio.gather(renderer.render(oc, "docx"), renderer.render(oc, "pdf"))
+
+        async def pooled():
+            oc.backstory += "."
+            await asyncio.gather(renderer.render(oc, "docx"), renderer.render(oc, "pdf"))
+
+        async def cached():
+            await asyncio.gather(renderer.render(oc, "docx"), renderer.render(oc, "pdf"))
+
+        print("pooled  elapsed %.0f ms, max lag %.0f ms" % await measure(pooled))
+        print("cached  elapsed %.0f ms, max lag %.0f ms" % await measure(cached))
+
+    plots = [WeatherPlot("Weather Probabilities", ("Clear", "Rain", "Snow"), (50 - x, 30 + x, 20)) for x in range(5)]
+
+    async def inline_plots():
+        for plot in plots:
+            render_weather_plot(plot)
+
+    await inline_plots()
+    print("charts inline  elapsed %.0f ms, max lag %.0f ms" % await measure(inline_plots))
+
+    async with ProcessPool() as pool:
+        plotter = PlotRenderer(pool)
+        await plotter.render(plots[0])
+
+        async def pooled_plots():
+            for index, plot in enumerate(plots):
+                await plotter.render(plot, key=index)
+
+        print("charts pooled  elapsed %.0f ms, max lag %.0f ms" % await measure(pooled_plots))
+        print("charts cached  elapsed %.0f ms, max lag %.0f ms" % await measure(pooled_plots))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
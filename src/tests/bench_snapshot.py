@@ -0,0 +1,60 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Startup cost of the resource registries, built from JSON or loaded from their snapshots.
+
+Run from the repository root: python -m src.tests.bench_snapshot
+"""
+
+from inspect import getfile
+from timeit import repeat
+
+import src.structures  # noqa: F401
+from src.structures.ability import ALL_ABILITIES, Ability, load_abilities
+from src.structures.mon_typing import TypingEnum
+from src.structures.move import ALL_MOVES, MOVE_SOURCES, Move, load_moves
+from src.structures.movepool import Movepool
+from src.structures.species import load_species
+from src.utils.snapshot import load_snapshot
+
+
+def load_species_snapshot():
+    return load_snapshot(
+        "species",
+        load_species,
+        "resources/species.json",
+        *MOVE_SOURCES,
+        getfile(Movepool),
+        refs={Move: ALL_MOVES, Ability: ALL_ABILITIES, TypingEnum: TypingEnum.__members__},
+        reducers={Movepool: Movepool.mask_reduce},
+    )
+
+
+CASES = {
+    "abilities": (load_abilities, lambda: load_snapshot("abilities", load_abilities, "resources/abilities.json")),
+    "moves": (load_moves, lambda: load_snapshot("moves", load_moves, *MOVE_SOURCES)),
+    "species": (load_species, load_species_snapshot),
+}
+
+
+def main(number: int = 5) -> None:
+    print(f"{'registry':<10} {'json ms':>10} {'snapshot ms':>12}")
+    for name, (builder, loader) in CASES.items():
+        built = min(repeat(builder, number=1, repeat=number)) * 1000
+        loaded = min(repeat(loader, number=1, repeat=number)) * 1000
+        print(f"{name:<10} {built:>10.1f} {loaded:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mongomock
+import pytest
+
+# src.utils and src.structures import each other, the registries have to load first.
+import src.structures  # noqa: F401
+from src.tests.mongo import AsyncCollection
+
+
+@pytest.fixture
+def collection() -> AsyncCollection:
+    return AsyncCollection(mongomock.MongoClient().db.collection)
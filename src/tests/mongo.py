@@ -0,0 +1,82 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from typing import Any, Optional
+
+import mongomock
+from pymongo.errors import OperationFailure
+
+__all__ = ("AsyncCollection", "AsyncCursor", "Stream")
+
+
+class AsyncCursor:
+    """mongomock cursor iterated like motor's"""
+
+    def __init__(self, cursor) -> None:
+        self.cursor = cursor
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict[str, Any]:
+        try:
+            return next(self.cursor)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class AsyncCollection:
+    """mongomock collection with motor's coroutine methods"""
+
+    def __init__(self, collection: mongomock.Collection) -> None:
+        self.collection = collection
+
+    def find(self, *args, **kwargs) -> AsyncCursor:
+        return AsyncCursor(self.collection.find(*args, **kwargs))
+
+    def watch(self, *args, **kwargs):
+        raise OperationFailure("$changeStream is only supported on replica sets", code=40573)
+
+    def __getattr__(self, name: str):
+        method = getattr(self.collection, name)
+
+        async def wrapper(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return wrapper
+
+
+class Stream:
+    """Change stream replaying the events of a queue, raising the errors in it"""
+
+    def __init__(self, queue: asyncio.Queue) -> None:
+        self.queue = queue
+        self.resume_token: Optional[dict[str, Any]] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        pass
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict[str, Any]:
+        item = await self.queue.get()
+        if isinstance(item, Exception):
+            raise item
+        self.resume_token = item["_id"]
+        return item
@@ -0,0 +1,115 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import mongomock
+from discord import NotFound
+
+from src.cogs.moderation.applications import Application, ApplicationSync
+from src.tests.mongo import AsyncCollection
+
+HEADERS = ["Timestamp", "Discord ID", "Why?"]
+
+
+class Guild:
+    def __init__(self, *members: int) -> None:
+        self.members = {x: SimpleNamespace(id=x) for x in members}
+
+    def get_member(self, user_id: int):
+        return self.members.get(user_id)
+
+    async def fetch_member(self, user_id: int):
+        if member := self.members.get(user_id):
+            return member
+        raise NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Member")
+
+
+class Bot:
+    def __init__(self) -> None:
+        self.logger = logging.getLogger("Applications")
+        self.db = mongomock.MongoClient().db
+
+    def mongo_db(self, name: str) -> AsyncCollection:
+        return AsyncCollection(self.db[name])
+
+
+def setup(rows: list[list[str]], **kwargs) -> tuple[Bot, Application, ApplicationSync]:
+    bot = Bot()
+    app = Application(google_id="sheet", server=1, forum_id=2)
+    bot.db["Applications"].insert_one({"google_id": "sheet", "server": 1, "forum_id": 2, "form": app.form, "row": 1})
+    sync = ApplicationSync(bot, min_delay=0, **kwargs)
+
+    async def fetch(_: Application, __, start: int):
+        return HEADERS, rows[start - 2 :]
+
+    sync.fetch = fetch
+    return bot, app, sync
+
+
+def stored_row(bot: Bot) -> int:
+    return bot.db["Applications"].find_one({"google_id": "sheet"})["row"]
+
+
+def test_failed_applicants_hold_the_stored_row():
+    async def main():
+        rows = [["t", "10", "a"], ["t", "11", "b"], ["t", "12", "c"]]
+        bot, app, sync = setup(rows)
+        guild = Guild(10, 11, 12)
+        handled: list[int] = []
+        failing = {11}
+
+        async def handle(member, info):
+            if member.id in failing:
+                raise RuntimeError("Discord is down")
+            handled.append(member.id)
+
+        assert await sync.poll(app, None, guild, handle) == 2
+        assert stored_row(bot) == 2
+
+        failing.clear()
+        assert await sync.poll(app, None, guild, handle) == 1
+        assert handled == [10, 12, 11]
+        assert stored_row(bot) == 4
+
+    asyncio.run(main())
+
+
+def test_applicants_are_given_up_on():
+    async def main():
+        rows = [["t", "10", "a"], ["t", "11", "b"]]
+        bot, app, sync = setup(rows, max_failures=2)
+        guild = Guild(10)
+        handled: list[int] = []
+
+        async def handle(member, info):
+            if member.id == 10:
+                raise RuntimeError("Discord is down")
+            handled.append(member.id)
+
+        await sync.poll(app, None, guild, handle)
+        assert stored_row(bot) == 1
+
+        await sync.poll(app, None, guild, handle)
+        assert list(sync.cursors[app].pending) == [11]
+        assert stored_row(bot) == 2
+
+        guild.members[11] = SimpleNamespace(id=11)
+        assert await sync.poll(app, None, guild, handle) == 1
+        assert handled == [11]
+        assert stored_row(bot) == 3
+
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from src.utils.autocomplete import AutocompleteIndex
+
+NAMES = [
+    "Thunder",
+    "Thunderbolt",
+    "Thunder Fang",
+    "Thunder Punch",
+    "Thunder Wave",
+    "Thunder Cage",
+    "Thunderclap",
+    "Thunderous Kick",
+    "Bolt Strike",
+    "Wild Charge",
+    "Fire Punch",
+    "Ice Punch",
+    "Tackle",
+    "Tail Whip",
+    "Take Down",
+    "Talon Rush",
+]
+
+
+@pytest.fixture
+def index() -> AutocompleteIndex[str]:
+    return AutocompleteIndex(NAMES, key=str, shortlist=4)
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [("Thunder", "Thunder"), ("thunder wave", "Thunder Wave"), ("Tackle", "Tackle"), ("bolt strike", "Bolt Strike")],
+)
+def test_shortlist_keeps_exact_matches(index: AutocompleteIndex[str], query: str, expected: str):
+    assert expected in [NAMES[x] for x in index.candidates(query)]
+    assert index.search(query)[0] == expected
+
+
+@pytest.mark.parametrize("query, expected", [("Thund", "Thunder"), ("Ta", "Tackle"), ("Wild", "Wild Charge"), ("Punch", "Fire Punch")])
+def test_shortlist_keeps_prefix_matches(index: AutocompleteIndex[str], query: str, expected: str):
+    assert expected in [NAMES[x] for x in index.candidates(query)]
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [("Thnuderbolt", "Thunderbolt"), ("Tacke", "Tackle"), ("Thunder Wvae", "Thunder Wave"), ("Ice Pnuch", "Ice Punch")],
+)
+def test_typos_find_the_entry(index: AutocompleteIndex[str], query: str, expected: str):
+    assert index.search(query)[0] == expected
+
+
+def test_empty_query_lists_entries_in_order(index: AutocompleteIndex[str]):
+    assert index.search(None, limit=3) == NAMES[:3]
+    assert index.search("  ") == NAMES
@@ -0,0 +1,106 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from src.cogs.roles.automod import (
+    MAX_PATTERN_LENGTH,
+    MAX_PATTERNS,
+    RULE_NAME,
+    NoPingAutomod,
+    build_patterns,
+)
+
+IDS = [10**17 + x * 7919 for x in range(300)]
+
+
+def pattern_ids(patterns: list[str]) -> list[int]:
+    return [int(x) for pattern in patterns for x in re.fullmatch(r"<@!\?\((.+)\)>", pattern).group(1).split("|")]
+
+
+@pytest.mark.parametrize("ids", [[], IDS[:1], IDS[:13], IDS[:14], IDS])
+def test_patterns_keep_every_id_once(ids: list[int]):
+    patterns = build_patterns(reversed(ids))
+    assert pattern_ids(patterns) == sorted(ids)
+    assert all(len(x) <= MAX_PATTERN_LENGTH for x in patterns)
+
+
+def test_patterns_fill_up_to_the_limit():
+    patterns = build_patterns(IDS)
+    assert len(patterns) > MAX_PATTERNS
+    assert all(len(x) + len(str(IDS[0])) + 1 > MAX_PATTERN_LENGTH for x in patterns[:-1])
+
+
+def test_patterns_match_mentions():
+    (pattern,) = build_patterns(IDS[:2])
+    assert re.fullmatch(pattern, f"<@{IDS[0]}>")
+    assert re.fullmatch(pattern, f"<@!{IDS[1]}>")
+    assert not re.fullmatch(pattern, f"<@{IDS[2]}>")
+
+
+class Rule:
+    def __init__(self, rule_id: int, name: str, patterns: list[str]) -> None:
+        self.id = rule_id
+        self.name = name
+        self.creator_id = 1
+        self.trigger = SimpleNamespace(regex_patterns=patterns)
+        self.event_type = self.actions = None
+        self.exempt_roles = self.exempt_channels = []
+
+    async def edit(self, *, trigger, **_):
+        self.trigger = SimpleNamespace(regex_patterns=trigger.regex_patterns)
+        return self
+
+    async def delete(self, **_):
+        pass
+
+
+class Guild:
+    def __init__(self) -> None:
+        self.id = 5
+        self.created: list[Rule] = []
+
+    async def fetch_automod_rules(self):
+        return list(self.created)
+
+    async def create_automod_rule(self, *, name, trigger, **_):
+        rule = Rule(len(self.created) + 100, name, trigger.regex_patterns)
+        self.created.append(rule)
+        return rule
+
+
+def test_push_splits_patterns_into_rules():
+    async def main():
+        guild, rule = Guild(), Rule(99, RULE_NAME, [])
+
+        async def fetch_rule(_):
+            return rule
+
+        bot = SimpleNamespace(user=SimpleNamespace(id=1), logger=logging.getLogger("Automod"))
+        automod = NoPingAutomod(bot, fetch_rule, delay=0)
+        automod.members[guild.id] = set(IDS)
+        await automod.push(guild)
+
+        patterns = build_patterns(IDS)
+        groups = [rule.trigger.regex_patterns] + [x.trigger.regex_patterns for x in guild.created]
+        assert [len(x) for x in groups] == [MAX_PATTERNS, MAX_PATTERNS, len(patterns) - 2 * MAX_PATTERNS]
+        assert sum(groups, []) == patterns
+        assert [x.name for x in guild.created] == [f"{RULE_NAME} 2", f"{RULE_NAME} 3"]
+
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+
+import mongomock
+from bson.errors import InvalidDocument
+from pymongo.errors import AutoReconnect
+
+from src.structures.batch_writer import BatchWriter
+from src.tests.mongo import AsyncCollection
+
+
+class Collection(AsyncCollection):
+    """Collection failing on documents with a bad key, or while down"""
+
+    def __init__(self, collection: mongomock.Collection) -> None:
+        super(Collection, self).__init__(collection)
+        self.down = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def insert_many(self, docs, ordered: bool = True):
+        self.started.set()
+        await self.release.wait()
+        if self.down:
+            self.down -= 1
+            raise AutoReconnect("down")
+        if any("bad" in x for x in docs):
+            raise InvalidDocument("cannot encode object")
+        return self.collection.insert_many(docs, ordered=ordered)
+
+
+class Bot:
+    def __init__(self) -> None:
+        self.logger = logging.getLogger("BatchWriter")
+        self.collection = Collection(mongomock.MongoClient().db.logs)
+
+    def mongo_db(self, _: str) -> Collection:
+        return self.collection
+
+
+def test_invalid_document_only_drops_itself():
+    async def main():
+        bot = Bot()
+        writer = BatchWriter(bot, delay=0)
+        async with writer:
+            writer.add("logs", {"id": 1}, {"id": 2, "bad": object()}, {"id": 3})
+            await asyncio.sleep(0.05)
+            writer.add("logs", {"id": 4})
+            await asyncio.sleep(0.05)
+            assert not writer.task.done()
+
+        ids = sorted(x["id"] for x in bot.collection.collection.find())
+        assert ids == [1, 3, 4]
+
+    asyncio.run(main())
+
+
+def test_transient_errors_requeue_the_batch():
+    async def main():
+        bot = Bot()
+        bot.collection.down = 1
+        writer = BatchWriter(bot, delay=0.01)
+        writer.add("logs", {"id": 1}, {"id": 2})
+        assert not await writer.flush()
+        assert len(writer) == 2
+        assert await writer.flush()
+        assert len(writer) == 0
+
+        ids = sorted(x["id"] for x in bot.collection.collection.find())
+        assert ids == [1, 2]
+
+    asyncio.run(main())
+
+
+def test_delete_waits_for_the_flush():
+    async def main():
+        bot = Bot()
+        bot.collection.release.clear()
+        writer = BatchWriter(bot)
+        writer.add("logs", {"id": 1})
+        flush = asyncio.create_task(writer.flush())
+        await bot.collection.started.wait()
+
+        delete = asyncio.create_task(writer.find_one_and_delete("logs", {"id": 1}))
+        await asyncio.sleep(0.01)
+        assert not delete.done()
+
+        bot.collection.release.set()
+        await flush
+        assert (await delete)["id"] == 1
+        assert bot.collection.collection.count_documents({}) == 0
+
+    asyncio.run(main())
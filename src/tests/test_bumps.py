@@ -0,0 +1,83 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import mongomock
+
+from src.cogs.bumps import Bump
+from src.cogs.bumps.bumps import Disboost
+from src.tests.mongo import AsyncCollection
+
+
+class Webhook:
+    def __init__(self) -> None:
+        self.sent: list[dict] = []
+
+    async def send(self, **kwargs):
+        self.sent.append(kwargs)
+        return SimpleNamespace(id=30)
+
+
+class Guild:
+    def __init__(self, channel: int) -> None:
+        self.channel = SimpleNamespace(id=channel)
+        self.roles = []
+
+    def get_channel_or_thread(self, channel_id: int):
+        return self.channel if channel_id == self.channel.id else None
+
+    def get_member(self, _: int):
+        return None
+
+
+class Bot:
+    def __init__(self) -> None:
+        self.db = mongomock.MongoClient().db
+        self.guilds: dict[int, Guild] = {}
+        self.ready = asyncio.Event()
+        self.hook = Webhook()
+
+    def mongo_db(self, name: str) -> AsyncCollection:
+        return AsyncCollection(self.db[name])
+
+    async def wait_until_ready(self) -> None:
+        await self.ready.wait()
+
+    def get_guild(self, guild_id: int):
+        return self.guilds.get(guild_id)
+
+    async def webhook(self, _):
+        return self.hook
+
+
+def test_overdue_reminder_waits_for_the_guilds():
+    async def main():
+        bot = Bot()
+        due = datetime(2000, 1, 1, tzinfo=timezone.utc)
+        bot.db["Bump Reminder"].insert_one({"server": 1, "bot": Disboost.id, "channel": 2, "ping": None, "due": due})
+        task = asyncio.create_task(Bump(bot).bump_reminder(1, Disboost.id))
+        await asyncio.sleep(0)
+        assert not task.done()
+
+        bot.guilds[1] = Guild(channel=2)
+        bot.ready.set()
+        await task
+
+        assert len(bot.hook.sent) == 1
+        assert bot.db["Bump Reminder"].find_one({"server": 1})["ping"] == 30
+
+    asyncio.run(main())
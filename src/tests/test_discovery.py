@@ -0,0 +1,83 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+from pathlib import Path
+from time import time
+from typing import Optional
+
+import pytest
+from aiogoogle.resource import GoogleAPI
+from aiohttp import ClientConnectionError
+
+from src.utils.discovery import FORMAT_VERSION, DiscoveryRegistry
+
+# Excerpt of the Sheets v4 discovery document, with the only method the bot calls
+DOCUMENT = json.loads((Path(__file__).parent / "data" / "sheets_v4.json").read_text())
+
+
+class Aiogoogle:
+    """Discovery stand-in, failing with the given error or returning the recorded document"""
+
+    def __init__(self, error: Optional[Exception] = None) -> None:
+        self.error = error
+        self.calls = 0
+
+    async def discover(self, name: str, version: str) -> GoogleAPI:
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return GoogleAPI(DOCUMENT)
+
+
+def store(folder: Path, fetched: float) -> None:
+    folder.mkdir(parents=True, exist_ok=True)
+    data = {"format": FORMAT_VERSION, "revision": DOCUMENT["revision"], "fetched": fetched, "document": DOCUMENT}
+    (folder / "sheets_v4.json").write_text(json.dumps(data))
+
+
+def batch_get_url(api: GoogleAPI) -> str:
+    return api.spreadsheets.values.batchGet(spreadsheetId="abc", ranges=["1:1"]).url
+
+
+def test_discovered_document_is_stored(tmp_path: Path):
+    async def main():
+        client = Aiogoogle()
+        api = await DiscoveryRegistry(client, tmp_path).sheets()
+        assert await DiscoveryRegistry(client, tmp_path).sheets()
+        assert client.calls == 1
+        assert batch_get_url(api).startswith("https://sheets.googleapis.com/v4/spreadsheets/abc/values:batchGet")
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("error", [ClientConnectionError("offline"), asyncio.TimeoutError()])
+def test_stale_document_is_used_offline(tmp_path: Path, error: Exception):
+    async def main():
+        store(tmp_path, fetched=time() - 30 * 86400)
+        client = Aiogoogle(error)
+        api = await DiscoveryRegistry(client, tmp_path).sheets()
+        assert client.calls == 1
+        assert batch_get_url(api)
+
+    asyncio.run(main())
+
+
+def test_missing_document_raises_offline(tmp_path: Path):
+    async def main():
+        with pytest.raises(ClientConnectionError):
+            await DiscoveryRegistry(Aiogoogle(ClientConnectionError("offline")), tmp_path).sheets()
+
+    asyncio.run(main())
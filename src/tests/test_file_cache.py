@@ -0,0 +1,107 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from src.utils.file_cache import FileCache, FileTooLarge
+
+
+class Files:
+    """Test server returning /<name> as name repeated size times, with ETags"""
+
+    def __init__(self) -> None:
+        self.hits: list[str] = []
+        self.sizes: dict[str, int] = {}
+        self.app = web.Application()
+        self.app.router.add_get("/{name}", self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        name = request.match_info["name"]
+        self.hits.append(name)
+        body = name.encode() * self.sizes.get(name, 1)
+        etag = f'"{len(body)}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        await asyncio.sleep(0.01)
+        return web.Response(body=body, content_type="text/plain", headers={"ETag": etag})
+
+
+def run(tmp_path: Path, test, **kwargs):
+    async def main():
+        files = Files()
+        async with TestServer(files.app) as server, ClientSession() as session:
+            cache = FileCache(session, tmp_path, **kwargs)
+            await test(files, cache, lambda x: str(server.make_url(f"/{x}")))
+
+    asyncio.run(main())
+
+
+def test_fetch_is_cached_and_shared(tmp_path: Path):
+    async def test(files: Files, cache: FileCache, url):
+        results = await asyncio.gather(*(cache.fetch(url("a")) for _ in range(5)))
+        await cache.fetch(url("a"))
+        assert files.hits == ["a"]
+        assert {data for _, data in results} == {b"a"}
+
+    run(tmp_path, test)
+
+
+def test_same_contents_share_a_blob(tmp_path: Path):
+    async def test(files: Files, cache: FileCache, url):
+        first, _ = await cache.fetch(url("a"))
+        second, _ = await cache.fetch(url("a?copy"))
+        assert first.digest == second.digest
+        assert len(list((tmp_path / "blobs").iterdir())) == 1
+        assert len(list((tmp_path / "meta").iterdir())) == 2
+
+    run(tmp_path, test)
+
+
+def test_stale_entries_are_revalidated(tmp_path: Path):
+    async def test(files: Files, cache: FileCache, url):
+        entry, _ = await cache.fetch(url("a"))
+        await asyncio.sleep(0.01)
+        revalidated, data = await cache.fetch(url("a"))
+        assert files.hits == ["a", "a"]
+        assert data == b"a" and revalidated.digest == entry.digest
+        assert revalidated.fetched > entry.fetched
+
+    run(tmp_path, test, ttl=0)
+
+
+def test_large_files_are_rejected(tmp_path: Path):
+    async def test(files: Files, cache: FileCache, url):
+        files.sizes["big"] = 100
+        with pytest.raises(FileTooLarge):
+            await cache.fetch(url("big"))
+
+    run(tmp_path, test, max_bytes=50)
+
+
+def test_disk_usage_includes_metadata(tmp_path: Path):
+    async def test(files: Files, cache: FileCache, url):
+        for index in range(50):
+            files.sizes[f"file{index}"] = 100
+            await cache.fetch(url(f"file{index}"))
+
+        stored = [*(tmp_path / "blobs").iterdir(), *(tmp_path / "meta").iterdir()]
+        assert sum(x.stat().st_size for x in stored) <= 4096
+        assert len(list((tmp_path / "meta").iterdir())) == len(list((tmp_path / "blobs").iterdir()))
+
+    run(tmp_path, test, disk_bytes=4096)
@@ -0,0 +1,109 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from dataclasses import asdict
+from time import monotonic
+from types import SimpleNamespace
+
+from discord import NotFound
+
+from src.cogs.inviter.classifier import Partner
+from src.cogs.inviter.partners import PartnerIndex
+
+
+def partner(guild_id: int, msg_id: int, url: str, server: int = 1) -> Partner:
+    return Partner(
+        id=guild_id,
+        msg_id=msg_id,
+        url=url,
+        title=f"Server {guild_id}",
+        content="",
+        icon_url="",
+        image_url=None,
+        tags=["RP"],
+        server=server,
+    )
+
+
+class Bot:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    async def fetch_invite(self, url: str):
+        self.calls.append(url)
+        if url == "gone":
+            raise NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Invite")
+        return SimpleNamespace(code=url)
+
+
+def test_load_indexes_partners(collection):
+    async def main():
+        await collection.insert_one(asdict(partner(10, 100, "abc")))
+        await collection.insert_one(asdict(partner(10, 200, "abc", server=2)))
+        index = PartnerIndex(collection)
+        await index.load()
+
+        assert len(index) == 2
+        assert index.get(1, 10).msg_id == 100
+        assert index.by_code(2, "abc").msg_id == 200
+        assert index.messages == {(1, 100): (1, 10), (2, 200): (2, 10)}
+
+    asyncio.run(main())
+
+
+def test_add_replaces_old_keys(collection):
+    async def main():
+        index = PartnerIndex(collection)
+        await index.add(partner(10, 100, "abc"))
+        await index.add(partner(10, 101, "xyz"))
+
+        assert index.by_code(1, "abc") is None
+        assert index.by_code(1, "xyz").msg_id == 101
+        assert index.messages == {(1, 101): (1, 10)}
+        assert await collection.count_documents({}) == 1
+
+    asyncio.run(main())
+
+
+def test_remove_messages_only_deletes_known_partners(collection):
+    async def main():
+        index = PartnerIndex(collection)
+        await index.add(partner(10, 100, "abc"))
+        await index.add(partner(11, 101, "def"))
+        await collection.insert_one(asdict(partner(12, 102, "ghi")))
+
+        await index.remove_messages(1, [100, 102, 103])
+
+        assert [x.id for x in index.partners.values()] == [11]
+        assert sorted(x["id"] async for x in collection.find({})) == [11, 12]
+
+    asyncio.run(main())
+
+
+def test_fetch_invite_caches_failures():
+    async def main():
+        bot, index = Bot(), PartnerIndex(None, ttl=300)
+
+        assert (await index.fetch_invite(bot, "abc")).code == "abc"
+        assert await index.fetch_invite(bot, "gone") is None
+        assert (await index.fetch_invite(bot, "abc")).code == "abc"
+        assert await index.fetch_invite(bot, "gone") is None
+        assert bot.calls == ["abc", "gone"]
+
+        index.invites.expire(monotonic() + 301)
+        await index.fetch_invite(bot, "gone")
+        assert bot.calls == ["abc", "gone", "gone"]
+
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from typing import Any, Hashable
+
+from src.structures.plotter import PlotRenderer, WeatherPlot
+
+
+class Pool:
+    """Process pool stand-in keeping results in a dict"""
+
+    def __init__(self) -> None:
+        self.cache: dict[Hashable, Any] = {}
+        self.calls = 0
+
+    async def cached(self, key: Hashable, func, *args: Any) -> bytes:
+        if key not in self.cache:
+            self.calls += 1
+            self.cache[key] = b"png"
+        return self.cache[key]
+
+    def discard(self, key: Hashable) -> None:
+        self.cache.pop(key, None)
+
+
+def test_new_chart_drops_the_previous_one():
+    async def main():
+        pool = Pool()
+        plotter = PlotRenderer(pool)
+        first = WeatherPlot("Weather", ("Clear", "Rain"), (60, 40))
+        second = WeatherPlot("Weather", ("Clear", "Rain"), (40, 60))
+
+        await plotter.render(first, key=1)
+        await plotter.render(first, key=1)
+        assert pool.calls == 1
+
+        await plotter.render(second, key=1)
+        assert list(pool.cache) == [("plot", second.digest)]
+
+        plotter.invalidate(1)
+        assert not pool.cache
+
+    asyncio.run(main())
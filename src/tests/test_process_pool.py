@@ -0,0 +1,67 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+
+from src.structures.process_pool import ProcessPool
+
+
+def crash_once(path: str) -> str:
+    if not os.path.exists(path):
+        Path(path).touch()
+        os._exit(1)
+    return "done"
+
+
+def crash(_: str) -> str:
+    os._exit(1)
+
+
+def test_broken_pool_is_replaced(tmp_path: Path):
+    async def main():
+        async with ProcessPool(max_workers=1) as pool:
+            assert await pool.run(crash_once, str(tmp_path / "marker")) == "done"
+            assert await pool.cached("key", crash_once, str(tmp_path / "marker")) == "done"
+            assert await pool.cached("key", crash, "") == "done"
+
+    asyncio.run(main())
+
+
+def test_repeated_crashes_raise(tmp_path: Path):
+    async def main():
+        async with ProcessPool(max_workers=1) as pool:
+            with pytest.raises(BrokenProcessPool):
+                await pool.run(crash, "")
+            assert pool.executor is None
+            assert await pool.run(crash_once, str(tmp_path / "marker")) == "done"
+
+    asyncio.run(main())
+
+
+def test_cache_is_bounded_by_bytes():
+    async def main():
+        async with ProcessPool(max_workers=1, cache_bytes=10) as pool:
+            assert await pool.cached("a", bytes, 6) == bytes(6)
+            assert await pool.cached("b", bytes, 6) == bytes(6)
+            assert list(pool.cache) == ["b"]
+
+            assert await pool.cached("c", bytes, 20) == bytes(20)
+            assert list(pool.cache) == ["b"] and pool.cache.currsize == 6
+
+    asyncio.run(main())
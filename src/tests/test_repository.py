@@ -0,0 +1,216 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from typing import Any, Callable, Optional
+
+from pymongo.errors import AutoReconnect
+
+from src.structures.character import AgeGroup, Character, Kind
+from src.structures.mon_typing import TypingEnum
+from src.structures.move import Move
+from src.structures.pronouns import Pronoun
+from src.structures.repository import CharacterRepository
+from src.structures.species import Fusion, Pokemon, Species
+from src.tests.mongo import Stream
+
+# Query field of each old_filters argument
+FIELDS = {"author": "author", "mon_type": "type", "pronoun": "pronoun", "move": "move", "kind": "kind", "age": "age"}
+
+
+async def settle() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_upsert_tracks_object_id(collection):
+    async def main():
+        repo = CharacterRepository(collection, watch=False)
+        await repo.load(1)
+        oc = await repo.upsert(Character(id=10, author=2, server=1, name="Test"))
+        item = await collection.find_one({"id": 10})
+
+        assert repo.object_ids == {item["_id"]: oc.id}
+
+        repo.apply({"operationType": "delete", "documentKey": {"_id": item["_id"]}})
+        assert await repo.get(1, 10) is None
+        assert not repo.object_ids
+
+    asyncio.run(main())
+
+
+def test_listen_resumes_after_errors(collection):
+    async def main():
+        oc = Character(id=10, author=2, server=1, name="Test")
+        await collection.insert_one(oc.to_mongo_dict())
+        item = await collection.find_one({"id": 10})
+        queue: asyncio.Queue = asyncio.Queue()
+        calls: list[Optional[dict[str, Any]]] = []
+
+        def watch(**kwargs):
+            calls.append(kwargs["resume_after"])
+            return Stream(queue)
+
+        collection.watch = watch
+        repo = CharacterRepository(collection, max_delay=0)
+        async with repo:
+            await settle()
+            await repo.load(1)
+            queue.put_nowait({"_id": {"token": 1}, "operationType": "update", "fullDocument": item})
+            queue.put_nowait(AutoReconnect("down"))
+            await settle()
+            assert await repo.get(1, 10)
+
+            queue.put_nowait({"_id": {"token": 2}, "operationType": "delete", "documentKey": {"_id": item["_id"]}})
+            await settle()
+            assert await repo.get(1, 10) is None
+            assert repo.watch
+
+        assert calls == [None, {"token": 1}]
+
+    asyncio.run(main())
+
+
+def test_listen_without_change_streams(collection):
+    async def main():
+        repo = CharacterRepository(collection)
+        async with repo:
+            await asyncio.sleep(0)
+        assert not repo.watch
+
+    asyncio.run(main())
+
+
+def test_changes_during_load_are_replayed(collection):
+    async def main():
+        for oc_id in (10, 11):
+            await collection.insert_one(Character(id=oc_id, author=2, server=1, name="Old").to_mongo_dict())
+        first = await collection.find_one({"id": 10})
+        second = await collection.find_one({"id": 11})
+        repo = CharacterRepository(collection, watch=False)
+        find = collection.find
+
+        async def cursor(*args, **kwargs):
+            async for item in find(*args, **kwargs):
+                yield item
+                if item["id"] == 11:
+                    repo.apply({"operationType": "update", "fullDocument": {**first, "name": "New"}})
+                    repo.apply({"operationType": "delete", "documentKey": {"_id": second["_id"]}})
+
+        collection.find = cursor
+        await repo.load(1)
+
+        assert (await repo.get(1, 10)).name == "New"
+        assert await repo.get(1, 11) is None
+        assert not repo.loading
+
+    asyncio.run(main())
+
+
+def old_filters(
+    *,
+    author: Optional[int] = None,
+    species: tuple[Species, ...] = (),
+    mon_type: Optional[TypingEnum] = None,
+    pronoun: Optional[Pronoun] = None,
+    move: Optional[Move] = None,
+    kind: Optional[Kind] = None,
+    age: Optional[AgeGroup] = None,
+) -> list[Callable[[Character], bool]]:
+    """Filters /find applied to every character before the facet index"""
+    filters: list[Callable[[Character], bool]] = []
+    if age:
+        filters.append(lambda oc: oc.age == age)
+    if author:
+        filters.append(lambda oc: oc.author == author)
+    mon = Fusion(*species)
+    if mon.bases:
+        filters.append(
+            lambda oc: (
+                mon.bases.issubset(oc.species.bases)
+                if isinstance(oc.species, Fusion)
+                else getattr(oc.species, "base", oc.species) == mon
+            )
+        )
+    if pronoun:
+        filters.append(lambda oc: pronoun in oc.pronoun)
+    if mon_type:
+        filters.append(lambda oc: mon_type in oc.types)
+    if move:
+        filters.append(lambda oc: move in oc.moveset)
+    if kind:
+        filters.append(lambda oc: oc.kind == kind)
+    return filters
+
+
+def test_query_matches_the_old_filters(collection):
+    async def main():
+        a, b, c = sorted(Pokemon.all(), key=lambda x: x.id)[:3]
+        m1, m2 = sorted(Move.all(), key=lambda x: x.id)[:2]
+        ocs = [
+            Character(id=1, author=1, server=1, species=a, pronoun=frozenset({Pronoun.He}), moveset=frozenset({m1})),
+            Character(id=2, author=2, server=1, species=b, age=AgeGroup.Child, moveset=frozenset({m1, m2})),
+            Character(id=3, author=1, server=1, species=Fusion(a, b), pronoun=frozenset({Pronoun.She})),
+            Character(id=4, author=2, server=1, species=Fusion(a, c), age=AgeGroup.Child, moveset=frozenset({m2})),
+            Character(id=5, author=3, server=1, species=c, pronoun=frozenset({Pronoun.He, Pronoun.Them})),
+        ]
+        for oc in ocs:
+            await collection.insert_one(oc.to_mongo_dict())
+        repo = CharacterRepository(collection, watch=False)
+        total = await repo.from_server(1)
+
+        cases = [
+            {},
+            {"author": 1},
+            {"author": 2, "age": AgeGroup.Child},
+            {"species": (a,)},
+            {"species": (c,)},
+            {"species": (a, b)},
+            {"species": (b, c)},
+            {"pronoun": Pronoun.He},
+            {"move": m1},
+            {"move": m2, "species": (a,)},
+            {"kind": Kind.Fusion},
+            {"kind": Kind.Common, "author": 2},
+            {"age": AgeGroup.Unknown},
+            *({"mon_type": x} for x in a.types | b.types | c.types),
+        ]
+        for case in cases:
+            terms = [("species", x.id) for x in case.get("species", ())]
+            terms += [(FIELDS[k], v) for k, v in case.items() if k != "species"]
+            filters = old_filters(**case)
+            expected = sorted(oc.id for oc in total if all(i(oc) for i in filters))
+            assert sorted(oc.id for oc in await repo.query(1, terms)) == expected, case
+
+    asyncio.run(main())
+
+
+def test_upsert_drops_stale_facets(collection):
+    async def main():
+        a, b = sorted(Pokemon.all(), key=lambda x: x.id)[:2]
+        repo = CharacterRepository(collection, watch=False)
+        await repo.load(1)
+        oc = await repo.upsert(Character(id=10, author=2, server=1, species=a, age=AgeGroup.Child))
+        assert [x.id for x in await repo.query(1, [("species", a.id), ("age", AgeGroup.Child)])] == [10]
+
+        oc = await repo.upsert(Character(id=10, author=3, server=1, species=b, age=oc.age))
+        assert not await repo.query(1, [("species", a.id)])
+        assert not await repo.query(1, [("author", 2)])
+        assert [x.id for x in await repo.query(1, [("species", b.id), ("author", 3)])] == [10]
+        assert (1, "species", a.id) not in repo.facets and (1, "author", 2) not in repo.facets
+
+        await repo.delete(1, 10)
+        assert not repo.facets and not repo.terms
+
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+from pymongo.errors import AutoReconnect
+
+from src.structures.server_config import ServerConfigs
+from src.tests.mongo import Stream
+
+
+def test_configs_expire_without_change_stream(collection):
+    async def main():
+        await collection.insert_one({"id": 1, "staff": 10})
+        configs = ServerConfigs(collection, ttl=60)
+        async with configs:
+            await asyncio.sleep(0)
+            assert not configs.watch and not configs.live
+
+            await collection.update_one({"id": 1}, {"$set": {"staff": 20}})
+            assert (await configs.get_config(1)).staff == 10
+
+            configs.ttl = 0
+            assert (await configs.get_config(1)).staff == 20
+
+    asyncio.run(main())
+
+
+def test_missing_configs_are_cached_for_ttl(collection):
+    async def main():
+        configs = ServerConfigs(collection, watch=False, ttl=60)
+        assert not await configs.get_config(2)
+
+        await collection.insert_one({"id": 2, "staff": 10})
+        assert not await configs.get_config(2)
+        assert (await configs.refresh(2)).staff == 10
+
+    asyncio.run(main())
+
+
+def test_first_stream_keeps_the_startup_load(collection):
+    async def main():
+        await collection.insert_one({"id": 1, "staff": 10})
+        queue: asyncio.Queue = asyncio.Queue()
+        loads: list[None] = []
+        find = collection.find
+
+        def count(*args, **kwargs):
+            loads.append(None)
+            return find(*args, **kwargs)
+
+        collection.find = count
+        collection.watch = lambda **_: Stream(queue)
+        configs = ServerConfigs(collection, max_delay=0)
+        async with configs:
+            for _ in range(10):
+                await asyncio.sleep(0)
+            assert configs.live and len(loads) == 1
+
+            queue.put_nowait(AutoReconnect("down"))
+            for _ in range(10):
+                await asyncio.sleep(0)
+            assert configs.live and len(loads) == 2
+
+    asyncio.run(main())
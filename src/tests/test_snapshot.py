@@ -0,0 +1,90 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.utils import snapshot
+from src.utils.snapshot import load_snapshot
+
+MODULE = """
+from dataclasses import dataclass
+
+
+@dataclass
+class Item:
+    name: str
+"""
+
+
+@pytest.fixture
+def module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / "snapshot_items.py"
+    path.write_text(MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(snapshot, "SNAPSHOT_FOLDER", tmp_path / "snapshots")
+    sys.modules.pop("snapshot_items", None)
+    yield path
+    sys.modules.pop("snapshot_items", None)
+
+
+def build(calls: list[int], source: Path):
+    def builder():
+        from snapshot_items import Item
+
+        calls.append(1)
+        return [Item(x) for x in source.read_text().split()]
+
+    return builder
+
+
+def test_reuses_snapshot(module: Path, tmp_path: Path):
+    source = tmp_path / "items.txt"
+    source.write_text("a b c")
+    calls: list[int] = []
+
+    first = load_snapshot("items", build(calls, source), source)
+    second = load_snapshot("items", build(calls, source), source)
+
+    assert len(calls) == 1
+    assert [x.name for x in second] == [x.name for x in first] == ["a", "b", "c"]
+
+
+def test_source_change_rebuilds(module: Path, tmp_path: Path):
+    source = tmp_path / "items.txt"
+    source.write_text("a b c")
+    calls: list[int] = []
+
+    load_snapshot("items", build(calls, source), source)
+    source.write_text("d e")
+    items = load_snapshot("items", build(calls, source), source)
+
+    assert len(calls) == 2
+    assert [x.name for x in items] == ["d", "e"]
+
+
+def test_pickled_class_change_rebuilds(module: Path, tmp_path: Path):
+    source = tmp_path / "items.txt"
+    source.write_text("a b c")
+    calls: list[int] = []
+
+    load_snapshot("items", build(calls, source), source)
+    module.write_text(MODULE + "\n    level: int = 1\n")
+    sys.modules.pop("snapshot_items", None)
+    items = load_snapshot("items", build(calls, source), source)
+
+    assert len(calls) == 2
+    assert [x.level for x in items] == [1, 1, 1]
@@ -13,8 +13,13 @@
 # limitations under the License.
 
 
+from src.utils.autocomplete import AutocompleteIndex
+from src.utils.deducer import FuzzyDeducer
+from src.utils.discovery import DiscoveryRegistry
 from src.utils.doc_reader import BytesAIO, DriveFormat, docs_aioreader
+from src.utils.domains import DomainSet
 from src.utils.etc import DICE_NUMBERS, WHITE_BAR
+from src.utils.file_cache import FileCache
 from src.utils.functions import (
     check_valid,
     common_get,
@@ -42,8 +47,15 @@ from src.utils.matches import (
     POKEMON_IMAGE,
     REGEX_URL,
 )
+from src.utils.message_cache import MessageCache
 
 __all__ = (
+    "AutocompleteIndex",
+    "FuzzyDeducer",
+    "DiscoveryRegistry",
+    "DomainSet",
+    "MessageCache",
+    "FileCache",
     "DriveFormat",
     "BytesAIO",
     "docs_aioreader",
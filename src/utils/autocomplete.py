@@ -0,0 +1,151 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Generic, Iterable, Optional, TypeVar
+
+from rapidfuzz import process
+
+_T = TypeVar("_T")
+
+__all__ = ("AutocompleteIndex",)
+
+
+def ngrams(text: str, size: int = 3) -> set[str]:
+    """Character n-grams of a padded, lowercased text
+
+    Parameters
+    ----------
+    text : str
+        Text to split
+    size : int, optional
+        Gram length, by default 3
+
+    Returns
+    -------
+    set[str]
+        Grams
+    """
+    text = f" {text.lower()} "
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+class AutocompleteIndex(Generic[_T]):
+    """Typo tolerant search over a fixed set of entries.
+
+    Queries gather a shortlist out of a sorted word-prefix array and an
+    n-gram inverted index, only the shortlist gets scored by rapidfuzz.
+
+    Attributes
+    ----------
+    items : tuple[_T, ...]
+        Entries in their original order
+    names : tuple[str, ...]
+        Name of each entry, in the same order as items
+    """
+
+    def __init__(
+        self,
+        items: Iterable[_T],
+        key: Callable[[_T], str] = attrgetter("name"),
+        *,
+        size: int = 3,
+        shortlist: int = 128,
+        score_cutoff: float = 60,
+        maxsize: Optional[int] = 1024,
+    ) -> None:
+        self.items = tuple(items)
+        self.names = tuple(map(key, self.items))
+        self.size = size
+        self.shortlist = shortlist
+        self.score_cutoff = score_cutoff
+        self.prefixes = sorted(
+            (name[i:].lower(), index)
+            for index, name in enumerate(self.names)
+            for i in range(len(name))
+            if i == 0 or not name[i - 1].isalnum() and name[i].isalnum()
+        )
+        postings: defaultdict[str, list[int]] = defaultdict(list)
+        for index, name in enumerate(self.names):
+            for gram in ngrams(name, size):
+                postings[gram].append(index)
+        self.postings = {k: tuple(v) for k, v in postings.items()}
+        self._cached = lru_cache(maxsize=maxsize)(self._search)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __repr__(self) -> str:
+        return f"AutocompleteIndex(items={len(self)}, {self._cached.cache_info()})"
+
+    def candidates(self, query: str) -> list[int]:
+        """Positions of the entries worth scoring for a query
+
+        Parameters
+        ----------
+        query : str
+            Text to look for
+
+        Returns
+        -------
+        list[int]
+            Positions in ascending order
+        """
+        text = query.lower()
+        found: dict[int, None] = {}
+
+        start = bisect_left(self.prefixes, (text,))
+        for name, index in self.prefixes[start:]:
+            if len(found) >= self.shortlist or not name.startswith(text):
+                break
+            found[index] = None
+
+        counter = Counter(index for gram in ngrams(text, self.size) for index in self.postings.get(gram, ()))
+        for index, _ in counter.most_common(self.shortlist):
+            found[index] = None
+
+        return sorted(found)
+
+    def _search(self, query: str, limit: Optional[int]) -> tuple[_T, ...]:
+        if not query:
+            return self.items[:limit]
+        choices = {index: self.names[index] for index in self.candidates(query)}
+        return tuple(
+            self.items[index]
+            for _, _, index in process.extract(query, choices, limit=limit, score_cutoff=self.score_cutoff)
+        )
+
+    def search(self, query: Optional[str], limit: Optional[int] = 25) -> list[_T]:
+        """Entries that best match the query
+
+        Parameters
+        ----------
+        query : Optional[str]
+            Text to look for, empty queries return the first entries
+        limit : Optional[int], optional
+            Max amount of entries, by default 25
+
+        Returns
+        -------
+        list[_T]
+            Matching entries, best first
+        """
+        return list(self._cached((query or "").strip(), limit))
+
+    def cache_clear(self) -> None:
+        self._cached.cache_clear()
@@ -0,0 +1,99 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Generic, Iterable, Mapping, Optional, TypeVar
+
+from rapidfuzz import process
+
+from src.utils.functions import fix
+
+_T = TypeVar("_T")
+
+__all__ = ("FuzzyDeducer",)
+
+
+class FuzzyDeducer(Generic[_T]):
+    """Fuzzy matcher over a fixed set of entries.
+
+    Choice names are computed once, exact matches are checked by name and
+    by fixed ID before scoring, and results are cached by normalized query.
+
+    Attributes
+    ----------
+    items : tuple[_T, ...]
+        Entries that can be deduced
+    names : tuple[str, ...]
+        Name of each entry, in the same order as items
+    """
+
+    def __init__(
+        self,
+        items: Iterable[_T],
+        key: Callable[[_T], str] = attrgetter("name"),
+        *,
+        by_name: Optional[Mapping[str, _T]] = None,
+        by_id: Optional[Mapping[str, _T]] = None,
+        normalizer: Optional[Callable[[str], str]] = None,
+        score_cutoff: float = 85,
+        maxsize: Optional[int] = 4096,
+    ) -> None:
+        self.items = tuple(items)
+        self.names = tuple(map(key, self.items))
+        self.by_name = dict(zip(self.names, self.items)) if by_name is None else by_name
+        self.by_id = {fix(x): y for x, y in zip(self.names, self.items)} if by_id is None else by_id
+        self.normalizer = normalizer or str.strip
+        self.score_cutoff = score_cutoff
+        self._cached = lru_cache(maxsize=maxsize)(self._deduce)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __repr__(self) -> str:
+        return f"FuzzyDeducer(items={len(self)}, {self._cached.cache_info()})"
+
+    def _deduce(self, query: str) -> Optional[_T]:
+        if (data := self.by_name.get(query)) or (data := self.by_id.get(fix(query))):
+            return data
+        if query and (
+            data := process.extractOne(
+                query,
+                self.names,
+                score_cutoff=self.score_cutoff,
+            )
+        ):
+            _, _, index = data
+            return self.items[index]
+
+    def __call__(self, query: str) -> Optional[_T]:
+        """Deduces the entry that matches the query
+
+        Parameters
+        ----------
+        query : str
+            Text to look for
+
+        Returns
+        -------
+        Optional[_T]
+            Matching entry if any
+        """
+        if not isinstance(query, str):
+            return None
+        return self._cached(self.normalizer(query))
+
+    def cache_clear(self) -> None:
+        self._cached.cache_clear()
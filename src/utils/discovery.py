@@ -0,0 +1,158 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+from collections import defaultdict
+from contextlib import suppress
+from os import replace as replace_file
+from pathlib import Path
+from time import time
+from typing import Any, Optional
+
+from aiogoogle import Aiogoogle
+from aiogoogle.excs import HTTPError
+from aiogoogle.resource import GoogleAPI
+from aiohttp import ClientError
+from orjson import dumps, loads
+
+__all__ = ("DiscoveryRegistry",)
+
+FORMAT_VERSION = 1
+
+
+class DiscoveryRegistry:
+    """Shared Google API clients out of cached discovery documents.
+
+    Each API is discovered once per process and its document is stored on
+    disk next to a version stamp, so restarts reuse it until it is older
+    than ttl. Stale documents are refreshed, but still used if Google can't
+    be reached.
+
+    Attributes
+    ----------
+    aiogoogle : Aiogoogle
+        Client used to discover
+    folder : Path
+        Folder for the discovery documents
+    ttl : float
+        Seconds a stored document is used without refreshing
+    """
+
+    def __init__(
+        self,
+        aiogoogle: Aiogoogle,
+        folder: Path | str = "resources/cache/discovery",
+        ttl: float = 7 * 86400,
+    ) -> None:
+        self.aiogoogle = aiogoogle
+        self.folder = Path(folder)
+        self.ttl = ttl
+        self.apis: dict[tuple[str, str], GoogleAPI] = {}
+        self.locks: defaultdict[tuple[str, str], asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    def __repr__(self) -> str:
+        return f"DiscoveryRegistry(apis={sorted(self.apis)})"
+
+    def _path(self, name: str, version: str) -> Path:
+        return self.folder / f"{name}_{version}.json"
+
+    def _load(self, name: str, version: str) -> Optional[dict[str, Any]]:
+        try:
+            data = loads(self._path(name, version).read_bytes())
+        except (OSError, ValueError):
+            return None
+        if isinstance(data, dict) and data.get("format") == FORMAT_VERSION:
+            return data
+
+    def _dump(self, name: str, version: str, document: dict[str, Any]) -> None:
+        data = {
+            "format": FORMAT_VERSION,
+            "revision": document.get("revision"),
+            "fetched": time(),
+            "document": document,
+        }
+        path = self._path(name, version)
+        with suppress(OSError):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp = path.with_suffix(".tmp")
+            temp.write_bytes(dumps(data))
+            replace_file(temp, path)
+
+    async def get(self, name: str, version: str) -> GoogleAPI:
+        """Client of a Google API
+
+        Parameters
+        ----------
+        name : str
+            API name, like drive
+        version : str
+            API version, like v3
+
+        Returns
+        -------
+        GoogleAPI
+            Shared client
+
+        Raises
+        ------
+        HTTPError | ClientError | asyncio.TimeoutError
+            If the API can't be discovered and there's no stored copy
+        """
+        key = name, version
+        if api := self.apis.get(key):
+            return api
+
+        async with self.locks[key]:
+            if api := self.apis.get(key):
+                return api
+
+            data = await asyncio.to_thread(self._load, name, version)
+            if data and time() - data["fetched"] < self.ttl:
+                api = GoogleAPI(data["document"])
+            else:
+                try:
+                    api = await self.aiogoogle.discover(name, version)
+                except (HTTPError, ClientError, asyncio.TimeoutError):
+                    if not data:
+                        raise
+                    api = GoogleAPI(data["document"])
+                else:
+                    await asyncio.to_thread(self._dump, name, version, api.discovery_document)
+
+            self.apis[key] = api
+
+        self.locks.pop(key, None)
+        return api
+
+    def invalidate(self, name: str, version: str) -> None:
+        """Drops an API so it gets discovered again
+
+        Parameters
+        ----------
+        name : str
+            API name
+        version : str
+            API version
+        """
+        self.apis.pop((name, version), None)
+        self._path(name, version).unlink(missing_ok=True)
+
+    async def drive(self) -> GoogleAPI:
+        """Drive v3 client"""
+        return await self.get("drive", "v3")
+
+    async def sheets(self) -> GoogleAPI:
+        """Sheets v4 client"""
+        return await self.get("sheets", "v4")
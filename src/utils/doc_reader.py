@@ -15,8 +15,10 @@
 
 from enum import Enum
 from io import BytesIO
+from typing import Optional
 
 from aiogoogle import Aiogoogle
+from aiogoogle.resource import GoogleAPI
 from docx.api import Document as DocumentParser
 from docx.document import Document
 
@@ -34,9 +36,10 @@ class BytesAIO(BytesIO):
         return super(BytesAIO, self).write(__buffer)
 
 
-async def docs_aioreader(document_id: str, aio: Aiogoogle) -> Document:
+async def docs_aioreader(document_id: str, aio: Aiogoogle, storage: Optional[GoogleAPI] = None) -> Document:
     file = BytesAIO()
-    storage = await aio.discover("drive", "v3")
+    if storage is None:
+        storage = await aio.discover("drive", "v3")
     query = storage.files.get(fileId=document_id)
     info: dict[str, str] = await aio.as_service_account(query)
 
@@ -0,0 +1,115 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from typing import Iterable, Optional
+
+from src.utils.matches import URL_HOST
+
+__all__ = ("DomainSet",)
+
+
+class DomainSet:
+    """Set of domains which also matches their subdomains.
+
+    A host is checked by looking up each of its label suffixes, so
+    a.b.example.com tries a.b.example.com, b.example.com, example.com and
+    com, one lookup per label.
+
+    Attributes
+    ----------
+    domains : set[str]
+        Normalized domains
+    """
+
+    __slots__ = ("domains",)
+
+    def __init__(self, domains: Iterable[str] = ()) -> None:
+        self.domains: set[str] = set()
+        self.update(domains)
+
+    def __len__(self) -> int:
+        return len(self.domains)
+
+    def __repr__(self) -> str:
+        return f"DomainSet(size={len(self)})"
+
+    def __contains__(self, host: str) -> bool:
+        return self.match(host) is not None
+
+    @staticmethod
+    def normalize(domain: str) -> str:
+        return domain.strip().strip(".").lower()
+
+    def update(self, domains: Iterable[str]) -> None:
+        """Adds domains
+
+        Parameters
+        ----------
+        domains : Iterable[str]
+            Domains to add
+        """
+        self.domains.update(item for x in domains if (item := self.normalize(x)))
+
+    def difference_update(self, domains: Iterable[str]) -> None:
+        """Removes domains
+
+        Parameters
+        ----------
+        domains : Iterable[str]
+            Domains to remove
+        """
+        self.domains.difference_update(map(self.normalize, domains))
+
+    def match(self, host: str) -> Optional[str]:
+        """Listed domain which the host belongs to
+
+        Parameters
+        ----------
+        host : str
+            Hostname, like www.example.com
+
+        Returns
+        -------
+        Optional[str]
+            Matching domain, if any
+        """
+        host = self.normalize(host)
+        index = 0
+        while index >= 0:
+            if (item := host[index:]) in self.domains:
+                return item
+            if (index := host.find(".", index)) >= 0:
+                index += 1
+        return None
+
+    def search(self, content: str) -> Optional[str]:
+        """First listed domain linked in a text
+
+        Parameters
+        ----------
+        content : str
+            Text to check
+
+        Returns
+        -------
+        Optional[str]
+            Matching domain, if any
+        """
+        if not self.domains or "://" not in content:
+            return None
+        for host in URL_HOST.findall(content):
+            if item := self.match(host):
+                return item
+        return None
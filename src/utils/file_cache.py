@@ -0,0 +1,284 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+import threading
+from collections import OrderedDict
+from contextlib import suppress
+from dataclasses import asdict, dataclass, replace
+from hashlib import sha256
+from os import replace as replace_file
+from pathlib import Path
+from time import time
+from typing import Optional
+
+from aiohttp import ClientSession
+from orjson import dumps, loads
+
+__all__ = ("CachedFile", "FileCache", "FileTooLarge")
+
+
+class FileTooLarge(ValueError):
+    """Raised when a download goes over the size limit"""
+
+
+@dataclass(frozen=True, slots=True)
+class CachedFile:
+    """Metadata of a downloaded file
+
+    Attributes
+    ----------
+    url : str
+        Source URL
+    digest : str
+        sha256 of the content, used as its storage key
+    content_type : str
+        Mimetype reported by the server
+    size : int
+        Content length in bytes
+    fetched : float
+        Timestamp of the last download or revalidation
+    etag : Optional[str]
+        ETag header, if any
+    last_modified : Optional[str]
+        Last-Modified header, if any
+    """
+
+    url: str
+    digest: str
+    content_type: str
+    size: int
+    fetched: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class FileCache:
+    """Content-addressed cache for downloaded files.
+
+    Metadata is keyed by URL while contents are keyed by their sha256, so
+    URLs serving the same bytes share storage. Recent contents stay in
+    memory, everything else lives on disk and both sides are bounded by
+    size, metadata files included. Evicting a content also removes the
+    metadata known to point at it. Entries older than ttl are revalidated
+    through ETag and Last-Modified, and concurrent requests for an URL
+    share one download.
+
+    Attributes
+    ----------
+    session : ClientSession
+        Session used for the downloads
+    folder : Path
+        Folder for contents and metadata
+    ttl : float
+        Seconds an entry is used without revalidation
+    max_bytes : int
+        Largest accepted download
+    memory_bytes : int
+        Max bytes kept in memory
+    disk_bytes : int
+        Max bytes kept on disk
+    max_entries : int
+        Max URLs kept in memory
+    """
+
+    def __init__(
+        self,
+        session: ClientSession,
+        folder: Path | str = "resources/cache",
+        *,
+        ttl: float = 3600,
+        max_bytes: int = 25 * 1024**2,
+        memory_bytes: int = 64 * 1024**2,
+        disk_bytes: int = 1024**3,
+        max_entries: int = 10000,
+    ) -> None:
+        self.session = session
+        self.folder = Path(folder)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, CachedFile] = OrderedDict()
+        self.memory: OrderedDict[str, bytes] = OrderedDict()
+        self.disk: Optional[OrderedDict[str, int]] = None
+        self.refs: dict[str, str] = {}
+        self.disk_lock = threading.Lock()
+        self.inflight: dict[str, asyncio.Future[tuple[CachedFile, bytes]]] = {}
+
+    def __repr__(self) -> str:
+        return f"FileCache(entries={len(self.entries)}, memory={sum(map(len, self.memory.values()))})"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.folder / "blobs" / digest
+
+    def _meta_path(self, url: str) -> Path:
+        return self.folder / "meta" / f"{sha256(url.encode()).hexdigest()}.json"
+
+    def _scan(self) -> OrderedDict[str, int]:
+        """Files on disk, by path relative to the folder, oldest first"""
+        items: list[tuple[float, str, int]] = []
+        for kind in ("blobs", "meta"):
+            if (folder := self.folder / kind).is_dir():
+                for path in folder.iterdir():
+                    stat = path.stat()
+                    items.append((stat.st_mtime, f"{kind}/{path.name}", stat.st_size))
+        return OrderedDict((name, size) for _, name, size in sorted(items))
+
+    def _track(self, name: str, size: int) -> None:
+        self.disk[name] = size
+        self.disk.move_to_end(name)
+
+    def _evict(self, name: str) -> int:
+        """Removes a file and the metadata of its contents, returns the bytes freed"""
+        size = self.disk.pop(name, 0)
+        (self.folder / name).unlink(missing_ok=True)
+        kind, _, key = name.partition("/")
+        if kind == "meta":
+            self.refs.pop(name, None)
+        else:
+            for meta in [k for k, v in self.refs.items() if v == key]:
+                size += self._evict(meta)
+        return size
+
+    def _read(self, entry: CachedFile) -> Optional[bytes]:
+        try:
+            data = self._blob_path(entry.digest).read_bytes()
+        except OSError:
+            return None
+        return data if sha256(data).hexdigest() == entry.digest else None
+
+    def _write(self, entry: CachedFile, data: bytes) -> None:
+        with self.disk_lock, suppress(OSError):
+            self._store(entry, data)
+
+    def _store(self, entry: CachedFile, data: bytes) -> None:
+        if self.disk is None:
+            self.disk = self._scan()
+
+        path = self._blob_path(entry.digest)
+        blob = f"blobs/{path.name}"
+        if blob not in self.disk:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp = path.with_suffix(".tmp")
+            temp.write_bytes(data)
+            replace_file(temp, path)
+        self._track(blob, entry.size)
+
+        path = self._meta_path(entry.url)
+        meta = f"meta/{path.name}"
+        content = dumps(asdict(entry))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        self._track(meta, len(content))
+        self.refs[meta] = entry.digest
+
+        total = sum(self.disk.values())
+        # The newest blob and metadata are the ones just stored
+        while total > self.disk_bytes and len(self.disk) > 2:
+            name = next(iter(self.disk))
+            total -= self._evict(name)
+
+    def _load_meta(self, url: str) -> Optional[CachedFile]:
+        try:
+            return CachedFile(**loads(self._meta_path(url).read_bytes()))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _remember(self, entry: CachedFile, data: bytes) -> None:
+        self.entries[entry.url] = entry
+        self.entries.move_to_end(entry.url)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        if entry.size > self.memory_bytes:
+            return
+        self.memory[entry.digest] = data
+        self.memory.move_to_end(entry.digest)
+        total = sum(map(len, self.memory.values()))
+        while total > self.memory_bytes:
+            _, item = self.memory.popitem(last=False)
+            total -= len(item)
+
+    async def _contents(self, entry: CachedFile) -> Optional[bytes]:
+        if (data := self.memory.get(entry.digest)) is not None:
+            self.memory.move_to_end(entry.digest)
+            return data
+        return await asyncio.to_thread(self._read, entry)
+
+    async def _download(self, url: str) -> tuple[CachedFile, bytes]:
+        entry = self.entries.get(url) or await asyncio.to_thread(self._load_meta, url)
+        data = entry and await self._contents(entry)
+
+        if entry and data is not None and time() - entry.fetched < self.ttl:
+            self._remember(entry, data)
+            return entry, data
+
+        headers: dict[str, str] = {}
+        if entry and data is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        async with self.session.get(url, headers=headers) as resp:
+            if resp.status == 304 and entry and data is not None:
+                entry = replace(entry, fetched=time())
+            else:
+                if (resp.content_length or 0) > self.max_bytes:
+                    raise FileTooLarge(f"{url} is larger than {self.max_bytes} bytes")
+                digest, chunks, size = sha256(), [], 0
+                async for chunk in resp.content.iter_chunked(64 * 1024):
+                    if (size := size + len(chunk)) > self.max_bytes:
+                        raise FileTooLarge(f"{url} is larger than {self.max_bytes} bytes")
+                    digest.update(chunk)
+                    chunks.append(chunk)
+                data = b"".join(chunks)
+                entry = CachedFile(
+                    url=url,
+                    digest=digest.hexdigest(),
+                    content_type=resp.content_type,
+                    size=size,
+                    fetched=time(),
+                    etag=resp.headers.get("ETag"),
+                    last_modified=resp.headers.get("Last-Modified"),
+                )
+
+        self._remember(entry, data)
+        await asyncio.to_thread(self._write, entry, data)
+        return entry, data
+
+    async def fetch(self, url: str) -> tuple[CachedFile, bytes]:
+        """Contents of an URL, downloading them if needed
+
+        Parameters
+        ----------
+        url : str
+            URL to fetch
+
+        Returns
+        -------
+        tuple[CachedFile, bytes]
+            Metadata and contents
+
+        Raises
+        ------
+        FileTooLarge
+            If the file is larger than max_bytes
+        """
+        if (future := self.inflight.get(url)) is None:
+            future = self.inflight[url] = asyncio.ensure_future(self._download(url))
+            future.add_done_callback(lambda _: self.inflight.pop(url, None))
+        return await asyncio.shield(future)
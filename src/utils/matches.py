@@ -27,6 +27,7 @@ __all__ = (
     "G_DOCUMENT",
     "EMOJI_REGEX",
     "REGEX_URL",
+    "URL_HOST",
     "DISCORD_MSG_URL",
     "DISCORD_MSG_URL2",
     "DATA_FINDER",
@@ -72,6 +73,7 @@ EMOJI_REGEX = re.compile(r"<(?P<animated>a?):(?P<name>[a-zA-Z0-9_]{2,32}):(?P<id
 PARTIAL_EMOJI_REGEX = re.compile(r":(?P<name>[a-zA-Z0-9_]{2,32}):")
 URL_DOMAIN_MATCH = re.compile(r"(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*(),]| %[0-9a-fA-F][0-9a-fA-F])+")
 REGEX_URL = re.compile(r"http[s]?://((?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*(),]| %[0-9a-fA-F][0-9a-fA-F])+)")
+URL_HOST = re.compile(r"https?://(?:[^\s/?#\\@<>]*@)?([a-z0-9.-]+)", re.IGNORECASE)
 DISCORD_MSG_URL = re.compile(
     r"https?://(?:(ptb|canary|www)\.)?discord(?:app)?\.com/channels/"
     r"(?:[0-9]{15,20}|@me)"
@@ -0,0 +1,116 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from collections import OrderedDict
+from time import monotonic
+from typing import Callable, Iterable
+
+__all__ = ("MessageCache",)
+
+
+class MessageCache:
+    """Bounded set of message IDs whose entries expire.
+
+    Entries are kept in insertion order along with the time they were
+    added, so expired or excess entries are always evicted from the front.
+
+    Attributes
+    ----------
+    ttl : float
+        Seconds an entry is kept
+    maxsize : int
+        Max amount of entries
+    hits : int
+        Lookups that found an entry
+    misses : int
+        Lookups that did not find an entry
+    evictions : int
+        Entries dropped because of age or size
+    """
+
+    def __init__(self, ttl: float = 86400, maxsize: int = 50000, timer: Callable[[], float] = monotonic) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.timer = timer
+        self.entries: OrderedDict[int, float] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        self.expire()
+        return len(self.entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"MessageCache(size={len(self)}, maxsize={self.maxsize}, ttl={self.ttl}, "
+            f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+        )
+
+    def __contains__(self, message_id: int) -> bool:
+        if (added := self.entries.get(message_id)) is not None and self.timer() - added < self.ttl:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def expire(self) -> None:
+        """Drops the entries older than the TTL"""
+        limit = self.timer() - self.ttl
+        while self.entries:
+            message_id, added = next(iter(self.entries.items()))
+            if added > limit:
+                break
+            del self.entries[message_id]
+            self.evictions += 1
+
+    def add(self, message_id: int) -> None:
+        """Adds a message ID, refreshing its age if already present
+
+        Parameters
+        ----------
+        message_id : int
+            Message ID
+        """
+        self.entries[message_id] = self.timer()
+        self.entries.move_to_end(message_id)
+        self.expire()
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, message_id: int) -> None:
+        """Removes a message ID if present
+
+        Parameters
+        ----------
+        message_id : int
+            Message ID
+        """
+        self.entries.pop(message_id, None)
+
+    def difference_update(self, message_ids: Iterable[int]) -> None:
+        """Removes several message IDs
+
+        Parameters
+        ----------
+        message_ids : Iterable[int]
+            Message IDs
+        """
+        for message_id in message_ids:
+            self.entries.pop(message_id, None)
+
+    def clear(self) -> None:
+        self.entries.clear()
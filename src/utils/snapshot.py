@@ -0,0 +1,192 @@
+# Copyright 2022 Vioshim
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pickle
+import sys
+from hashlib import sha256
+from importlib.util import find_spec
+from io import BytesIO
+from os import replace
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping, TypeVar
+
+from frozendict import frozendict
+
+__all__ = ("load_snapshot", "SNAPSHOT_FOLDER", "SNAPSHOT_VERSION")
+
+_T = TypeVar("_T")
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_FOLDER = Path("resources/snapshots")
+
+
+def _tag(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+class SnapshotPickler(pickle.Pickler):
+    """Pickler that stores registered entries as references by key"""
+
+    def __init__(
+        self,
+        file,
+        refs: Mapping[type, Mapping[str, Any]],
+        reducers: Mapping[type, Callable[[Any], tuple]],
+    ) -> None:
+        super(SnapshotPickler, self).__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.keys = {cls: {id(v): k for k, v in items.items()} for cls, items in refs.items()}
+        self.reducers = reducers
+        self.modules = {cls.__module__ for cls in (*refs, *reducers)}
+
+    def reducer_override(self, obj: Any):
+        self.modules.add(type(obj).__module__)
+        if isinstance(obj, type) or callable(obj):
+            self.modules.add(getattr(obj, "__module__", None) or "builtins")
+        if reducer := self.reducers.get(type(obj)):
+            return reducer(obj)
+        return NotImplemented
+
+    def persistent_id(self, obj: Any):
+        if (keys := self.keys.get(type(obj))) and (key := keys.get(id(obj))) is not None:
+            return _tag(type(obj)), key
+
+
+class SnapshotUnpickler(pickle.Unpickler):
+    """Unpickler that resolves references stored by SnapshotPickler"""
+
+    def __init__(self, file, refs: Mapping[type, Mapping[str, Any]]) -> None:
+        super(SnapshotUnpickler, self).__init__(file)
+        self.refs = {_tag(cls): items for cls, items in refs.items()}
+
+    def persistent_load(self, pid: tuple[str, str]):
+        tag, key = pid
+        return self.refs[tag][key]
+
+
+def snapshot_digest(name: str, *sources: str | Path) -> bytes:
+    """Digest identifying the snapshot of the given sources
+
+    Parameters
+    ----------
+    name : str
+        Snapshot name
+    sources : str | Path
+        Files the snapshot is built from
+
+    Returns
+    -------
+    bytes
+        sha256 digest
+    """
+    digest = sha256(f"{name}:{SNAPSHOT_VERSION}:{sys.version_info[:2]}".encode())
+    for source in sources:
+        digest.update(Path(source).read_bytes())
+    return digest.digest()
+
+
+def modules_digest(modules: Iterable[str]) -> bytes:
+    """Digest of the code of the modules whose objects are in a snapshot
+
+    Parameters
+    ----------
+    modules : Iterable[str]
+        Module names, the ones without a source file are skipped
+
+    Returns
+    -------
+    bytes
+        sha256 digest
+    """
+    digest = sha256()
+    for name in sorted(modules):
+        if (module := sys.modules.get(name)) is not None:
+            origin = getattr(module, "__file__", None)
+        elif spec := find_spec(name):
+            origin = spec.origin
+        else:
+            origin = None
+        if origin and origin.endswith(".py"):
+            digest.update(name.encode())
+            digest.update(Path(origin).read_bytes())
+    return digest.digest()
+
+
+def load_snapshot(
+    name: str,
+    builder: Callable[[], _T],
+    *sources: str | Path,
+    refs: Mapping[type, Mapping[str, Any]] = frozendict(),
+    reducers: Mapping[type, Callable[[Any], tuple]] = frozendict(),
+) -> _T:
+    """Loads the objects built out of resource files from a binary snapshot.
+
+    The snapshot is keyed by a hash of the sources and of the module defining
+    the builder. It also lists the modules of every class and function it
+    pickled, along with a hash of their code, so changes to any of them make
+    it stale too. If it is missing or stale the builder runs and the result
+    gets written for the next start.
+
+    Parameters
+    ----------
+    name : str
+        Snapshot name
+    builder : Callable[[], _T]
+        Function that builds the objects out of the sources
+    sources : str | Path
+        Files the builder reads
+    refs : Mapping[type, Mapping[str, Any]], optional
+        Registries of objects stored by key rather than by value
+    reducers : Mapping[type, Callable[[Any], tuple]], optional
+        Pickle reductions only used within the snapshot
+
+    Returns
+    -------
+    _T
+        Built objects
+    """
+    if module := sys.modules.get(builder.__module__):
+        sources += (module.__file__,)
+
+    path = SNAPSHOT_FOLDER / f"{name}.pickle"
+    digest = snapshot_digest(name, *sources)
+
+    try:
+        with path.open(mode="rb") as f:
+            if f.read(len(digest)) == digest:
+                modules: tuple[str, ...] = pickle.load(f)
+                if f.read(len(digest)) == modules_digest(modules):
+                    return SnapshotUnpickler(f, refs).load()
+    except (OSError, EOFError, LookupError, AttributeError, TypeError, ImportError, pickle.UnpicklingError):
+        pass
+
+    data = builder()
+
+    try:
+        buffer = BytesIO()
+        pickler = SnapshotPickler(buffer, refs, reducers)
+        pickler.dump(data)
+        modules = tuple(sorted(pickler.modules))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(".tmp")
+        with temp.open(mode="wb") as f:
+            f.write(digest)
+            pickle.dump(modules, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.write(modules_digest(modules))
+            f.write(buffer.getbuffer())
+        replace(temp, path)
+    except (OSError, ImportError, pickle.PicklingError):
+        pass
+
+    return data